@@ -14,10 +14,10 @@ from PySide6.QtWidgets import (
     QFileDialog, QDialog, QPushButton, QGridLayout, QProgressBar, QSizePolicy,
     QInputDialog # Added QInputDialog for file renaming
 )
-from PySide6.QtGui import QIcon, QAction
+from PySide6.QtGui import QIcon, QAction, QTextCursor
 from PySide6.QtWidgets import QStyle
 from PySide6.QtCore import (
-    Qt, QTimer, Signal, QCoreApplication, QFileInfo, QDir,
+    Qt, Signal, QCoreApplication, QFileInfo, QDir,
     QRunnable, QThreadPool, QObject, Slot, QUrl
 )
 import ctypes
@@ -31,11 +31,27 @@ UPDATE_TARGET_DIR = os.getcwd()
 
 # --- Core Logic Imports (DO NOT REMOVE AT ANY Given MOMENT) ---
 # NOTE: These imports are necessary for the provided structure to function.
-from core.settings import load_theme, load_settings, save_settings
+from core.settings import load_theme, load_settings, save_settings, default_settings
 from core.editor import Editor 
 from core.file_manager import FileManager 
 from core.terminal import TerminalWidget 
 from core.settings_ui import SettingsUI 
+from core.file_io import wait_for_saves
+from core.find_bar import FindBar
+from core.project_search import ProjectSearchPanel
+from core.project_index import ProjectIndex
+from core.project_symbols import ProjectSymbols, DocumentSymbols
+from core.fuzzy import FuzzyMatcher
+from core.picker import FuzzyPicker
+from core.quick_open import PathIndex, QuickOpenPicker
+from core.outline import OutlinePanel
+from core.lsp_client import LanguageServers
+from core.git_integration import GitIntegration
+from core.workspace_cache import WorkspaceCache
+from core.process_pool import shutdown_process_pool
+from core.autosave import AutosaveService
+from core.hibernation import HibernationManager
+from core.journal import JournalService, JournalError, find_journals, read_journal, journal_base_text, remove_journal
 logger = "0"
 try:
     from addons.debug import *
@@ -375,12 +391,30 @@ class GW(QMainWindow):
         self.init_ui()
         self.apply_theme(self.settings.get("theme", "dark"))
 
-        self.autosave_timer = QTimer(self)
-        self.autosave_timer.timeout.connect(self.autosave)
-        self.autosave_timer.start(30000)
+        # Every tab is saved shortly after its last edit (see core/autosave.py)
+        self.autosave_service = AutosaveService(
+            self.editor,
+            self.settings.get("autosave_delay_ms", default_settings["autosave_delay_ms"]),
+            self.autosave_enabled,
+            self,
+        )
+        self.autosave_service.autosaved.connect(self.on_autosaved)
+        self.autosave_service.autosave_failed.connect(self.on_autosave_failed)
+
+        # Unsaved edits are journaled so a crash does not lose them (see core/journal.py)
+        self.journal_service = JournalService(self.editor, self)
+
+        # Clean background tabs give their memory back (see core/hibernation.py)
+        self.hibernation_manager = HibernationManager(self.editor, self)
+        self.hibernation_manager.reclaimed_changed.connect(self.update_memory_status)
+
+        # Diagnostics, hovers and completions from language servers (see core/lsp_client.py)
+        self.language_servers = LanguageServers(self.editor, self)
+        self.language_servers.status_message.connect(self.show_index_status)
         
         self.fullscreen = False
         self.show_startup_alert()
+        self.offer_journal_recovery()
 
     def show_startup_alert(self):
         QMessageBox.information(
@@ -389,6 +423,43 @@ class GW(QMainWindow):
             "if something goes wrong, Please read the README in GitHub."
         )
 
+    def offer_journal_recovery(self):
+        """Offers to reopen unsaved work left behind by a session that did not exit cleanly."""
+        journals = find_journals()
+        if not journals:
+            return
+
+        ret = QMessageBox.question(
+            self,
+            "Recover Unsaved Work",
+            f"GW IDE did not exit cleanly last time.\n"
+            f"{len(journals)} document(s) have unsaved changes that can be recovered.\n\n"
+            "Recover them now? (Cancel asks again next time.)",
+            QMessageBox.Yes | QMessageBox.Discard | QMessageBox.Cancel,
+        )
+        if ret == QMessageBox.Cancel:
+            return
+
+        errors = []
+        recovered = 0
+        for journal_path in journals:
+            if ret == QMessageBox.Yes:
+                try:
+                    header, edits = read_journal(journal_path)
+                    self.editor.open_recovered(header.get("path"), journal_base_text(header), edits)
+                except (OSError, JournalError) as e:
+                    errors.append(str(e))
+                    continue # Kept: it may be the only copy of the work
+                recovered += 1
+            remove_journal(journal_path)
+
+        if errors:
+            QMessageBox.warning(self, "Recovery Error",
+                "Some documents could not be recovered:\n" + "\n".join(errors) +
+                "\n\nTheir journals are kept and offered again next time (choose Discard to drop them).")
+        if recovered:
+            self.status_bar.showMessage(f"Recovered {recovered} document(s). Save them to keep the changes.", 5000)
+
     # 🎨 Status Bar Setup 
     def init_status_bar(self):
         self.status_bar = QStatusBar()
@@ -398,7 +469,9 @@ class GW(QMainWindow):
         
         self.lang_label = QLabel("Language: Auto")
         self.encoding_label = QLabel("Encoding: UTF-8")
+        self.memory_label = QLabel("")
 
+        self.status_bar.addPermanentWidget(self.memory_label)
         self.status_bar.addPermanentWidget(self.line_status_label) 
         self.status_bar.addPermanentWidget(self.lang_label)
         self.status_bar.addPermanentWidget(self.encoding_label)
@@ -420,9 +493,49 @@ class GW(QMainWindow):
         self.file_manager = FileManager()
         self.editor = Editor()
 
-        self.splitter_top.addWidget(self.file_manager)
-        self.splitter_top.addWidget(self.editor)
-        self.splitter_top.setSizes([280, 1120]) 
+        # Editor tabs with the find bar underneath
+        self.editor_area = QWidget()
+        editor_area_layout = QVBoxLayout()
+        editor_area_layout.setContentsMargins(0, 0, 0, 0)
+        editor_area_layout.setSpacing(0)
+        self.editor_area.setLayout(editor_area_layout)
+        self.find_bar = FindBar(self.editor)
+        self.find_bar.status_message.connect(lambda message: self.status_bar.showMessage(message, 3000))
+        editor_area_layout.addWidget(self.editor)
+        editor_area_layout.addWidget(self.find_bar)
+
+        # Find in Files, hidden until asked for. The trigram index of the
+        # opened folder narrows its searches (see core/project_index.py)
+        self.project_index = ProjectIndex(self)
+        self.project_index.status_message.connect(self.show_index_status)
+        self.editor.file_saved.connect(self.project_index.notify_changed)
+        self.project_symbols = ProjectSymbols(self)
+        self.project_symbols.status_message.connect(self.show_index_status)
+        self.editor.file_saved.connect(self.project_symbols.notify_changed)
+        # Symbols of the open tab itself, parsed in the background per document revision
+        self.document_symbols = DocumentSymbols(self)
+        self.editor.editor_closed.connect(self.document_symbols.forget)
+        # Go to File: every path under the project root (see core/quick_open.py)
+        self.path_index = PathIndex(self)
+        self.path_index.status_message.connect(self.show_index_status)
+        self.editor.file_saved.connect(self.path_index.notify_changed)
+        self.editor.file_opened.connect(self.path_index.note_opened)
+        self.project_search = ProjectSearchPanel(self.project_index)
+        self.project_search.open_requested.connect(self.open_location)
+        self.project_search.hide()
+
+        # Left sidebar: File Manager above the outline of the active tab
+        self.outline_panel = OutlinePanel()
+        self.outline_panel.line_activated.connect(self.go_to_outline_line)
+        self.sidebar = QSplitter(Qt.Vertical)
+        self.sidebar.addWidget(self.file_manager)
+        self.sidebar.addWidget(self.outline_panel)
+        self.sidebar.setSizes([550, 350])
+
+        self.splitter_top.addWidget(self.sidebar)
+        self.splitter_top.addWidget(self.editor_area)
+        self.splitter_top.addWidget(self.project_search)
+        self.splitter_top.setSizes([280, 1120, 0])
 
         # Terminal setup
         self.terminal = TerminalWidget()
@@ -434,6 +547,19 @@ class GW(QMainWindow):
 
         # 4. Connect signals
         self.file_manager.file_open_requested.connect(self.editor.load_file)
+        self.file_manager.status_message.connect(lambda message: self.status_bar.showMessage(message, 5000))
+        self.editor.file_saved.connect(self.file_manager.file_saved)
+        self.file_manager.paths_changed.connect(self.on_project_paths_changed)
+        self.file_manager.directories_changed.connect(self.on_project_directories_changed)
+
+        # Git status in the tree, changed lines and blame in the editor (see core/git_integration.py)
+        self.git_integration = GitIntegration(self.editor, self.file_manager, self)
+        self.git_integration.status_message.connect(self.show_index_status)
+        self.git_integration.set_root(self.file_manager.model.rootPath())
+
+        # Tree listings, expanded folders and tabs of each project root between sessions (see core/workspace_cache.py)
+        self.workspace_cache = WorkspaceCache(self.editor, self.file_manager, self)
+        self.workspace_cache.status_message.connect(self.show_index_status)
 
         # 5. Settings page
         self.settings_ui = SettingsUI(self)
@@ -457,9 +583,19 @@ class GW(QMainWindow):
             line = cursor.blockNumber() + 1
             col = cursor.columnNumber()
             self.line_status_label.setText(f"Ln {line}, Col {col}")
+        elif editor and hasattr(editor, 'current_line'):
+            # Large file viewer: no cursor, report the top visible line
+            self.line_status_label.setText(f"Ln {editor.current_line()} of {editor.line_count()}")
         else:
             self.line_status_label.setText("Ln -, Col -")
 
+    def update_memory_status(self, hibernated, reclaimed):
+        """Shows how many tabs are hibernated and roughly how much memory that saved."""
+        if hibernated:
+            self.memory_label.setText(f"Hibernated: {hibernated} tab(s), ~{reclaimed / (1024 * 1024):.1f} MB freed")
+        else:
+            self.memory_label.setText("")
+
     # 🎨 Menu Bar 
     def _connect_active_editor_signals(self, index):
         """Connects the active CodeEditorCore's signals to the GW methods."""
@@ -493,6 +629,8 @@ class GW(QMainWindow):
             self.line_status_label.setText("Ln -, Col -")
             self.lang_label.setText("Language: Auto")
 
+        self.outline_panel.set_editor(editor)
+
     def init_menu_bar(self):
         menu_bar = QMenuBar()
         
@@ -526,6 +664,11 @@ class GW(QMainWindow):
         save_action.setIcon(save_icon)
         save_action.triggered.connect(self.save_current)
         file_menu.addAction(save_action)
+
+        save_all_action = QAction("Save A&ll", self)
+        save_all_action.setShortcut("Ctrl+Shift+S")
+        save_all_action.triggered.connect(self.save_all)
+        file_menu.addAction(save_all_action)
         
         # --- ADDED: Rename File Action ---
         rename_icon = QIcon("assets/rename.png")
@@ -544,6 +687,10 @@ class GW(QMainWindow):
         delete_action.triggered.connect(self.delete_current_file)
         file_menu.addAction(delete_action)
         # --- END ADDED ---
+
+        cancel_load_action = QAction("&Cancel Loading", self)
+        cancel_load_action.triggered.connect(self.cancel_loading)
+        file_menu.addAction(cancel_load_action)
         
         file_menu.addSeparator()
 
@@ -552,6 +699,63 @@ class GW(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
 
+        # --- Edit Menu ---
+        edit_menu = menu_bar.addMenu("&Edit")
+
+        go_to_line_action = QAction("&Go to Line...", self)
+        go_to_line_action.setShortcut("Ctrl+G")
+        go_to_line_action.triggered.connect(self.go_to_line)
+        edit_menu.addAction(go_to_line_action)
+
+        edit_menu.addSeparator()
+
+        find_action = QAction("&Find...", self)
+        find_action.setShortcut("Ctrl+F")
+        find_action.triggered.connect(lambda: self.find_bar.open_bar(replace=False))
+        edit_menu.addAction(find_action)
+
+        replace_action = QAction("&Replace...", self)
+        replace_action.setShortcut("Ctrl+H")
+        replace_action.triggered.connect(lambda: self.find_bar.open_bar(replace=True))
+        edit_menu.addAction(replace_action)
+
+        find_next_action = QAction("Find &Next", self)
+        find_next_action.setShortcut("F3")
+        find_next_action.triggered.connect(self.find_bar.find_next)
+        edit_menu.addAction(find_next_action)
+
+        find_previous_action = QAction("Find &Previous", self)
+        find_previous_action.setShortcut("Shift+F3")
+        find_previous_action.triggered.connect(self.find_bar.find_previous)
+        edit_menu.addAction(find_previous_action)
+
+        edit_menu.addSeparator()
+
+        go_to_definition_action = QAction("Go to &Definition", self)
+        go_to_definition_action.setShortcut("F12")
+        go_to_definition_action.triggered.connect(self.go_to_definition)
+        edit_menu.addAction(go_to_definition_action)
+
+        go_to_file_action = QAction("Go to &File...", self)
+        go_to_file_action.setShortcut("Ctrl+P")
+        go_to_file_action.triggered.connect(self.show_file_picker)
+        edit_menu.addAction(go_to_file_action)
+
+        go_to_symbol_action = QAction("Go to &Symbol in Workspace...", self)
+        go_to_symbol_action.setShortcut("Ctrl+T")
+        go_to_symbol_action.triggered.connect(self.show_symbol_picker)
+        edit_menu.addAction(go_to_symbol_action)
+
+        matching_bracket_action = QAction("Go to Matching &Bracket", self)
+        matching_bracket_action.setShortcut("Ctrl+]")
+        matching_bracket_action.triggered.connect(self.go_to_matching_bracket)
+        edit_menu.addAction(matching_bracket_action)
+
+        complete_action = QAction("Trigger &Completion", self)
+        complete_action.setShortcut("Ctrl+Space")
+        complete_action.triggered.connect(self.show_completions)
+        edit_menu.addAction(complete_action)
+
         # --- View Menu ---
         view_menu = menu_bar.addMenu("&View")
         
@@ -562,6 +766,42 @@ class GW(QMainWindow):
         self.toggle_sidebar_action.triggered.connect(self.toggle_file_manager_sidebar)
         view_menu.addAction(self.toggle_sidebar_action)
 
+        self.toggle_outline_action = QAction("Show &Outline", self)
+        self.toggle_outline_action.setCheckable(True)
+        self.toggle_outline_action.setChecked(True)
+        self.toggle_outline_action.toggled.connect(self.outline_panel.setVisible)
+        view_menu.addAction(self.toggle_outline_action)
+
+        self.toggle_project_search_action = QAction("Find in &Files", self)
+        self.toggle_project_search_action.setShortcut("Ctrl+Shift+F")
+        self.toggle_project_search_action.triggered.connect(self.show_project_search)
+        view_menu.addAction(self.toggle_project_search_action)
+
+        view_menu.addSeparator()
+
+        folding_menu = view_menu.addMenu("F&olding")
+        fold_action = QAction("&Fold", self)
+        fold_action.setShortcut("Ctrl+Shift+[")
+        fold_action.triggered.connect(self.fold_at_cursor)
+        folding_menu.addAction(fold_action)
+
+        unfold_action = QAction("&Unfold", self)
+        unfold_action.setShortcut("Ctrl+Shift+]")
+        unfold_action.triggered.connect(self.unfold_at_cursor)
+        folding_menu.addAction(unfold_action)
+
+        folding_menu.addSeparator()
+        for level in range(1, 6):
+            fold_level_action = QAction(f"Fold to Level &{level}", self)
+            fold_level_action.setShortcut(f"Ctrl+K, Ctrl+{level}")
+            fold_level_action.triggered.connect(lambda checked=False, level=level: self.fold_to_level(level))
+            folding_menu.addAction(fold_level_action)
+
+        unfold_all_action = QAction("Unfold &All", self)
+        unfold_all_action.setShortcut("Ctrl+K, Ctrl+J")
+        unfold_all_action.triggered.connect(lambda: self.fold_to_level(0))
+        folding_menu.addAction(unfold_all_action)
+
         view_menu.addSeparator()
 
         fullscreen_action = QAction("&Toggle Fullscreen", self)
@@ -596,19 +836,19 @@ class GW(QMainWindow):
 
         self.setMenuBar(menu_bar)
         
-    # MODIFIED: Show Update Checker Dialog (stops and restarts autosave timer)
+    # MODIFIED: Show Update Checker Dialog (pauses and resumes autosave)
     def show_update_checker(self):
         """Shows the Update Checker dialog, which handles network checks internally."""
         
-        # Stop autosave to prevent disk activity during update/file extraction
-        self.autosave_timer.stop() 
+        # Pause autosave to prevent disk activity during update/file extraction
+        self.autosave_service.pause()
         self.status_bar.showMessage("Autosave temporarily paused for update check.", 1000)
 
         dialog = UpdateCheckerDialog(self)
         dialog.exec()
         
-        # Restart autosave after the dialog is closed
-        self.autosave_timer.start(30000)
+        # Resume autosave after the dialog is closed
+        self.autosave_service.resume()
         self.status_bar.showMessage("Autosave restarted.", 1000)
 
 
@@ -671,33 +911,36 @@ class GW(QMainWindow):
     # 💥 Toggle Sidebar
     def toggle_file_manager_sidebar(self):
         """Hides or shows the File Manager (the left-hand sidebar)."""
-        is_visible = self.file_manager.isVisible()
+        is_visible = self.sidebar.isVisible()
         
         if is_visible:
-            self.file_manager.hide()
-            self._sidebar_sizes = self.splitter_top.sizes()
+            self.sidebar.hide()
+            self._sidebar_sizes = self.splitter_top.sizes()[:2]
             # If the splitter width is zero, reset to default width for editor
-            editor_width = self.splitter_top.width()
-            self.splitter_top.setSizes([0, editor_width])
+            # (the Find in Files panel, if open, keeps its width)
+            search_width = self.splitter_top.sizes()[2]
+            editor_width = self.splitter_top.width() - search_width
+            self.splitter_top.setSizes([0, editor_width, search_width])
             self.toggle_sidebar_action.setChecked(False)
             self.status_bar.showMessage("File Manager sidebar hidden.", 3000)
         else:
-            self.file_manager.show()
+            self.sidebar.show()
             
             # Restore previous sizes or a sensible default
+            search_width = self.splitter_top.sizes()[2]
             if hasattr(self, '_sidebar_sizes') and len(self._sidebar_sizes) == 2:
                 # Ensure the restored sizes sum up to the current splitter width
-                total_width = self.splitter_top.width()
+                total_width = self.splitter_top.width() - search_width
                 if sum(self._sidebar_sizes) != total_width:
                     # Calculate new proportional sizes if the window size changed
                     sidebar_ratio = self._sidebar_sizes[0] / sum(self._sidebar_sizes)
                     new_sidebar_width = int(total_width * sidebar_ratio)
-                    self.splitter_top.setSizes([new_sidebar_width, total_width - new_sidebar_width])
+                    self.splitter_top.setSizes([new_sidebar_width, total_width - new_sidebar_width, search_width])
                 else:
-                    self.splitter_top.setSizes(self._sidebar_sizes)
+                    self.splitter_top.setSizes(self._sidebar_sizes + [search_width])
             else:
                 # Default sizes if no previous sizes are stored
-                self.splitter_top.setSizes([280, self.splitter_top.width() - 280])
+                self.splitter_top.setSizes([280, self.splitter_top.width() - 280 - search_width, search_width])
                 
             self.toggle_sidebar_action.setChecked(True)
             self.status_bar.showMessage("File Manager sidebar visible.", 3000)
@@ -721,7 +964,14 @@ class GW(QMainWindow):
         folder_path = QFileDialog.getExistingDirectory(self, "Open Project Folder", "")
         if folder_path:
             try:
-                self.file_manager.set_root_path(folder_path)
+                self.workspace_cache.save() # The project being left
+                if not self.workspace_cache.restore(folder_path):
+                    self.file_manager.set_root_path(folder_path)
+                self.project_index.open_root(folder_path)
+                self.project_symbols.open_root(folder_path)
+                self.path_index.open_root(folder_path)
+                self.language_servers.set_root(folder_path)
+                self.git_integration.set_root(folder_path)
             
                 self.current_project_name = QFileInfo(folder_path).fileName()
                 self.setWindowTitle(f"GW IDE - Project: {self.current_project_name}")
@@ -730,6 +980,217 @@ class GW(QMainWindow):
                 QMessageBox.critical(self, "Folder Error", f"Failed to set project folder: {e}")
                 self.status_bar.showMessage("Error: Failed to open folder.", 5000)
 
+    def cancel_loading(self):
+        """Cancels the file currently streaming into the active tab."""
+        if self.editor.cancel_current_load():
+            self.status_bar.showMessage("Loading cancelled.", 3000)
+        else:
+            self.status_bar.showMessage("No file is loading in this tab.", 3000)
+
+    def go_to_line(self):
+        """Asks for a line number and jumps there in the active tab."""
+        editor = self.editor.get_current_editor()
+        if not editor or not hasattr(editor, 'go_to_line'):
+            self.status_bar.showMessage("Go to Line: No file open.", 3000)
+            return
+
+        current = editor.current_line() if hasattr(editor, 'current_line') else editor.textCursor().blockNumber() + 1
+        line, ok = QInputDialog.getInt(self, "Go to Line", f"Line (1 - {editor.line_count()}):",
+                                       current, 1, max(1, editor.line_count()))
+        if ok:
+            editor.go_to_line(line)
+            self.status_bar.showMessage(f"Jumped to line {line}.", 3000)
+
+    def show_project_search(self):
+        """Opens the Find in Files panel on the FileManager root, seeded from the selection."""
+        self.project_search.set_root(self.file_manager.model.rootPath())
+        if not self.project_search.isVisible():
+            self.project_search.show()
+            sizes = self.splitter_top.sizes()
+            self.splitter_top.setSizes([sizes[0], max(0, sizes[1] - 350), 350])
+
+        editor = self.editor.get_current_editor()
+        selected = editor.textCursor().selectedText() if editor and hasattr(editor, 'textCursor') else ""
+        self.project_search.focus_query(selected if "\u2029" not in selected else None)
+
+    def _with_current_file_symbols(self, editor, action, feature):
+        """
+        Calls action(symbols) with the symbols of the open Python document,
+        from its unsaved text. The parse runs in the background; action is
+        dropped if another tab is active by the time it is done.
+        """
+        def deliver(symbols):
+            if editor is None or self.editor.get_current_editor() is editor:
+                action(symbols)
+
+        if editor is None:
+            deliver([])
+        elif not self.document_symbols.request(editor, deliver):
+            self.status_bar.showMessage(f"{feature}: Parsing this file...", 3000)
+
+    def _document_symbol_choice(self, symbol, path):
+        """_symbol_choice() of a symbol of the open document at path."""
+        name, kind, container, line, column = symbol
+        return self._symbol_choice((name, kind, container, path, line, column))
+
+    def _symbol_choice(self, row, relative_path=None):
+        """(text, detail, payload) of a symbol row for the picker."""
+        name, kind, container, path, line, column = row
+        where = relative_path if relative_path is not None else (os.path.basename(path) if path else "this file")
+        detail = f"{kind}  {container + '  ' if container else ''}{where}:{line}"
+        return name, detail, (path, line, column)
+
+    def _project_symbol_choices(self, rows, current_path):
+        """Picker choices for project rows, skipping the current file (parsed separately)."""
+        table = self.project_symbols.table
+        choices = []
+        for row in rows:
+            path = table.absolute(row[3])
+            if current_path and os.path.normcase(path) == os.path.normcase(current_path):
+                continue
+            choices.append(self._symbol_choice((*row[:3], path, *row[4:]), row[3]))
+        return choices
+
+    def go_to_definition(self):
+        """Jumps to the definition of the identifier under the cursor: current file first, then the project."""
+        editor = self.editor.get_current_editor()
+        if not editor or not hasattr(editor, 'textCursor'):
+            self.status_bar.showMessage("Go to Definition: No file open.", 3000)
+            return
+        cursor = editor.textCursor()
+        cursor.select(QTextCursor.WordUnderCursor)
+        name = cursor.selectedText()
+        if not name.isidentifier():
+            self.status_bar.showMessage("Go to Definition: No identifier under the cursor.", 3000)
+            return
+
+        self._with_current_file_symbols(editor, lambda symbols: self._show_definitions(name, editor.get_file_path(), symbols), "Go to Definition")
+
+    def _show_definitions(self, name, current_path, current_symbols):
+        """Jumps to the only definition of name, or lets the user pick one."""
+        choices = [self._document_symbol_choice(symbol, current_path) for symbol in current_symbols if symbol[0] == name]
+        if self.project_symbols.table is not None:
+            choices += self._project_symbol_choices(self.project_symbols.lookup(name), current_path)
+
+        if not choices:
+            self.status_bar.showMessage(f"Go to Definition: '{name}' is not defined in this file or the project.", 5000)
+        elif len(choices) == 1:
+            self.open_symbol(choices[0][2])
+        else:
+            def search(query):
+                query = query.lower()
+                return [choice for choice in choices if query in f"{choice[0]} {choice[1]}".lower()]
+            self._show_picker(f"Definitions of {name}", search, "Filter by class or file")
+
+    def show_symbol_picker(self):
+        """Fuzzy picker over every symbol of the project (or of the current file without a project)."""
+        editor = self.editor.get_current_editor()
+        current_path = editor.get_file_path() if editor and hasattr(editor, 'get_file_path') else None
+        self._with_current_file_symbols(editor, lambda symbols: self._show_symbol_picker(symbols, current_path), "Go to Symbol")
+
+    def _show_symbol_picker(self, current_symbols, current_path):
+        current_matcher = FuzzyMatcher([symbol[0] for symbol in current_symbols])
+
+        def search(query):
+            choices = [self._document_symbol_choice(current_symbols[i], current_path) for i in current_matcher.match(query, 20)]
+            if self.project_symbols.table is not None:
+                choices += self._project_symbol_choices(self.project_symbols.search(query, 100), current_path)
+            return choices
+
+        if self.project_symbols.table is None:
+            self.status_bar.showMessage("Project symbols are not indexed yet: showing this file only.", 5000)
+        self._show_picker("Go to Symbol in Workspace", search, "Type a symbol name (fuzzy)")
+
+    def show_file_picker(self):
+        """Go to File: fuzzy picker over every file under the project root."""
+        if self.path_index.root is None:
+            self.path_index.open_root(self.file_manager.model.rootPath())
+        else:
+            self.path_index.rescan_if_stale()
+        picker = QuickOpenPicker(self.path_index, parent=self)
+        picker.item_chosen.connect(self.editor.load_file)
+        picker.set_query("")
+        picker.exec()
+        picker.deleteLater()
+
+    def go_to_matching_bracket(self):
+        editor = self.editor.get_current_editor()
+        if editor is not None and hasattr(editor, 'jump_to_matching_bracket'):
+            if not editor.jump_to_matching_bracket():
+                self.status_bar.showMessage("No matching bracket at the cursor.", 3000)
+
+    def fold_at_cursor(self):
+        editor = self.editor.get_current_editor()
+        if editor is not None and hasattr(editor, 'fold_at_cursor'):
+            if not editor.fold_at_cursor():
+                self.status_bar.showMessage("Nothing to fold at the cursor.", 3000)
+
+    def unfold_at_cursor(self):
+        editor = self.editor.get_current_editor()
+        if editor is not None and hasattr(editor, 'unfold_at_cursor'):
+            editor.unfold_at_cursor()
+
+    def fold_to_level(self, level):
+        """Folds the current tab to level (0 = unfold all)."""
+        editor = self.editor.get_current_editor()
+        if editor is not None and hasattr(editor, 'fold_to_level') and not editor.is_loading():
+            editor.fold_to_level(level)
+
+    def show_completions(self):
+        """Opens the word completion popup of the current tab."""
+        editor = self.editor.get_current_editor()
+        if editor is not None and hasattr(editor, 'completer') and not editor.isReadOnly():
+            editor.setFocus()
+            editor.completer.show()
+
+    def _show_picker(self, title, search, placeholder):
+        picker = FuzzyPicker(title, search, placeholder, parent=self)
+        picker.item_chosen.connect(self.open_symbol)
+        picker.set_query("")
+        picker.exec()
+        picker.deleteLater()
+
+    def open_symbol(self, location):
+        """Opens a (path, line, column) picker payload; a path of None is the current tab."""
+        path, line, column = location
+        if path:
+            self.open_location(path, line, column)
+            return
+        editor = self.editor.get_current_editor()
+        if editor and hasattr(editor, 'go_to_line'):
+            editor.go_to_line(line)
+            editor.setFocus()
+
+    def show_index_status(self, message):
+        self.status_bar.showMessage(message, 8000)
+
+    def on_project_paths_changed(self, paths):
+        """Files the file manager saw change on disk (checkouts, other tools): the indexes catch up."""
+        for path in paths:
+            self.project_index.notify_changed(path)
+            self.project_symbols.notify_changed(path)
+            self.path_index.notify_changed(path)
+
+    def on_project_directories_changed(self, paths):
+        """Directories the file manager saw appear or go away: Go to File adds / drops their files."""
+        for path in paths:
+            self.path_index.notify_directory_changed(path)
+
+    def go_to_outline_line(self, line):
+        """Moves the active tab to an outline entry."""
+        editor = self.editor.get_current_editor()
+        if editor and hasattr(editor, 'go_to_line'):
+            editor.go_to_line(line)
+            editor.setFocus()
+
+    def open_location(self, path, line, column=0):
+        """Opens a file (or focuses its tab) and moves to the 1-indexed line."""
+        self.editor.load_file(path)
+        editor = self.editor.get_current_editor()
+        if editor and editor.get_file_path() and hasattr(editor, 'go_to_line'):
+            editor.go_to_line(line)
+            editor.setFocus()
+
     def new_file(self):
         try:
             self.editor.create_new_file()
@@ -781,6 +1242,53 @@ class GW(QMainWindow):
         else:
             self.status_bar.showMessage("File saved successfully.", 3000) 
 
+    def save_all(self):
+        if self.editor.save_all_files():
+            self.status_bar.showMessage("All files saved.", 3000)
+        else:
+            self.status_bar.showMessage("Save All cancelled.", 3000)
+
+    def closeEvent(self, event):
+        """Offers to save dirty tabs and flushes background writes before exiting."""
+        saving = False
+        if self.editor.has_unsaved_changes():
+            ret = QMessageBox.warning(self, "Unsaved Changes",
+                "Some documents have unsaved changes.\nDo you want to save them before exiting?",
+                QMessageBox.SaveAll | QMessageBox.Discard | QMessageBox.Cancel)
+            if ret == QMessageBox.Cancel:
+                event.ignore()
+                return
+            if ret == QMessageBox.SaveAll:
+                if not self.editor.save_all_files():
+                    event.ignore()
+                    return
+                saving = True
+
+        # Make sure queued saves reach the disk before the process goes away
+        self.status_bar.showMessage("Writing pending saves...")
+        if not wait_for_saves(10000):
+            QMessageBox.warning(self, "Save Error", "Some files are still being written. Please try again.")
+            event.ignore()
+            return
+
+        # Deliver the save results: a failed write marks its tab dirty again
+        QCoreApplication.processEvents()
+        if saving and self.editor.has_unsaved_changes():
+            self.status_bar.showMessage("Exit cancelled: some files could not be saved.", 5000)
+            event.ignore()
+            return
+
+        # Clean exit: nothing left to recover
+        self.journal_service.discard_all()
+        self.workspace_cache.save()
+        self.project_search.cancel_search()
+        self.project_index.cancel()
+        self.project_symbols.cancel()
+        self.language_servers.shutdown()
+        self.git_integration.shutdown()
+        shutdown_process_pool()
+        event.accept()
+
     # --- ADDED: Rename Current File Functionality ---
     def rename_current_file(self):
         """Renames the file currently active in the editor within its current directory."""
@@ -810,9 +1318,20 @@ class GW(QMainWindow):
                  self.status_bar.showMessage("Rename Error: Target file exists.", 5000)
                  return
 
+            # A queued save still writing the old path would recreate it after the rename
+            if not wait_for_saves(10000):
+                QMessageBox.warning(self, "Rename Error", "The file is still being written. Please try again.")
+                self.status_bar.showMessage("Rename Error: Save in progress.", 5000)
+                return
+
             try:
                 # 1. Perform the actual OS rename (move/rename)
                 os.rename(old_path, new_path)
+                for path in (old_path, new_path):
+                    self.project_index.notify_changed(path)
+                    self.project_symbols.notify_changed(path)
+                    self.path_index.notify_changed(path)
+                    self.git_integration.notify_changed(path)
                 
                 # 2. Update the editor/tab title and internal path
                 # Assuming the editor class has a method to update its path and tab title
@@ -826,9 +1345,8 @@ class GW(QMainWindow):
                     tab_index = self.editor.indexOf(editor)
                     self.editor.setTabText(tab_index, new_name)
                 
-                # 3. Refresh the file manager sidebar
-                if hasattr(self.file_manager, 'refresh'):
-                    self.file_manager.refresh() 
+                # 3. Move the file in the file manager sidebar
+                self.file_manager.file_renamed(old_path, new_path)
                 
                 self.status_bar.showMessage(f"File successfully renamed to '{new_name}'", 5000)
 
@@ -860,19 +1378,25 @@ class GW(QMainWindow):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
+            # A queued save still writing the file would recreate it after the delete
+            if not wait_for_saves(10000):
+                QMessageBox.warning(self, "Delete Error", "The file is still being written. Please try again.")
+                self.status_bar.showMessage("Delete Error: Save in progress.", 5000)
+                return
+
             try:
                 # Delete the file from the OS
                 os.remove(file_path)
+                self.project_index.notify_changed(file_path)
+                self.project_symbols.notify_changed(file_path)
+                self.path_index.notify_changed(file_path)
+                self.git_integration.notify_changed(file_path)
                 
                 # Close the tab in the editor
-                current_index = self.editor.currentIndex()
-                if current_index != -1:
-                    self.editor.removeTab(current_index) 
+                self.editor.discard_tab(editor)
                     
-                # Refresh the file manager sidebar to reflect the deletion
-                # Assumes FileManager has a refresh method.
-                if hasattr(self.file_manager, 'refresh'):
-                    self.file_manager.refresh() 
+                # Drop the file from the file manager sidebar
+                self.file_manager.file_deleted(file_path)
                 
                 self.status_bar.showMessage(f"File deleted successfully: {os.path.basename(file_path)}", 5000)
 
@@ -885,14 +1409,14 @@ class GW(QMainWindow):
         self.autosave_enabled = bool(state) # Completed the line for Python validity
         self.settings["autosave"] = self.autosave_enabled
         save_settings(self.settings)
+        self.autosave_service.set_enabled(self.autosave_enabled)
+
+    def on_autosaved(self, path):
+        self.status_bar.showMessage(f"Autosaved {os.path.basename(path)}", 1000)
 
-    def autosave(self):
-        if self.autosave_enabled:
-            # Check if the autosave timer is actually running before trying to save
-            if self.autosave_timer.isActive():
-                if self.editor.save_current_file():
-                    self.status_bar.showMessage("Autosave triggered.", 1000) 
-            # If the timer is not active (i.e., paused for update), do nothing.
+    def on_autosave_failed(self, path):
+        # No dialog from a background save, the tab stays marked as modified
+        self.status_bar.showMessage(f"Autosave failed: {path}", 5000)
 
     def apply_theme(self, theme_name):
         stylesheet = load_theme(theme_name)
@@ -0,0 +1,118 @@
+# --- File: benchmarks/folding_checks.py ---
+# Edit scenarios for core.folding.FoldIndex. Each one folds a region,
+# edits the document and checks that the blocks shown are exactly those no
+# collapsed header hides (what the gutter, the highlighter's viewport pass
+# and the rainbow brackets rely on when they step with next_shown).
+#
+# usage: python benchmarks/folding_checks.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QApplication, QPlainTextEdit
+
+from core.folding import FoldIndex
+
+
+def make(text):
+    editor = QPlainTextEdit()
+    editor.setPlainText(text)
+    index = FoldIndex(editor.document())
+    index.rebuild()
+    return editor, index
+
+
+def edit(editor, block_number, column, insert):
+    cursor = QTextCursor(editor.document().findBlockByNumber(block_number))
+    cursor.movePosition(QTextCursor.Right, n=column)
+    cursor.insertText(insert)
+
+
+def problems(index):
+    """Blocks whose visibility disagrees with the collapsed headers, as (block, visible) pairs."""
+    found = []
+    block = index.document.firstBlock()
+    number = 0
+    hidden_until = -1
+    while block.isValid():
+        expected = number > hidden_until
+        if block.isVisible() != expected:
+            found.append((number, block.isVisible()))
+        if expected and index.collapsed[number]:
+            hidden_until = index.region_end(number)
+        block = block.next()
+        number += 1
+    return found
+
+
+def check_indent_after_blank_line():
+    # The edited line follows the fold across a blank line and joins its region
+    editor, index = make("def f():\n    x = 1\n\nx = 3\ny = 4\n")
+    index.fold(0)
+    edit(editor, 3, 0, "    ")
+    assert not index.is_collapsed(0) # Its region grew: opened like any fold an edit lands next to
+    assert not problems(index), problems(index)
+
+
+def check_indent_after_nested_fold():
+    # The fold closes a class; blank lines and the edit follow its last method
+    editor, index = make("class A:\n    def f(self):\n        pass\n\n\nx = 3\n")
+    index.fold(0)
+    edit(editor, 5, 0, "    ")
+    assert not problems(index), problems(index)
+
+
+def check_typing_in_folded_header():
+    editor, index = make("def f():\n    x = 1\ny = 2\n")
+    index.fold(0)
+    edit(editor, 0, 5, "g")
+    assert index.is_collapsed(0)
+    assert not problems(index), problems(index)
+
+
+def check_edit_inside_fold():
+    editor, index = make("def f():\n    x = 1\n    z = 2\ny = 2\n")
+    index.fold(0)
+    cursor = QTextCursor(editor.document().findBlockByNumber(2))
+    cursor.insertText("#")
+    assert not index.is_collapsed(0)
+    assert not problems(index), problems(index)
+
+
+def check_edit_away_from_fold():
+    editor, index = make("def f():\n    x = 1\n\ny = 2\n\nz = 3\n")
+    index.fold(0)
+    edit(editor, 5, 0, "    ")
+    assert index.is_collapsed(0)
+    assert not problems(index), problems(index)
+
+
+CHECKS = [
+    check_indent_after_blank_line,
+    check_indent_after_nested_fold,
+    check_typing_in_folded_header,
+    check_edit_inside_fold,
+    check_edit_away_from_fold,
+]
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {check.__name__}: {e}")
+        else:
+            print(f"ok    {check.__name__}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
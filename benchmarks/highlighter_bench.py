@@ -0,0 +1,122 @@
+# --- File: benchmarks/highlighter_bench.py ---
+# Before/after benchmark for the PythonHighlighter tokenizer.
+#
+# "before" replays the old highlightBlock: one globalMatch pass per rule
+# (comments, 33 keywords, 19 operators, numbers, def, class, strings) plus
+# the triple-quote scan.  "after" is core.tokenizer.tokenize_block.
+# Only the scanning cost is measured; setFormat() is identical for both.
+#
+# usage: python benchmarks/highlighter_bench.py [file.py ...]
+
+import os
+import sys
+import time
+import sysconfig
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import tokenizer
+
+try:
+    from PySide6.QtCore import QRegularExpression
+    HAVE_QT = True
+except ImportError:
+    import re
+    HAVE_QT = False
+
+OPERATORS = [
+    '=', '==', '!=', '<', '<=', '>', '>=', '\\+', '-', '\\*', '/',
+    '//', '%', '\\*\\*', '\\+=', '-=', '\\*=', '/=', '%='
+]
+
+
+def legacy_rules():
+    """Pattern list of the old highlighter, in its original order."""
+    patterns = ["#[^\n]*"]
+    patterns += [f"\\b{keyword}\\b" for keyword in tokenizer.KEYWORDS]
+    patterns += OPERATORS
+    patterns += ["\\b[0-9]+(\\.[0-9]+)?\\b", "\\bdef\\s+(\\w+)\\b", "\\bclass\\s+(\\w+)\\b", '".*?"']
+    return patterns
+
+
+def make_legacy_scanner():
+    patterns = legacy_rules()
+
+    if HAVE_QT:
+        rules = [QRegularExpression(p) for p in patterns]
+        triple = QRegularExpression('"""')
+
+        def scan(text, state):
+            hits = 0
+            for rule in rules:
+                it = rule.globalMatch(text)
+                while it.hasNext():
+                    it.next()
+                    hits += 1
+            start = 0
+            if state == 1:
+                m = triple.match(text, 0)
+                if not m.hasMatch():
+                    return hits, 1
+            state = 0
+            while True:
+                m = triple.match(text, start)
+                if not m.hasMatch():
+                    break
+                e = triple.match(text, m.capturedEnd())
+                if not e.hasMatch():
+                    state = 1
+                    break
+                start = e.capturedEnd()
+            return hits, state
+    else:
+        rules = [re.compile(p) for p in patterns]
+
+        def scan(text, state):
+            hits = 0
+            for rule in rules:
+                for _ in rule.finditer(text):
+                    hits += 1
+            if state == 1 and '"""' not in text:
+                return hits, 1
+            return hits, 1 if text.count('"""') % 2 else 0
+
+    return scan
+
+
+def default_files():
+    """A few large, real Python modules from the standard library."""
+    stdlib = sysconfig.get_paths()["stdlib"]
+    names = ["typing.py", "argparse.py", "inspect.py", "tarfile.py", "_pydecimal.py", "pydoc.py"]
+    return [os.path.join(stdlib, n) for n in names if os.path.exists(os.path.join(stdlib, n))]
+
+
+def run(lines, scan):
+    state = 0
+    start = time.perf_counter()
+    for line in lines:
+        _, state = scan(line, state)
+    return time.perf_counter() - start
+
+
+def main(paths):
+    paths = paths or default_files()
+    lines = []
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines.extend(f.read().splitlines())
+
+    legacy = make_legacy_scanner()
+    # Best of 3 to smooth out noise
+    before = min(run(lines, legacy) for _ in range(3))
+    after = min(run(lines, tokenizer.tokenize_block) for _ in range(3))
+
+    engine = "QRegularExpression" if HAVE_QT else "re (PySide6 not installed)"
+    print(f"files: {len(paths)}  lines: {len(lines)}  legacy engine: {engine}")
+    print(f"before (multi-pass): {before * 1000:9.1f} ms  ({before / len(lines) * 1e6:6.2f} us/line)")
+    print(f"after  (single pass): {after * 1000:9.1f} ms  ({after / len(lines) * 1e6:6.2f} us/line)")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
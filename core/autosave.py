@@ -0,0 +1,132 @@
+# --- File: core/autosave.py ---
+# Edit-driven autosave for every open tab of an Editor.
+
+import os
+import time
+
+from PySide6.QtCore import Signal, QObject, QTimer
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# ------------------------------------------------------------------
+# 💾 AUTOSAVE SERVICE
+# ------------------------------------------------------------------
+
+class AutosaveService(QObject):
+    """
+    Saves each edited document once it has been idle for delay_ms.
+
+    Every tab gets its own deadline, pushed back by each edit, and one
+    single-shot timer fires for the earliest one. Only documents with a
+    path and unsaved edits are written, never through a dialog, and the
+    write itself runs on the background save workers.
+    """
+    autosaved = Signal(str)             # Path whose save was queued
+    autosave_failed = Signal(str)       # Path whose background write failed
+
+    DEFAULT_DELAY_MS = 2000
+
+    def __init__(self, editor, delay_ms=DEFAULT_DELAY_MS, enabled=True, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.delay = delay_ms / 1000
+        self._enabled = enabled
+        self._paused = False
+        self._deadlines = {} # Tab widget -> time.monotonic() it is due at
+        self._in_flight = set() # Absolute paths of autosaves not yet on disk
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._save_due)
+
+        editor.editor_opened.connect(self.track)
+        editor.editor_closed.connect(self.untrack)
+        for i in range(editor.count()):
+            self.track(editor.widget(i))
+
+    # -------------------------------------------------------------
+    # --- Tabs
+    # -------------------------------------------------------------
+
+    def track(self, widget):
+        if not hasattr(widget, "textChanged"):
+            return # Read-only views (LargeFileViewer) never need saving
+        widget.textChanged.connect(self._on_text_changed)
+        widget.save_finished.connect(self._on_save_finished)
+
+    def untrack(self, widget):
+        if self._deadlines.pop(widget, None) is not None:
+            self._reschedule()
+
+    def _on_text_changed(self):
+        widget = self.sender()
+        if not self._enabled or widget.get_file_path() is None:
+            return # Untitled buffers are left to an explicit Save As
+        self._deadlines[widget] = time.monotonic() + self.delay
+        self._reschedule()
+
+    def _on_save_finished(self, path, success):
+        if path in self._in_flight:
+            self._in_flight.discard(path)
+            if not success:
+                self.autosave_failed.emit(path)
+
+    # -------------------------------------------------------------
+    # --- Control
+    # -------------------------------------------------------------
+
+    def set_enabled(self, enabled):
+        self._enabled = enabled
+        if not enabled:
+            self._deadlines.clear()
+            self._timer.stop()
+
+    def set_delay(self, delay_ms):
+        self.delay = delay_ms / 1000
+
+    def pause(self):
+        """Holds back saves (e.g. while an update is extracted) until resume()."""
+        self._paused = True
+        self._timer.stop()
+
+    def resume(self):
+        self._paused = False
+        self._reschedule()
+
+    # -------------------------------------------------------------
+    # --- Saving
+    # -------------------------------------------------------------
+
+    def _reschedule(self):
+        if self._paused or not self._deadlines:
+            self._timer.stop()
+            return
+        wait = min(self._deadlines.values()) - time.monotonic()
+        self._timer.start(max(0, int(wait * 1000)))
+
+    def _save_due(self):
+        now = time.monotonic()
+        due = [widget for widget, deadline in self._deadlines.items() if deadline <= now]
+        for widget in due:
+            del self._deadlines[widget]
+            # Skip buffers that were saved, undone back to clean, or are still loading
+            if not widget.is_modified() or widget.get_file_path() is None:
+                continue
+            path = widget.get_file_path()
+            if widget.save_file(quiet=True):
+                Debug(f"DEBUG: Autosave queued for {path}")
+                self._in_flight.add(os.path.abspath(path))
+                self.autosaved.emit(path)
+        self._reschedule()
@@ -0,0 +1,385 @@
+# --- File: core/brackets.py ---
+# Bracket pairs of a CodeEditorCore document. The highlighter reports the
+# brackets of every block it tokenizes (strings and comments already left
+# out), and BracketIndex keeps them in chunks of consecutive blocks: an edit
+# only re-pairs its own chunk, and the unmatched leftovers of all chunks are
+# paired in one short pass. BracketView draws the pair at the cursor and
+# rainbow colours for the visible blocks from that index.
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from PySide6.QtWidgets import QTextEdit
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PySide6.QtCore import QObject, QTimer
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+OPENERS = "([{"
+OPENER_OF = {")": "(", "]": "[", "}": "{"}
+
+EMPTY = ("", ()) # (bracket characters, their columns) of a block without brackets / not tokenized yet
+
+RAINBOW_COLORS = ["#FFD700", "#DA70D6", "#179FFF"]
+UNMATCHED_COLOR = "#F44747"
+MATCH_BACKGROUND = "#3A3D41"
+
+def block_entry(text, columns):
+    """Index entry for the bracket columns the tokenizer found in a block's text."""
+    if not columns:
+        return EMPTY
+    chars = "".join(text[column] for column in columns)
+    if not text.isascii() and max(text) > "\uffff":
+        # Qt counts UTF-16 units: characters outside the BMP take two
+        astral = [index for index, char in enumerate(text) if char > "\uffff"]
+        columns = [column + bisect_left(astral, column) for column in columns]
+    return chars, tuple(columns)
+
+# ------------------------------------------------------------------
+# 🧮 BRACKET INDEX
+# ------------------------------------------------------------------
+
+class _Chunk:
+    """Brackets of consecutive blocks, paired among themselves."""
+    __slots__ = ('lines', 'dirty', 'chars', 'line_offsets', 'match', 'depth', 'closers', 'openers')
+
+    def __init__(self, lines):
+        self.lines = lines # (chars, columns) per block
+        self.dirty = True
+
+    def pair(self):
+        """
+        Pairs the brackets inside the chunk. Closers with nothing open before
+        them in the chunk and openers still open at its end are left over for
+        BracketIndex to pair across chunks.
+        """
+        self.chars = chars = "".join(entry[0] for entry in self.lines)
+        self.line_offsets = [0]
+        self.line_offsets.extend(accumulate(len(entry[0]) for entry in self.lines))
+        self.match = match = [-1] * len(chars)
+        self.depth = depth = [0] * len(chars) # Relative to the depth at the chunk start
+        self.closers = closers = []
+        stack = []
+        running = 0
+        for ordinal, char in enumerate(chars):
+            if char in OPENERS:
+                depth[ordinal] = running
+                running += 1
+                stack.append(ordinal)
+            elif stack:
+                if chars[stack[-1]] == OPENER_OF[char]:
+                    partner = stack.pop()
+                    match[ordinal] = partner
+                    match[partner] = ordinal
+                    running -= 1
+                    depth[ordinal] = running
+                else:
+                    depth[ordinal] = -1 # Closes something else: never matched
+            else:
+                running -= 1
+                depth[ordinal] = running
+                closers.append(ordinal)
+        self.openers = stack
+        self.dirty = False
+
+class BracketIndex:
+    """
+    Brackets of every block of a document, in chunks of CHUNK_BLOCKS blocks.
+    Must be connected to contentsChange before the highlighter is created,
+    so blocks are shifted before the highlighter reports their new brackets.
+    """
+    CHUNK_BLOCKS = 512
+
+    def __init__(self, document):
+        self.document = document
+        self.revision = 0 # Bumped whenever pairs or depths may have changed
+        self._reset(document.blockCount())
+        document.contentsChange.connect(self._on_contents_change)
+
+    def _reset(self, block_count):
+        size = self.CHUNK_BLOCKS
+        self.chunks = [_Chunk([EMPTY] * min(size, block_count - start)) for start in range(0, max(1, block_count), size)]
+        self._block_count = block_count
+        self._structure_changed()
+
+    def _structure_changed(self):
+        self._starts = None  # First block of every chunk
+        self._paired = False
+        self.revision += 1
+
+    def _chunk_starts(self):
+        if self._starts is None:
+            self._starts = [0]
+            self._starts.extend(accumulate(len(chunk.lines) for chunk in self.chunks))
+        return self._starts
+
+    def _locate_block(self, number):
+        """(chunk index, line index in the chunk) of a block."""
+        starts = self._chunk_starts()
+        chunk_index = min(bisect_right(starts, number) - 1, len(self.chunks) - 1)
+        return chunk_index, number - starts[chunk_index]
+
+    # -------------------------------------------------------------
+    # --- Updates
+    # -------------------------------------------------------------
+
+    def set_block(self, number, entry):
+        """The highlighter tokenized a block: entry is (bracket characters, columns)."""
+        if self._block_count != self.document.blockCount():
+            self._reset(self.document.blockCount()) # Text was set with signals blocked
+        chunk_index, line = self._locate_block(number)
+        chunk = self.chunks[chunk_index]
+        old = chunk.lines[line]
+        chunk.lines[line] = entry
+        if old[0] != entry[0]:
+            chunk.dirty = True
+            self._paired = False
+            self.revision += 1
+
+    def _on_contents_change(self, position, removed, added):
+        document = self.document
+        block_count = document.blockCount()
+        first = document.findBlock(position).blockNumber()
+        end_block = document.findBlock(position + added)
+        last = end_block.blockNumber() if end_block.isValid() else block_count - 1
+        old_last = last - (block_count - self._block_count)
+        if first < 0 or old_last < first or old_last >= self._block_count:
+            self._reset(block_count)
+            return
+        self._block_count = block_count
+        if first == last == old_last:
+            return # Same block: the highlighter reports its new brackets right away
+
+        # Replace the blocks of the edit with unknown ones in the chunks they span
+        first_chunk, first_line = self._locate_block(first)
+        last_chunk, last_line = self._locate_block(old_last)
+        spanned = self.chunks[first_chunk:last_chunk + 1]
+        lines = [entry for chunk in spanned for entry in chunk.lines]
+        end = sum(len(chunk.lines) for chunk in spanned[:-1]) + last_line + 1
+        lines[first_line:end] = [EMPTY] * (last - first + 1)
+
+        size = self.CHUNK_BLOCKS
+        # Keep chunks between half and twice the target size
+        if len(lines) < size // 2 and last_chunk + 1 < len(self.chunks):
+            last_chunk += 1
+            lines.extend(self.chunks[last_chunk].lines)
+        if len(lines) > size * 2:
+            replacement = [_Chunk(lines[start:start + size]) for start in range(0, len(lines), size)]
+        else:
+            replacement = [_Chunk(lines)]
+        self.chunks[first_chunk:last_chunk + 1] = replacement
+        self._structure_changed()
+
+    # -------------------------------------------------------------
+    # --- Pairing
+    # -------------------------------------------------------------
+
+    def _ensure_paired(self):
+        """Re-pairs dirty chunks, then pairs the leftovers of all chunks in order."""
+        if self._paired:
+            return
+        for chunk in self.chunks:
+            if chunk.dirty:
+                chunk.pair()
+        self._cross = {}         # (chunk, ordinal) -> (chunk, ordinal) for pairs across chunks
+        self._start_depth = []   # Nesting depth at the start of every chunk
+        self._stray = []         # Per chunk: leftover closers that close nothing (they do not change the depth)
+        stack = []               # Open (chunk, ordinal) from earlier chunks
+        for chunk_index, chunk in enumerate(self.chunks):
+            self._start_depth.append(len(stack))
+            chars = chunk.chars
+            stray = []
+            for ordinal in chunk.closers:
+                key = (chunk_index, ordinal)
+                if stack and self.chunks[stack[-1][0]].chars[stack[-1][1]] == OPENER_OF[chars[ordinal]]:
+                    partner = stack.pop()
+                    self._cross[key] = partner
+                    self._cross[partner] = key
+                else:
+                    stray.append(ordinal)
+            self._stray.append(stray)
+            stack.extend((chunk_index, ordinal) for ordinal in chunk.openers)
+        self._paired = True
+
+    def _find(self, block_number, column):
+        """(chunk index, ordinal) of the bracket at a column of a block, or None."""
+        if block_number >= self._block_count:
+            return None
+        chunk_index, line = self._locate_block(block_number)
+        chunk = self.chunks[chunk_index]
+        columns = chunk.lines[line][1]
+        position = bisect_left(columns, column)
+        if position == len(columns) or columns[position] != column:
+            return None
+        self._ensure_paired()
+        return chunk_index, chunk.line_offsets[line] + position
+
+    def _position(self, chunk_index, ordinal):
+        """(block number, column) of a bracket."""
+        chunk = self.chunks[chunk_index]
+        line = bisect_right(chunk.line_offsets, ordinal) - 1
+        return self._chunk_starts()[chunk_index] + line, chunk.lines[line][1][ordinal - chunk.line_offsets[line]]
+
+    def _partner(self, chunk_index, ordinal):
+        partner = self.chunks[chunk_index].match[ordinal]
+        if partner >= 0:
+            return chunk_index, partner
+        return self._cross.get((chunk_index, ordinal))
+
+    def partner(self, block_number, column):
+        """
+        (block number, column) of the bracket paired with the one at a column
+        of a block; None if there is no bracket there, False if it is unmatched.
+        """
+        found = self._find(block_number, column)
+        if found is None:
+            return None
+        partner = self._partner(*found)
+        return self._position(*partner) if partner is not None else False
+
+    def line_brackets(self, block_number):
+        """[(column, depth), ...] for the brackets of a block; depth is -1 for unmatched ones."""
+        if block_number >= self._block_count:
+            return []
+        chunk_index, line = self._locate_block(block_number)
+        chunk = self.chunks[chunk_index]
+        columns = chunk.lines[line][1]
+        if not columns:
+            return []
+        self._ensure_paired()
+        start_depth = self._start_depth[chunk_index]
+        stray = self._stray[chunk_index]
+        first = chunk.line_offsets[line]
+        result = []
+        for position, column in enumerate(columns):
+            ordinal = first + position
+            if chunk.match[ordinal] < 0 and (chunk_index, ordinal) not in self._cross:
+                result.append((column, -1))
+            else:
+                result.append((column, start_depth + chunk.depth[ordinal] + bisect_left(stray, ordinal)))
+        return result
+
+# ------------------------------------------------------------------
+# 🌈 BRACKET VIEW (matching pair and rainbow colours of one editor)
+# ------------------------------------------------------------------
+
+class BracketView(QObject):
+    """
+    Highlights the bracket at the cursor with its partner, and colours the
+    brackets of the visible blocks by depth. Both are extra selections
+    rebuilt after the cursor, the pairs or the viewport changed, never while
+    painting; their cursors follow edits on their own in between.
+    """
+
+    def __init__(self, editor, index, rainbow=True):
+        super().__init__(editor)
+        self.editor = editor
+        self.index = index
+        self.rainbow = rainbow
+        self._rainbow_key = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.refresh)
+
+        editor.cursorPositionChanged.connect(self.viewport_changed)
+        editor.document().contentsChange.connect(self._on_contents_change)
+        # Not straight to start(): valueChanged(int) would become the timer interval
+        editor.verticalScrollBar().valueChanged.connect(self.viewport_changed)
+
+        self._formats = [self._format(color) for color in RAINBOW_COLORS]
+        self._unmatched_format = self._format(UNMATCHED_COLOR)
+        self._match_format = QTextCharFormat()
+        self._match_format.setBackground(QColor(MATCH_BACKGROUND))
+
+    @staticmethod
+    def _format(color):
+        char_format = QTextCharFormat()
+        char_format.setForeground(QColor(color))
+        return char_format
+
+    def _on_contents_change(self, *_):
+        self._timer.start()
+
+    def viewport_changed(self, *_):
+        self._timer.start()
+
+    def bracket_at_cursor(self):
+        """(position, partner position or None) of the bracket after the cursor, else before it."""
+        cursor = self.editor.textCursor()
+        block = cursor.block()
+        column = cursor.positionInBlock()
+        for candidate in (column, column - 1):
+            if candidate < 0:
+                continue
+            partner = self.index.partner(block.blockNumber(), candidate)
+            if partner is None:
+                continue
+            position = block.position() + candidate
+            if partner is False:
+                return position, None
+            partner_block = self.editor.document().findBlockByNumber(partner[0])
+            return position, partner_block.position() + partner[1]
+        return None
+
+    def refresh(self):
+        self._refresh_match()
+        if self.rainbow:
+            self._refresh_rainbow()
+
+    def _selection(self, position, char_format):
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = QTextCursor(self.editor.document())
+        selection.cursor.setPosition(position)
+        selection.cursor.setPosition(position + 1, QTextCursor.KeepAnchor)
+        selection.format = char_format
+        return selection
+
+    def _refresh_match(self):
+        found = self.bracket_at_cursor()
+        if found is None:
+            self.editor.set_extra_selections("bracket_match", [])
+            return
+        position, partner = found
+        if partner is None:
+            selections = [self._selection(position, self._unmatched_format)]
+        else:
+            selections = [self._selection(position, self._match_format), self._selection(partner, self._match_format)]
+        self.editor.set_extra_selections("bracket_match", selections)
+
+    def _refresh_rainbow(self):
+        editor = self.editor
+        first, last = editor.visible_block_range()
+        fold_index = editor.fold_index
+        key = (self.index.revision, fold_index.revision, first, last)
+        if key == self._rainbow_key:
+            return # Nothing moved: the selections' cursors already followed the edits
+        self._rainbow_key = key
+
+        selections = []
+        formats = self._formats
+        document = editor.document()
+        number = first
+        while number <= last:
+            block = document.findBlockByNumber(number)
+            if not block.isValid():
+                break
+            start = block.position()
+            for column, depth in self.index.line_brackets(number):
+                char_format = formats[depth % len(formats)] if depth >= 0 else self._unmatched_format
+                selections.append(self._selection(start + column, char_format))
+            number = fold_index.next_shown(number)
+        editor.set_extra_selections("rainbow", selections)
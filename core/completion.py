@@ -0,0 +1,444 @@
+# --- File: core/completion.py ---
+# Word completion for CodeEditorCore. Identifiers of every open buffer, plus
+# Python keywords and builtins, live in one shared prefix trie. Each buffer
+# keeps a per-line mirror of its words, so an edit only re-reads the lines
+# it touched instead of the whole document.
+
+import builtins
+import keyword
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+
+from PySide6.QtWidgets import QCompleter
+from PySide6.QtCore import Qt, QObject, QStringListModel
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# Identifiers worth completing (shorter ones are faster to type than to pick)
+WORD_RE = re.compile(r"[^\W\d]\w{2,}")
+IDENTIFIER_RE = re.compile(r"[^\W\d]\w*$")
+
+# ------------------------------------------------------------------
+# 🌳 PREFIX TRIE
+# ------------------------------------------------------------------
+
+class PrefixTrie:
+    """
+    A burst trie of distinct words: inner nodes are dicts keyed by one
+    character, and small subtrees are kept as sorted lists of the remaining
+    suffixes until they grow past BURST_SIZE. Lookups walk at most
+    len(prefix) nodes and stop after `limit` words, however many match.
+    """
+    BURST_SIZE = 64
+
+    def __init__(self):
+        self._root = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, word):
+        node, depth = self._root, 0
+        while isinstance(node, dict):
+            if depth == len(word):
+                return "" in node
+            node = node.get(word[depth])
+            depth += 1
+            if node is None:
+                return False
+        rest = word[depth:]
+        position = bisect_left(node, rest)
+        return position < len(node) and node[position] == rest
+
+    def add(self, word):
+        """Adds a word; returns False if it was already there."""
+        node, depth = self._root, 0
+        while True:
+            if depth == len(word):
+                if "" in node:
+                    return False
+                node[""] = True # End of word marker
+                break
+            char = word[depth]
+            child = node.get(char)
+            if child is None:
+                node[char] = [word[depth + 1:]]
+                break
+            if isinstance(child, dict):
+                node, depth = child, depth + 1
+                continue
+            rest = word[depth + 1:]
+            position = bisect_left(child, rest)
+            if position < len(child) and child[position] == rest:
+                return False
+            child.insert(position, rest)
+            if len(child) > self.BURST_SIZE:
+                node[char] = self._burst(child)
+            break
+        self._count += 1
+        return True
+
+    def _burst(self, bucket):
+        """Turns a full bucket into an inner node with smaller buckets below it."""
+        node = {}
+        for suffix in bucket:
+            if not suffix:
+                node[""] = True
+            else:
+                node.setdefault(suffix[0], []).append(suffix[1:]) # Still sorted
+        return node
+
+    def remove(self, word):
+        """Removes a word; returns False if it was not there."""
+        node, depth = self._root, 0
+        while True:
+            if depth == len(word):
+                if node.pop("", None) is None:
+                    return False
+                break
+            char = word[depth]
+            child = node.get(char)
+            if child is None:
+                return False
+            if isinstance(child, dict):
+                node, depth = child, depth + 1
+                continue
+            rest = word[depth + 1:]
+            position = bisect_left(child, rest)
+            if position == len(child) or child[position] != rest:
+                return False
+            del child[position]
+            if not child:
+                del node[char]
+            break
+        self._count -= 1
+        return True
+
+    def complete(self, prefix, limit=100):
+        """Up to limit words starting with prefix, in sorted order."""
+        node, depth = self._root, 0
+        while depth < len(prefix):
+            node = node.get(prefix[depth])
+            depth += 1
+            if node is None:
+                return []
+            if not isinstance(node, dict):
+                return self._from_bucket(node, prefix[:depth], prefix[depth:], limit)
+        words = []
+        self._collect(node, prefix, words, limit)
+        return words
+
+    @staticmethod
+    def _from_bucket(bucket, stem, rest, limit):
+        words = []
+        for position in range(bisect_left(bucket, rest), len(bucket)):
+            suffix = bucket[position]
+            if not suffix.startswith(rest) or len(words) >= limit:
+                break
+            words.append(stem + suffix)
+        return words
+
+    def _collect(self, node, stem, words, limit):
+        for char in sorted(node):
+            if len(words) >= limit:
+                return
+            child = node[char]
+            if char == "":
+                words.append(stem)
+            elif isinstance(child, dict):
+                self._collect(child, stem + char, words, limit)
+            else:
+                words.extend(stem + char + suffix for suffix in child[:limit - len(words)])
+
+# ------------------------------------------------------------------
+# 📚 WORD INDEX (shared by all open buffers)
+# ------------------------------------------------------------------
+
+class WordIndex:
+    """
+    Distinct words of all open buffers with the number of buffer lines
+    holding each, plus Python keywords and builtins (always present).
+    Words typed recently are remembered for ranking.
+    """
+    RECENT_SIZE = 500      # Words remembered as recently typed
+    MAX_CANDIDATES = 200   # Trie words ranked per lookup
+
+    def __init__(self):
+        self.trie = PrefixTrie()
+        self.counts = {}
+        self.recent = OrderedDict() # Word -> tick of its last use, oldest first
+        self._tick = 0
+        for word in set(keyword.kwlist) | {name for name in dir(builtins) if not name.startswith("_")}:
+            self.counts[word] = 1 # Never released
+            self.trie.add(word)
+
+    def add(self, words):
+        counts = self.counts
+        for word in words:
+            count = counts.get(word, 0)
+            counts[word] = count + 1
+            if not count:
+                self.trie.add(word)
+
+    def remove(self, words):
+        counts = self.counts
+        for word in words:
+            count = counts.get(word, 0) - 1
+            if count > 0:
+                counts[word] = count
+            elif count == 0:
+                del counts[word]
+                self.trie.remove(word)
+
+    def touch(self, word):
+        """Marks a word as just used."""
+        self._tick += 1
+        self.recent[word] = self._tick
+        self.recent.move_to_end(word)
+        if len(self.recent) > self.RECENT_SIZE:
+            self.recent.popitem(last=False)
+
+    def complete(self, prefix, nearby=None, limit=50):
+        """
+        Words starting with prefix, best first: words used recently and
+        words close to the cursor (nearby maps word -> line distance) rank
+        above the rest, then shorter words.
+        """
+        counts = self.counts
+        candidates = set(self.trie.complete(prefix, self.MAX_CANDIDATES))
+        for word in self.recent:
+            if word.startswith(prefix) and word in counts:
+                candidates.add(word)
+        nearby = nearby or {}
+        candidates.update(word for word in nearby if word.startswith(prefix))
+        # The word being typed counts itself: only offer it if it occurs elsewhere too
+        if counts.get(prefix, 0) <= 1:
+            candidates.discard(prefix)
+
+        tick = self._tick
+        recent = self.recent
+        proximity_window = max(nearby.values(), default=0) + 1
+
+        def rank(word):
+            score = 0.0
+            last_used = recent.get(word)
+            if last_used is not None:
+                score += 1.0 - (tick - last_used) / self.RECENT_SIZE
+            distance = nearby.get(word)
+            if distance is not None:
+                score += 1.0 - distance / proximity_window
+            return -score, len(word), word
+        return sorted(candidates, key=rank)[:limit]
+
+_word_index = None
+
+def word_index():
+    """The WordIndex shared by all editors (created on first use)."""
+    global _word_index
+    if _word_index is None:
+        _word_index = WordIndex()
+    return _word_index
+
+# ------------------------------------------------------------------
+# 📄 DOCUMENT WORDS (one per editor)
+# ------------------------------------------------------------------
+
+def line_words(text):
+    return frozenset(WORD_RE.findall(text))
+
+class DocumentWords:
+    """
+    Per-line mirror of one document's words, kept in step with the shared
+    index from contentsChange: an edit re-reads only the blocks it touched.
+    Call rebuild() after text is set with the document's signals blocked.
+    """
+
+    def __init__(self, document, index=None):
+        self.document = document
+        self.index = index if index is not None else word_index()
+        self.lines = [frozenset()] # Words of every block, by block number
+        document.contentsChange.connect(self._on_contents_change)
+
+    def rebuild(self):
+        index = self.index
+        for words in self.lines:
+            index.remove(words)
+        self.lines = [line_words(line) for line in self.document.toPlainText().split("\n")]
+        for words in self.lines:
+            index.add(words)
+
+    def release(self, *_):
+        """Takes the document's words out of the shared index (the editor is going away)."""
+        for words in self.lines:
+            self.index.remove(words)
+        self.lines = []
+
+    def _on_contents_change(self, position, removed, added):
+        document = self.document
+        block_count = document.blockCount()
+        first_block = document.findBlock(position)
+        end_block = document.findBlock(position + added)
+        first = first_block.blockNumber()
+        # Qt may report a first change that runs past the end of the document
+        last = end_block.blockNumber() if end_block.isValid() else block_count - 1
+        old_last = last - (block_count - len(self.lines))
+        if first < 0 or old_last < first - 1 or old_last >= len(self.lines):
+            self.rebuild() # Out of step (text set while signals were blocked)
+            return
+
+        new_words = []
+        block = first_block
+        for _ in range(first, last + 1):
+            new_words.append(line_words(block.text()))
+            block = block.next()
+        old_words = self.lines[first:old_last + 1]
+        self.lines[first:old_last + 1] = new_words
+
+        index = self.index
+        if len(old_words) == len(new_words) == 1:
+            # Typing: only the words that changed on the line, and they count as used
+            before, after = old_words[0], new_words[0]
+            index.remove(before - after)
+            index.add(after - before)
+            for word in after - before:
+                index.touch(word)
+        else:
+            for words in old_words:
+                index.remove(words)
+            for words in new_words:
+                index.add(words)
+
+    def nearby(self, line, radius):
+        """word -> distance in lines of its nearest occurrence around a block."""
+        distances = {}
+        lines = self.lines
+        for distance in range(radius + 1):
+            for number in (line - distance, line + distance) if distance else (line,):
+                if 0 <= number < len(lines):
+                    for word in lines[number]:
+                        distances.setdefault(word, distance)
+        return distances
+
+# ------------------------------------------------------------------
+# 💬 COMPLETER (popup for one CodeEditorCore)
+# ------------------------------------------------------------------
+
+class Completer(QObject):
+    """
+    Completion popup of an editor. The editor calls key_press() before and
+    key_typed() after handling a key; show() (Ctrl+Space) opens the popup
+    without waiting for MIN_PREFIX characters. An async_source(prefix,
+    callback) (a language server, see core/lsp_client.py) may add words later.
+    """
+    MIN_PREFIX = 2          # Characters typed before the popup opens by itself
+    PROXIMITY_LINES = 100   # Lines above and below the cursor searched for nearby words
+    MAX_ITEMS = 50
+
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+        self.words = DocumentWords(editor.document())
+        editor.destroyed.connect(self.words.release)
+
+        self.model = QStringListModel(self)
+        self.popup_completer = QCompleter(self.model, self)
+        self.popup_completer.setWidget(editor)
+        self.popup_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.popup_completer.setCaseSensitivity(Qt.CaseSensitive)
+        self.popup_completer.setMaxVisibleItems(12)
+        self.popup_completer.activated.connect(self.insert_completion)
+        self._prefix = ""
+        self._words = []
+        self.async_source = None
+
+    def is_visible(self):
+        return self.popup_completer.popup().isVisible()
+
+    def hide(self):
+        self.popup_completer.popup().hide()
+
+    def key_press(self, event):
+        """True if the key belongs to the open popup and the editor must ignore it."""
+        if self.is_visible() and event.key() in (Qt.Key_Enter, Qt.Key_Return, Qt.Key_Escape, Qt.Key_Tab, Qt.Key_Backtab):
+            event.ignore() # QCompleter's popup handles it
+            return True
+        return False
+
+    def key_typed(self, event):
+        """Opens, narrows or closes the popup after the editor applied a key."""
+        text = event.text()
+        if event.modifiers() & (Qt.ControlModifier | Qt.AltModifier) or self.editor.isReadOnly():
+            return
+        if text and (text[-1].isalnum() or text[-1] == "_"):
+            if self.is_visible() or len(self._word_prefix()) >= self.MIN_PREFIX:
+                self.show(explicit=False)
+        elif event.key() == Qt.Key_Backspace and self.is_visible():
+            self.show(explicit=False)
+        elif text or event.key() in (Qt.Key_Left, Qt.Key_Right, Qt.Key_Home, Qt.Key_End):
+            self.hide()
+
+    def _word_prefix(self):
+        cursor = self.editor.textCursor()
+        block_text = cursor.block().text()
+        match = IDENTIFIER_RE.search(block_text, 0, cursor.positionInBlock())
+        return match.group() if match else ""
+
+    def candidates(self, prefix):
+        cursor = self.editor.textCursor()
+        nearby = self.words.nearby(cursor.blockNumber(), self.PROXIMITY_LINES)
+        return self.words.index.complete(prefix, nearby, self.MAX_ITEMS)
+
+    def show(self, explicit=True):
+        """Shows the completions of the word before the cursor (hides the popup if there are none)."""
+        prefix = self._word_prefix()
+        if not explicit and len(prefix) < self.MIN_PREFIX:
+            self.hide()
+            return
+        self._prefix = prefix
+        self._present(self.candidates(prefix), explicit)
+        if self.async_source is not None:
+            self.async_source(prefix, self._on_async_words)
+
+    def _on_async_words(self, prefix, words):
+        """Puts words from the async source ahead of the buffer words, if still typing that prefix."""
+        if prefix != self._prefix or prefix != self._word_prefix() or not self.editor.hasFocus():
+            return
+        lower = prefix.lower()
+        merged = [word for word in dict.fromkeys(words) if word.lower().startswith(lower)]
+        merged += [word for word in self._words if word not in merged]
+        self._present(merged[:self.MAX_ITEMS], True)
+
+    def _present(self, words, explicit):
+        self._words = words
+        if not words or (not explicit and words == [self._prefix]):
+            self.hide()
+            return
+        self.model.setStringList(words)
+        popup = self.popup_completer.popup()
+        popup.setCurrentIndex(self.model.index(0, 0))
+
+        rect = self.editor.cursorRect()
+        rect.translate(self.editor.viewportMargins().left(), 0)
+        rect.setWidth(popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width() + 8)
+        self.popup_completer.complete(rect)
+
+    def insert_completion(self, word):
+        cursor = self.editor.textCursor()
+        cursor.movePosition(cursor.MoveOperation.Left, cursor.MoveMode.KeepAnchor, len(self._prefix))
+        cursor.insertText(word)
+        self.editor.setTextCursor(cursor)
+        self.words.index.touch(word)
@@ -0,0 +1,88 @@
+# --- File: core/document_registry.py ---
+# Maps files to the Editor tabs showing them, independent of how the path
+# was spelled (symlinks, relative paths, case on case-insensitive systems).
+
+import os
+
+def file_keys(path):
+    """
+    Canonical keys for a path: its normalized real path and, if the file
+    exists, its (device, inode) pair, which also matches hard links.
+    """
+    real = os.path.normcase(os.path.realpath(os.path.abspath(path)))
+    keys = [("path", real)]
+    try:
+        stat = os.stat(real)
+    except OSError:
+        return keys
+    if stat.st_ino:
+        # Some Windows file systems report 0 for every file
+        keys.insert(0, ("inode", stat.st_dev, stat.st_ino))
+    return keys
+
+class DocumentRegistry:
+    """
+    Open documents by canonical file key, so finding the tab of a file is a
+    dict lookup instead of a scan over every tab.
+
+    Atomic saves give a file a new inode, so owners re-register a document
+    after each save as well as on open, save-as, rename and close.
+    """
+
+    def __init__(self):
+        self._by_key = {} # File key -> tab widget
+        self._keys = {}   # Tab widget -> its file keys
+
+    def register(self, widget, path):
+        """(Re)binds a tab to a path. A path of None just forgets the tab."""
+        self.unregister(widget)
+        if not path:
+            return
+        keys = file_keys(path)
+        for key in keys:
+            self._by_key[key] = widget
+        self._keys[widget] = keys
+
+    def unregister(self, widget):
+        for key in self._keys.pop(widget, ()):
+            if self._by_key.get(key) is widget:
+                del self._by_key[key]
+
+    def replace(self, old, new):
+        """Moves the keys of one tab widget to its replacement (hibernation)."""
+        keys = self._keys.pop(old, [])
+        for key in keys:
+            self._by_key[key] = new
+        if keys:
+            self._keys[new] = keys
+
+    def find(self, path):
+        """The tab showing path, or None."""
+        keys = file_keys(path)
+        for key in keys:
+            widget = self._by_key.get(key)
+            if widget is None:
+                continue
+            if key[0] == "inode" and not self._same_file(widget, keys[-1][1]):
+                # The tab's file was deleted or replaced outside the IDE and its inode reused
+                del self._by_key[key]
+                self._keys[widget].remove(key)
+                continue
+            return widget
+        return None
+
+    def _same_file(self, widget, real):
+        """True if the file a tab was registered with is still the file at real (a normalized real path)."""
+        registered = self._keys[widget][-1][1]
+        if registered == real:
+            return True
+        try:
+            return os.path.samefile(registered, real) # Hard links
+        except OSError:
+            return False
+
+    def widgets(self):
+        return list(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
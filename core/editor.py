@@ -5,12 +5,26 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import (
     QPainter, QColor, QFont, QTextCharFormat, 
-    QTextCursor, QSyntaxHighlighter
+    QTextCursor, QSyntaxHighlighter, QTextBlockUserData, QStaticText, QPolygon
 )
 from PySide6.QtCore import (
     QSize, Qt, QRect, QFileInfo, QSignalBlocker, 
-    QFile, QIODevice, Signal, QRegularExpressionMatch, QRegularExpression
+    QFile, QIODevice, Signal, QObject, QTimer, QThreadPool, QEvent, QPoint
 )
+import os
+import queue
+import time
+from array import array
+from core import tokenizer
+from core.settings import load_settings, default_settings
+from core.large_file import LargeFileViewer
+from core.journal import replay_journal
+from core.hibernation import HibernatedTab
+from core.document_registry import DocumentRegistry
+from core.file_io import FileLoadWorker, FileSaveWorker, save_thread_pool
+from core.completion import Completer
+from core.brackets import BracketIndex, BracketView, block_entry
+from core.folding import FoldIndex
 logger = "0"
 try:
     from addons.debug import *
@@ -63,117 +77,273 @@ FORMATS = {
 # 🎨 SYNTAX HIGHLIGHTING: PythonHighlighter Class
 # ------------------------------------------------------------------
 
-class PythonHighlighter(QSyntaxHighlighter):
-    """A basic QSyntaxHighlighter for Python code."""
-    
-    # 1. Define the keyword/rule lists
-    KEYWORDS = [
-        'and', 'as', 'assert', 'break', 'class', 'continue', 'def', 
-        'del', 'elif', 'else', 'except', 'finally', 'for', 'from', 
-        'global', 'if', 'import', 'in', 'is', 'lambda', 'nonlocal', 
-        'not', 'or', 'pass', 'raise', 'return', 'try', 'while', 'with', 
-        'yield', 'True', 'False', 'None'
-    ]
-    
-    OPERATORS = [
-        '=', '==', '!=', '<', '<=', '>', '>=', '\\+', '-', '\\*', '/', 
-        '//', '%', '\\*\\*', '\\+=', '-=', '\\*=', '/=', '%='
-    ]
-    
-    # 2. Setup rules (order matters for complex regex)
-    RULES = []
+# Extra block states used while a background pass is running
+STATE_PENDING = -1      # not highlighted yet (Qt's default block state)
+STATE_GUESSED = 0x100   # highlighted with an assumed entry state (viewport first)
+STATE_MASK = 0xFF       # bits holding the real tokenizer state
+
 
-    # Rule 1: Comments (must be first)
-    # The '?' makes the matching non-greedy, stopping at the first EOL
-    RULES.append((QRegularExpression("#[^\n]*"), FORMATS['comment'])) 
+class TokenBlockData(QTextBlockUserData):
+    """
+    Per-block token cache. Spans are stored as a flat array of
+    (start, length, kind) triples, keyed by the hash of the block text and
+    the tokenizer entry state, along with the block's brackets (see
+    core/brackets.py). The result for the other entry state of the
+    same text is kept too, so opening and closing a multi-line string
+    (or undoing it) reuses spans in both directions.
+    """
+    __slots__ = ('text_hash', 'entry_state', 'end_state', 'spans', 'brackets', 'previous')
 
-    # Rule 2: Keywords
-    # Use word boundaries (\b) to match whole words only
-    for keyword in KEYWORDS:
-        # \b is a word boundary; e.g. it matches 'if' but not 'elif' or 'identifierif'
-        RULES.append((QRegularExpression(f"\\b{keyword}\\b"), FORMATS['keyword']))
+    def __init__(self):
+        super().__init__()
+        self.text_hash = None
+        self.entry_state = -1
+        self.end_state = -1
+        self.spans = None
+        self.brackets = None
+        self.previous = None # (entry_state, end_state, spans, brackets) for the same text
 
-    # Rule 3: Operators
-    for operator in OPERATORS:
-        RULES.append((QRegularExpression(operator), FORMATS['operator']))
+    def lookup(self, text_hash, entry_state):
+        """Returns (spans, end_state, brackets) if cached, otherwise None."""
+        if text_hash != self.text_hash:
+            return None
+        if entry_state == self.entry_state:
+            return self.spans, self.end_state, self.brackets
+        previous = self.previous
+        if previous is not None and previous[0] == entry_state:
+            return previous[2], previous[1], previous[3]
+        return None
+
+    def store(self, text_hash, entry_state, spans, end_state, brackets):
+        """Caches a tokenizer result and returns the compact spans."""
+        if text_hash == self.text_hash and entry_state != self.entry_state:
+            self.previous = (self.entry_state, self.end_state, self.spans, self.brackets)
+        else:
+            self.previous = None
+        self.text_hash = text_hash
+        self.entry_state = entry_state
+        self.end_state = end_state
+        self.spans = array('I', spans)
+        self.brackets = brackets
+        return self.spans
 
-    # Rule 4: Numbers (integers, floats)
-    RULES.append((QRegularExpression("\\b[0-9]+(\\.[0-9]+)?\\b"), FORMATS['numbers']))
 
-    # Rule 5: Function Definition (def identifier)
-    RULES.append((QRegularExpression("\\bdef\\s+(\\w+)\\b"), FORMATS['function']))
+class PythonHighlighter(QSyntaxHighlighter):
+    """A basic QSyntaxHighlighter for Python code."""
     
-    # Rule 6: Class Definition (class identifier)
-    RULES.append((QRegularExpression("\\bclass\\s+(\\w+)\\b"), FORMATS['class']))
+    # Keyword list lives with the tokenizer (single source of truth)
+    KEYWORDS = tokenizer.KEYWORDS
 
-    # Rules for multi-line block (string literals - handled in highlightBlock)
-    STRING_RULE = (QRegularExpression('".*?"'), FORMATS['string'])
+    # Format for each tokenizer kind, indexed by the kind number
+    KIND_FORMATS = [FORMATS[name] for name in tokenizer.TOKEN_KINDS]
     
     def __init__(self, parent):
         super().__init__(parent)
-        self.rules = self.RULES + [self.STRING_RULE]
-        self.multiline_string_format = FORMATS['string']
-        # State for multi-line string: 1 = inside single quotes, 2 = inside double quotes
-        # We only use state 1 for simplicity (triple-double-quotes)
-        self.tri_double_quote_regex = QRegularExpression('"""')
+        self.kind_formats = self.KIND_FORMATS
+
+        # Set by HighlightScheduler while it owns the document.
+        # When deferred, blocks outside the viewport are left pending.
+        self.deferred = False
+        self.visible_range = (0, -1)
+        self._forced_range = (0, -1)
+        # During bulk edits even already highlighted blocks are deferred
+        self.defer_all = False
+        # Told the brackets of every tokenized block (see core/brackets.py)
+        self.bracket_index = None
+
+    def highlight_range(self, block, count):
+        """
+        Highlights `count` blocks starting at `block`, even outside the viewport.
+        One rehighlightBlock call is enough: Qt keeps going while states change.
+        """
+        first = block.blockNumber()
+        self._forced_range = (first, first + count - 1)
+        try:
+            self.rehighlightBlock(block)
+        finally:
+            self._forced_range = (0, -1)
+
+    def _should_defer(self):
+        """True if the current block should stay pending for the background pass."""
+        if self.currentBlockState() >= 0 and not self.defer_all:
+            return False # Already highlighted once, keep it up to date
+        number = self.currentBlock().blockNumber()
+        first, last = self._forced_range
+        if first <= number <= last:
+            return False
+        first, last = self.visible_range
+        return not (first <= number <= last)
 
     def highlightBlock(self, text):
-        """Applies highlighting to a single block of text (line)."""
-        
-        # Apply standard single-line rules first
-        for pattern, format in self.rules:
-            it = pattern.globalMatch(text)
-            while it.hasNext():
-                match = it.next()
-                
-                # Check for function/class capture group (Rule 5 & 6)
-                if match.captured(1):
-                    # Highlight the actual identifier, not the 'def ' or 'class ' part
-                    self.setFormat(match.capturedStart(1), match.capturedLength(1), format)
-                else:
-                    self.setFormat(match.capturedStart(), match.capturedLength(), format)
-        
-        # Handle multi-line strings (triple quotes)
-        # This is a complex logic simplified for demonstration
-        
-        # 1. Initial state from previous block (if any)
-        self.setCurrentBlockState(0) 
-        
-        start_index = 0
-        
-        # If we were *in* a multi-line string from the previous block
-        if self.previousBlockState() == 1:
-            start_index = 0
-            
-            # Look for the closing '"""'
-            match = self.tri_double_quote_regex.match(text, start_index)
-            if match.hasMatch():
-                # Found end: format from start_index to end
-                self.setFormat(start_index, match.capturedEnd() - start_index, self.multiline_string_format)
-            else:
-                # Still inside: format the whole line
-                self.setFormat(start_index, len(text), self.multiline_string_format)
-                self.setCurrentBlockState(1) # Continue to next line
-                
-        # 2. Look for the start of a multi-line string
-        while True:
-            # Find the starting '"""'
-            match_start = self.tri_double_quote_regex.match(text, start_index)
-            if not match_start.hasMatch():
-                break # No more multi-line strings on this line
-            
-            # Found a starting '"""'
-            match_end = self.tri_double_quote_regex.match(text, match_start.capturedEnd())
-            
-            if match_end.hasMatch():
-                # End is on the same line: format the whole string and continue search
-                self.setFormat(match_start.capturedStart(), match_end.capturedEnd() - match_start.capturedStart(), self.multiline_string_format)
-                start_index = match_end.capturedEnd()
-            else:
-                # End is on a later line: format from start to end of line
-                self.setCurrentBlockState(1) # Set state to 'inside multi-line string'
-                self.setFormat(match_start.capturedStart(), len(text) - match_start.capturedStart(), self.multiline_string_format)
-                break # Stop processing this line
+        """Applies highlighting to a single block of text (line) in one pass."""
+        if self.deferred and self._should_defer():
+            self.setCurrentBlockState(STATE_PENDING)
+            return
+
+        previous = self.previousBlockState()
+        guessed = 0
+        if previous >= 0:
+            state = previous & STATE_MASK
+            guessed = previous & STATE_GUESSED
+        else:
+            state = tokenizer.STATE_NORMAL
+            # -1 on anything but the first line means the previous line is pending
+            if self.currentBlock().previous().isValid():
+                guessed = STATE_GUESSED
+
+        # Reuse the cached spans when neither the text nor the entry state changed
+        data = self.currentBlockUserData()
+        if data is None:
+            data = TokenBlockData()
+            self.setCurrentBlockUserData(data)
+        text_hash = hash(text)
+        cached = data.lookup(text_hash, state)
+        if cached is None:
+            columns = []
+            spans, end_state = tokenizer.tokenize_block(text, state, columns)
+            brackets = block_entry(text, columns)
+            spans = data.store(text_hash, state, spans, end_state, brackets)
+        else:
+            spans, end_state, brackets = cached
+        if self.bracket_index is not None:
+            self.bracket_index.set_block(self.currentBlock().blockNumber(), brackets)
+
+        formats = self.kind_formats
+        set_format = self.setFormat
+        for i in range(0, len(spans), 3):
+            set_format(spans[i], spans[i + 1], formats[spans[i + 2]])
+
+        self.setCurrentBlockState(end_state | guessed)
+
+# ------------------------------------------------------------------
+# 🎨 SYNTAX HIGHLIGHTING: Background Scheduler
+# ------------------------------------------------------------------
+
+class HighlightScheduler(QObject):
+    """
+    Highlights a document from the event loop in small time slices.
+    The visible blocks are formatted first, then the rest of the
+    document top to bottom. Edits rewind the pass, scrolling re-prioritises
+    the new viewport.
+    """
+    TIME_BUDGET = 0.005 # seconds of highlighting per event loop tick
+
+    def __init__(self, editor, highlighter):
+        super().__init__(editor)
+        self.editor = editor
+        self.highlighter = highlighter
+
+        self._next_pos = None # Position of the next block to check, None = idle
+        self._viewport_dirty = False
+        self._block_cost = 0.0001 # Seconds per block, measured while running
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._tick)
+
+        editor.document().contentsChange.connect(self._on_contents_change)
+        editor.verticalScrollBar().valueChanged.connect(self.viewport_changed)
+
+    def is_running(self):
+        return self._next_pos is not None
+
+    def start(self, position=0):
+        """Starts a pass from position (0 = whole document, e.g. after loading a file)."""
+        self.highlighter.deferred = True
+        self._next_pos = position
+        self._viewport_dirty = True
+        self._timer.start()
+
+    def cancel(self):
+        """Stops the pass. Blocks not reached yet stay unformatted until start()."""
+        self._timer.stop()
+        self._next_pos = None
+
+    def begin_bulk_edit(self):
+        """
+        Until end_bulk_edit, blocks changed outside the viewport are only marked
+        pending, so one big edit (e.g. Replace All) does not rehighlight
+        everything it touched synchronously.
+        """
+        self._update_visible_range()
+        self.highlighter.deferred = True
+        self.highlighter.defer_all = True
+
+    def end_bulk_edit(self, position=0):
+        """Ends a bulk edit and lets the background pass catch up from position."""
+        self.highlighter.defer_all = False
+        if self._next_pos is not None:
+            position = min(position, self._next_pos)
+        self.start(position)
+
+    def viewport_changed(self, *_):
+        if self._next_pos is not None:
+            self._viewport_dirty = True
+            self._timer.start()
+
+    def _on_contents_change(self, position, removed, added):
+        if self._next_pos is None:
+            return
+        # New, still pending blocks may now sit behind the pass: rewind to them
+        if position < self._next_pos:
+            self._next_pos = position
+        self.viewport_changed()
+
+    @staticmethod
+    def _needs_work(state):
+        return state < 0 or state & STATE_GUESSED
+
+    def _update_visible_range(self):
+        self.highlighter.visible_range = self.editor.visible_block_range()
+
+    def _highlight_viewport(self):
+        self._viewport_dirty = False
+        self._update_visible_range()
+        first, last = self.highlighter.visible_range
+        fold_index = self.editor.fold_index
+
+        number = first
+        while number <= last:
+            block = self.editor.document().findBlockByNumber(number)
+            if not block.isValid():
+                break
+            if block.userState() < 0:
+                # Qt cascades through the following visible pending blocks itself
+                self.highlighter.rehighlightBlock(block)
+            number = fold_index.next_shown(number)
+
+    def _tick(self):
+        if self._next_pos is None:
+            self._timer.stop()
+            return
+
+        deadline = time.perf_counter() + self.TIME_BUDGET
+        if self._viewport_dirty:
+            self._highlight_viewport()
+
+        needs_work = self._needs_work
+        perf_counter = time.perf_counter
+
+        block = self.editor.document().findBlock(self._next_pos)
+        while block.isValid():
+            if needs_work(block.userState()):
+                # Size the chunk from the measured per-block cost and the time left
+                count = min(4096, max(16, int((deadline - perf_counter()) / self._block_cost)))
+                started = perf_counter()
+                self.highlighter.highlight_range(block, count)
+                cost = (perf_counter() - started) / count
+                self._block_cost = (self._block_cost + cost) / 2
+            block = block.next()
+            if perf_counter() >= deadline:
+                break
+
+        if block.isValid():
+            self._next_pos = block.position()
+        else:
+            # Whole document done: back to normal synchronous highlighting
+            self._next_pos = None
+            self.highlighter.deferred = False
+            self._timer.stop()
 
 # ------------------------------------------------------------------
 # 🚨 LINE NUMBER AREA WIDGET 
@@ -193,6 +363,10 @@ class LineNumberArea(QWidget):
         """Delegates the painting to the editor's core logic."""
         self.editor.lineNumberAreaPaintEvent(event)
 
+    def mousePressEvent(self, event):
+        """Clicks on the fold markers fold / unfold."""
+        self.editor.lineNumberAreaMousePressEvent(event)
+
 # ------------------------------------------------------------------
 # 🚨 CODE EDITOR CORE (The Text Input Widget)
 # ------------------------------------------------------------------
@@ -201,6 +375,13 @@ class CodeEditorCore(QPlainTextEdit):
     
     # Signal to notify the main window that the document's state has changed
     document_title_changed = Signal(str) 
+    # Streaming loads (start_streaming_load) report their outcome
+    loading_finished = Signal()
+    loading_failed = Signal(str)
+    # Background saves report back with (path, success)
+    save_finished = Signal(str, bool)
+
+    LOAD_TIME_BUDGET = 0.008 # seconds of text insertion per event loop tick while streaming
 
     def __init__(self, parent=None, file_path=None):
         super().__init__(parent)
@@ -210,6 +391,22 @@ class CodeEditorCore(QPlainTextEdit):
         self._is_dirty = False
         self._title = "Untitled" if file_path is None else QFileInfo(file_path).fileName()
 
+        # Path each queued save was started from, to undo a failed Save As
+        self._path_before_save = {}
+
+        # View to restore once a streaming load is done (see restore_view_state)
+        self._pending_view_state = None
+
+        # Extra selections by feature (e.g. "find"), merged into one list for Qt
+        self._extra_selections = {}
+
+        # Streaming load state
+        self._load_worker = None
+        self._load_size = 0
+        self._load_percent = 0
+        self._load_timer = QTimer(self)
+        self._load_timer.timeout.connect(self._drain_load_queue)
+
         # Appearance setup (basic example)
         font = QFont("Monospace", 10)
         font.setStyleHint(QFont.Monospace)
@@ -219,22 +416,46 @@ class CodeEditorCore(QPlainTextEdit):
 
         # --- 🎨 SYNTAX HIGHLIGHTING: Integration START ---
         self.setStyleSheet(f"QPlainTextEdit {{ background-color: {COLORS['background']}; color: {COLORS['foreground']}; border: 1px solid #1E1E1E; }}")
+        # Bracket pairs, fed by the highlighter. Created first: it must see
+        # each edit before the highlighter reports the edited blocks
+        self.bracket_index = BracketIndex(self.document())
         # Instantiate and set the highlighter
         self.highlighter = PythonHighlighter(self.document())
+        self.highlighter.bracket_index = self.bracket_index
+        # Large documents are highlighted in the background, viewport first
+        self.highlight_scheduler = HighlightScheduler(self, self.highlighter)
         # --- 🎨 SYNTAX HIGHLIGHTING: Integration END ---
 
         # 🚨 LINE NUMBER IMPLEMENTATION START
         self.lineNumberArea = LineNumberArea(self)
+
+        # Laid-out number glyphs, reused on every paint (line number -> QStaticText)
+        self._gutter_glyphs = {}
+        self._gutter_digits = 0
+        self._update_gutter_metrics()
         
-        # Connect necessary signals
+        # Connect necessary signals (updateRequest also reports scrolling, with dy set)
         self.blockCountChanged.connect(self.updateLineNumberAreaWidth)
         self.updateRequest.connect(self.updateLineNumberArea)
-        # Connect vertical scroll bar value changes
-        self.verticalScrollBar().valueChanged.connect(lambda: self.updateLineNumberArea(self.rect(), 0))
         
         # Initial call to set the margin
         self.updateLineNumberAreaWidth(0)
         # 🚨 LINE NUMBER IMPLEMENTATION END
+
+        # Word completion popup (see core/completion.py)
+        self.completer = Completer(self)
+
+        # Matching bracket and rainbow colours (see core/brackets.py)
+        self.bracket_view = BracketView(self, self.bracket_index, load_settings().get("rainbow_brackets", default_settings["rainbow_brackets"]))
+
+        # Indentation folding (see core/folding.py); markers live in the gutter
+        self.fold_index = FoldIndex(self.document())
+        self._cursor_block = 0 # Block the cursor was in before the last move
+        self.cursorPositionChanged.connect(self._reveal_cursor)
+
+        # Git changed-line markers per block and the inline blame of one line (see core/git_integration.py)
+        self._diff_markers = None
+        self._line_annotation = None # (block number, text)
         
         # Document modification tracking
         self.document().modificationChanged.connect(self._update_dirty_state)
@@ -245,6 +466,8 @@ class CodeEditorCore(QPlainTextEdit):
         
     def get_tab_title(self):
         """Returns the title string for the QTabWidget."""
+        if self.is_loading():
+            return f"{self._title} (loading {self._load_percent}%)"
         star = " *" if self._is_dirty else ""
         return self._title + star
 
@@ -259,40 +482,214 @@ class CodeEditorCore(QPlainTextEdit):
             return self._title + ".txt"
         return self._title
 
+    def is_modified(self):
+        # A half-loaded buffer is never offered for saving
+        return self.document().isModified() and not self.is_loading()
+
+    def is_loading(self):
+        return self._load_worker is not None
+
+    def go_to_line(self, line):
+        """Moves the cursor to the start of the 1-indexed line and centers it."""
+        block = self.document().findBlockByNumber(max(0, line - 1))
+        if not block.isValid():
+            block = self.document().lastBlock()
+        cursor = self.textCursor()
+        cursor.setPosition(block.position())
+        self.setTextCursor(cursor)
+        self.centerCursor()
+
+    def line_count(self):
+        return self.blockCount()
+
+    def visible_block_range(self):
+        """(first, last) block numbers on screen; a folded region takes no rows."""
+        first = self.firstVisibleBlock().blockNumber()
+        rows = self.viewport().height() // max(1, self.fontMetrics().height()) + 1
+        fold_index = self.fold_index
+        if not fold_index.has_folds():
+            return first, first + rows
+        last = first
+        for _ in range(rows):
+            last = fold_index.next_shown(last)
+        return first, last
+
+    def jump_to_matching_bracket(self):
+        """Moves the cursor to the partner of the bracket next to it. Returns False if there is none."""
+        found = self.bracket_view.bracket_at_cursor()
+        if found is None or found[1] is None:
+            return False
+        cursor = self.textCursor()
+        cursor.setPosition(found[1])
+        self.setTextCursor(cursor)
+        return True
+
+    # -------------------------------------------------------------
+    # --- Folding
+    # -------------------------------------------------------------
+
+    def toggle_fold(self, line_number):
+        """Folds or unfolds the region opened by a 0-indexed line. Returns False if it opens none."""
+        fold_index = self.fold_index
+        fold_index.sync()
+        if fold_index.is_collapsed(line_number):
+            fold_index.unfold(line_number)
+        else:
+            end = fold_index.region_end(line_number)
+            if end <= line_number:
+                return False
+            self._move_cursor_out_of(line_number, end)
+            fold_index.fold(line_number)
+        self._folds_changed()
+        return True
+
+    def fold_at_cursor(self):
+        """Folds the innermost region around the cursor. Returns False if there is none."""
+        self.fold_index.sync()
+        header = self.fold_index.enclosing_header(self.textCursor().blockNumber())
+        return header is not None and self.toggle_fold(header)
+
+    def unfold_at_cursor(self):
+        """Unfolds the region folded at the cursor line. Returns False if there is none."""
+        line_number = self.textCursor().blockNumber()
+        return self.fold_index.is_collapsed(line_number) and self.toggle_fold(line_number)
+
+    def fold_to_level(self, level):
+        """Folds all regions at level (1 = outermost), unfolding the rest; 0 unfolds everything."""
+        line_number = self.textCursor().blockNumber()
+        for header, end in self.fold_index.fold_to_level(level):
+            if header < line_number <= end:
+                self._move_cursor_out_of(header, end)
+                break
+        self._folds_changed()
+
+    def _move_cursor_out_of(self, header, end):
+        """Puts the cursor at the end of header if it sits in the region about to be hidden."""
+        if header < self.textCursor().blockNumber() <= end:
+            block = self.document().findBlockByNumber(header)
+            cursor = self.textCursor()
+            cursor.setPosition(block.position() + block.length() - 1)
+            self.setTextCursor(cursor)
+
+    def _reveal_cursor(self):
+        """
+        A cursor moved into folded text (Go to Line, Find, undo...) unfolds it,
+        unless the arrow keys just stepped from one side of the fold to the other.
+        """
+        cursor = self.textCursor()
+        block = cursor.block()
+        previous, self._cursor_block = self._cursor_block, block.blockNumber()
+        if block.isVisible():
+            return
+        header = block.previous()
+        while header.isValid() and not header.isVisible():
+            header = header.previous()
+        header_number = header.blockNumber()
+        after = self.document().findBlockByNumber(self.fold_index.next_shown(header_number))
+        if not cursor.hasSelection() and previous in (header_number, after.blockNumber()):
+            target = after if previous == header_number and after.isValid() else header
+            cursor.setPosition(target.position() + min(cursor.positionInBlock(), target.length() - 1))
+            self.setTextCursor(cursor)
+        elif self.fold_index.reveal(block.blockNumber()):
+            self._folds_changed()
+
+    def _folds_changed(self):
+        self.viewport().update()
+        self.lineNumberArea.update()
+        self.highlight_scheduler.viewport_changed()
+        self.bracket_view.viewport_changed()
+
+    def keyPressEvent(self, event):
+        if self.completer.key_press(event):
+            return
+        super().keyPressEvent(event)
+        self.completer.key_typed(event)
+
+    def set_extra_selections(self, kind, selections):
+        """Replaces one feature's extra selections without touching the others'."""
+        if selections:
+            self._extra_selections[kind] = selections
+        elif self._extra_selections.pop(kind, None) is None:
+            return # Nothing shown for this feature, nothing to update
+        merged = []
+        for group in self._extra_selections.values():
+            merged.extend(group)
+        self.setExtraSelections(merged)
+
+    def view_state(self):
+        """(cursor position, (horizontal, vertical) scroll) to bring the view back later."""
+        return self.textCursor().position(), (self.horizontalScrollBar().value(), self.verticalScrollBar().value())
+
+    def restore_view_state(self, cursor_position, scroll_position):
+        """Puts the cursor and scroll position back, once the text is loaded."""
+        if self.is_loading():
+            self._pending_view_state = (cursor_position, scroll_position)
+            return
+        cursor = self.textCursor()
+        cursor.setPosition(min(cursor_position, self.document().characterCount() - 1))
+        self.setTextCursor(cursor)
+        self.horizontalScrollBar().setValue(scroll_position[0])
+        self.verticalScrollBar().setValue(scroll_position[1])
+
     def _update_dirty_state(self, modified):
         """Updates the dirty state and notifies the main window."""
+        if self.is_loading():
+            return # Streamed-in text is not a user edit
         self._is_dirty = modified
         self.document_title_changed.emit(self.get_tab_title())
     def set_file_path(self, path):
         if getattr(self, "_file_path", None) == path:
             return  # already set, don't do anything
         self._file_path = path
-    # any other logic like updating UI
+        self._title = QFileInfo(path).fileName()
+        self.document_title_changed.emit(self.get_tab_title())
 
 
     # -------------------------------------------------------------
     # 🚨 CORE LINE NUMBER LOGIC METHODS 
     # -------------------------------------------------------------
 
+    # Glyph cache entries kept before it is thrown away and refilled
+    GUTTER_CACHE_SIZE = 4096
+
+    def _update_gutter_metrics(self):
+        """Caches font metrics used by the gutter (called again on font changes)."""
+        metrics = self.fontMetrics()
+        self._digit_width = metrics.horizontalAdvance('0')
+        self._gutter_line_height = metrics.height()
+        self._fold_marker_width = max(9, metrics.height() * 3 // 4) # Fold marker column, right of the numbers
+        self._gutter_glyphs.clear()
+
     def lineNumberAreaWidth(self):
         """Calculates the optimal width based on the number of lines."""
-        digits = 1
-        max_value = max(1, self.blockCount())
-        while max_value >= 10:
-            max_value /= 10
-            digits += 1
-            
-        # space = 3px padding + font width * digits + 8px right margin
-        space = 3 + self.fontMetrics().horizontalAdvance('0') * digits + 8
+        digits = len(str(max(1, self.blockCount())))
+        # space = 3px padding + font width * digits + 8px right margin + fold markers
+        space = 3 + self._digit_width * digits + 8 + self._fold_marker_width
         return space
 
     def updateLineNumberAreaWidth(self, _):
-        """Sets the margin of the viewport to reserve space for the line numbers."""
-        self.setViewportMargins(self.lineNumberAreaWidth(), 0, 0, 0)
+        """Sets the margin of the viewport, but only when the number of digits changes."""
+        digits = len(str(max(1, self.blockCount())))
+        if digits == self._gutter_digits:
+            return
+        self._gutter_digits = digits
+        width = self.lineNumberAreaWidth()
+        self.setViewportMargins(width, 0, 0, 0)
+        cr = self.contentsRect()
+        self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), width, cr.height()))
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange and hasattr(self, "_gutter_glyphs"):
+            self._update_gutter_metrics()
+            self._gutter_digits = 0 # Force the width to be recomputed
+            self.updateLineNumberAreaWidth(0)
         
     def resizeEvent(self, event):
         """Overrides resize event to reposition the line number widget."""
         super().resizeEvent(event) 
+        self.highlight_scheduler.viewport_changed()
+        self.bracket_view.viewport_changed()
         
         cr = self.contentsRect()
         # Set the geometry of the LineNumberArea to be on the left margin
@@ -300,9 +697,23 @@ class CodeEditorCore(QPlainTextEdit):
             QRect(cr.left(), cr.top(), self.lineNumberAreaWidth(), cr.height())
         )
 
+    def _gutter_glyph(self, line_number):
+        """(QStaticText, width) for a line number, laid out once."""
+        entry = self._gutter_glyphs.get(line_number)
+        if entry is None:
+            if len(self._gutter_glyphs) >= self.GUTTER_CACHE_SIZE:
+                self._gutter_glyphs.clear()
+            glyph = QStaticText(str(line_number))
+            glyph.setTextFormat(Qt.PlainText)
+            glyph.prepare(font=self.font())
+            entry = (glyph, int(glyph.size().width()))
+            self._gutter_glyphs[line_number] = entry
+        return entry
+
     def lineNumberAreaPaintEvent(self, event):
         """
         The method that actually draws the numbers, called by the LineNumberArea's paintEvent.
+        Only rows inside the damaged rect are drawn, from cached glyphs.
         """
         painter = QPainter(self.lineNumberArea)
         
@@ -318,70 +729,168 @@ class CodeEditorCore(QPlainTextEdit):
         block_number = block.blockNumber() 
         top = int(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
         bottom = top + int(self.blockBoundingRect(block).height())
+        damaged_top = event.rect().top()
+        damaged_bottom = event.rect().bottom()
+        marker_left = self.lineNumberArea.width() - self._fold_marker_width
+        right = marker_left - 5
 
-        # Loop through all visible blocks (lines)
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
-                line_number = str(block_number + 1) # 1-indexed line number
-                
-                painter.drawText(
-                    0, top, self.lineNumberArea.width() - 5, self.fontMetrics().height(),
-                    Qt.AlignRight, line_number
-                )
-                
+        fold_index = self.fold_index
+        show_markers = not self.is_loading()
+        if show_markers:
+            fold_index.sync()
+        diff_markers = self._diff_markers
+
+        # Loop through the blocks (lines) that overlap the damaged rows
+        while block.isValid() and top <= damaged_bottom:
+            if block.isVisible() and bottom >= damaged_top:
+                glyph, glyph_width = self._gutter_glyph(block_number + 1) # 1-indexed line number
+                painter.drawStaticText(right - glyph_width, top, glyph)
+                if diff_markers is not None and block_number < len(diff_markers) and diff_markers[block_number]:
+                    self._paint_diff_marker(painter, top, bottom, diff_markers[block_number])
+                if show_markers and (fold_index.is_collapsed(block_number) or fold_index.is_header(block_number)):
+                    self._paint_fold_marker(painter, marker_left, top, fold_index.is_collapsed(block_number))
+
+            if show_markers and fold_index.is_collapsed(block_number):
+                # Jump over the folded blocks instead of stepping through them
+                block = self.document().findBlockByNumber(fold_index.region_end(block_number))
             block = block.next()
             if not block.isValid():
                 break
                 
             top = bottom
             bottom = top + int(self.blockBoundingRect(block).height())
-            block_number += 1
+            block_number = block.blockNumber()
+
+    def _paint_fold_marker(self, painter, left, top, collapsed):
+        """A triangle pointing right (folded) or down (can be folded)."""
+        size = self._fold_marker_width // 2
+        x = left + (self._fold_marker_width - size) // 2 - 1
+        y = top + (self._gutter_line_height - size) // 2
+        if collapsed:
+            points = [QPoint(x, y), QPoint(x + size, y + size // 2), QPoint(x, y + size)]
+        else:
+            points = [QPoint(x, y), QPoint(x + size, y), QPoint(x + size // 2, y + size)]
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#C5C5C5" if collapsed else "#5c6370"))
+        painter.drawPolygon(QPolygon(points))
+        painter.restore()
+
+    # Changed-line bar colours by marker: added, modified, lines deleted below
+    DIFF_MARKER_COLORS = {1: "#587C0C", 2: "#0C7D9D", 3: "#94151B"}
+
+    def _paint_diff_marker(self, painter, top, bottom, marker):
+        """A bar in the gutter's left padding; deleted lines get a wedge on the line above them."""
+        color = QColor(self.DIFF_MARKER_COLORS.get(marker, "#5c6370"))
+        if marker == 3:
+            size = 4
+            painter.save()
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(color)
+            painter.drawPolygon(QPolygon([QPoint(0, bottom - size), QPoint(size, bottom), QPoint(0, bottom + size)]))
+            painter.restore()
+        else:
+            painter.fillRect(0, top, 3, bottom - top, color)
+
+    def set_diff_markers(self, markers):
+        """Changed-line markers by block number (0 for none), or None to show none."""
+        if markers is None and self._diff_markers is None:
+            return
+        self._diff_markers = markers
+        self.lineNumberArea.update()
+
+    def set_line_annotation(self, block_number, text):
+        """Grey text drawn after the end of a line (inline blame). An empty text removes it."""
+        annotation = (block_number, text) if text and block_number >= 0 else None
+        if annotation != self._line_annotation:
+            self._line_annotation = annotation
+            self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._line_annotation is not None:
+            self._paint_line_annotation()
+
+    def _paint_line_annotation(self):
+        block_number, text = self._line_annotation
+        block = self.document().findBlockByNumber(block_number)
+        layout = block.layout() if block.isValid() and block.isVisible() else None
+        if layout is None or layout.lineCount() == 0:
+            return
+        line = layout.lineAt(layout.lineCount() - 1)
+        geometry = self.blockBoundingGeometry(block).translated(self.contentOffset())
+        if geometry.top() > self.viewport().height() or geometry.bottom() < 0:
+            return
+        x = int(geometry.left() + line.naturalTextWidth()) + 4 * self._digit_width
+        painter = QPainter(self.viewport())
+        font = self.font()
+        font.setItalic(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#5c6370"))
+        painter.drawText(x, int(geometry.top() + line.y() + line.ascent()), text)
+
+    def lineNumberAreaMousePressEvent(self, event):
+        """A click in the fold marker column folds / unfolds the line it is on."""
+        position = event.position().toPoint()
+        if event.button() != Qt.LeftButton or position.x() < self.lineNumberArea.width() - self._fold_marker_width:
+            return
+        block = self.cursorForPosition(QPoint(0, position.y())).block()
+        if block.isValid() and not self.is_loading():
+            self.toggle_fold(block.blockNumber())
             
     def updateLineNumberArea(self, rect, dy):
         """
         Updates or scrolls the line number area when text is edited or scrolled.
+        Scrolling moves the already painted pixels, so only the exposed rows repaint.
         """
         if dy:
             self.lineNumberArea.scroll(0, dy)
         else:
             self.lineNumberArea.update(0, rect.y(), self.lineNumberArea.width(), rect.height())
-        
-        if rect.contains(self.viewport().rect()):
-            self.updateLineNumberAreaWidth(0)
 
     # -------------------------------------------------------------
     # --- File I/O and Save Logic (REQUIRED FOR MAIN WINDOW)
     # -------------------------------------------------------------
 
-    def save_file(self, path=None):
-        """Saves the document content to the specified path or current path."""
+    def save_file(self, path=None, quiet=False):
+        """
+        Saves the document content to the specified path or current path.
+        The text is snapshotted here and written atomically by a background
+        worker; True means the save was queued. A failed write marks the
+        document dirty again and shows a warning, unless quiet (autosave).
+        """
         path = path if path else self._file_path
         if not path:
             Debug("DEBUG: save_file called with no path, returning False.")
             return False
 
-        file = QFile(path)
-        if not file.open(QIODevice.WriteOnly | QIODevice.Text):
-            Debug(f"DEBUG: Failed to open file for writing: {path}. Error: {file.errorString()}")
-            QMessageBox.warning(self, "Save Error", f"Cannot write file {path}:\n{file.errorString()}")
-            return False
-        
-        try:
-            # We must use encode('utf-8') for reliable file writing
-            file.write(self.toPlainText().encode('utf-8'))
-            file.close()
-            
-            # Update state only upon successful save
-            self._file_path = path
-            self._title = QFileInfo(path).fileName()
-            self.document().setModified(False) 
-            self.document_title_changed.emit(self.get_tab_title()) # Notify tab widget title change
-            Debug(f"DEBUG: Successfully saved file to: {path}")
-            return True
-        except Exception as e:
-            Debug(f"DEBUG: Unexpected error during file write: {e}")
-            QMessageBox.critical(self, "Write Error", f"An unexpected error occurred during save: {e}")
-            return False
+        worker = FileSaveWorker(path, self.toPlainText())
+        worker.signals.finished.connect(self._on_save_finished)
+        self._path_before_save[worker.path] = (self._file_path, quiet)
+
+        # The snapshot is what ends up on disk, so the buffer is clean from here
+        self._file_path = path
+        self._title = QFileInfo(path).fileName()
+        self.document().setModified(False) 
+        self.document_title_changed.emit(self.get_tab_title()) # Notify tab widget title change
+
+        save_thread_pool().start(worker)
+        return True
+
+    def _on_save_finished(self, path, success, error):
+        """Called on the UI thread once the background write is done."""
+        previous_path, quiet = self._path_before_save.pop(path, (None, False))
+        if not success:
+            # A failed Save As keeps the document on its old path
+            if previous_path and os.path.abspath(self._file_path) == path:
+                self._file_path = previous_path
+                self._title = QFileInfo(previous_path).fileName()
+            # What is on disk no longer matches the buffer
+            self.document().setModified(True)
+            if not quiet:
+                QMessageBox.warning(self, "Save Error", f"Cannot write file {path}:\n{error}")
+        self.save_finished.emit(path, success)
 
     def load_file_content(self, path):
         """Loads text content from a file."""
@@ -394,23 +903,137 @@ class CodeEditorCore(QPlainTextEdit):
             content = str(file.readAll(), 'utf-8')
             file.close()
 
+            # Highlighting runs from the event loop, visible lines first
+            self.highlight_scheduler.start()
+
             # Block signals while loading to prevent spurious dirty state
             with QSignalBlocker(self.document()):
                 self.setPlainText(content)
+            self.completer.words.rebuild()
+            self.fold_index.rebuild()
             
             self._file_path = path
             self._title = QFileInfo(path).fileName()
             self.document().setModified(False)
             self.document_title_changed.emit(self.get_tab_title())
             
-            # Re-highlight the document after loading new content
-            self.highlighter.rehighlight()
-            
             return True
         except Exception as e:
             QMessageBox.critical(self, "Read Error", f"An unexpected error occurred during load: {e}")
             return False
 
+    # -------------------------------------------------------------
+    # --- Streaming load (files that take noticeable time to read)
+    # -------------------------------------------------------------
+
+    def start_streaming_load(self, path):
+        """
+        Opens the tab immediately and streams the file in from a worker thread.
+        The buffer stays read-only until loading_finished is emitted.
+        """
+        try:
+            self._load_size = os.path.getsize(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Open Error", f"Cannot read file {path}:\n{e}")
+            return False
+
+        self._file_path = path
+        self._title = QFileInfo(path).fileName()
+        self._load_percent = 0
+
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False) # Loaded chunks must not land on the undo stack
+        self.highlight_scheduler.start()
+
+        self._load_worker = FileLoadWorker(path)
+        self._load_worker.signals.failed.connect(self._on_load_failed)
+        QThreadPool.globalInstance().start(self._load_worker)
+        self._load_timer.start(0)
+
+        Debug(f"DEBUG: Streaming {path} ({self._load_size} bytes) into the editor.")
+        self.document_title_changed.emit(self.get_tab_title())
+        return True
+
+    def cancel_loading(self):
+        """Stops a streaming load. The partial buffer should be discarded by the caller."""
+        if self._load_worker is None:
+            return
+        self._load_worker.cancel()
+        self._load_worker = None
+        self._load_timer.stop()
+        self.highlight_scheduler.cancel()
+        Debug(f"DEBUG: Loading of {self._file_path} cancelled.")
+
+    def _drain_load_queue(self):
+        """Inserts queued chunks for at most LOAD_TIME_BUDGET, then yields to the event loop."""
+        worker = self._load_worker
+        if worker is None:
+            self._load_timer.stop()
+            return
+
+        deadline = time.perf_counter() + self.LOAD_TIME_BUDGET
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        inserted_at = cursor.position()
+        received = False
+
+        while time.perf_counter() < deadline:
+            try:
+                item = worker.chunks.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._finish_loading()
+                return
+            text, bytes_read = item
+            # Signals blocked like in load_file_content: the highlighter is fed
+            # by the scheduler below instead of reacting to every chunk
+            with QSignalBlocker(self.document()):
+                cursor.insertText(text)
+            received = True
+            if self._load_size:
+                self._load_percent = min(99, bytes_read * 100 // self._load_size)
+
+        if received:
+            self.updateLineNumberAreaWidth(0)
+            # Keep the background highlighter going over the new text
+            if not self.highlight_scheduler.is_running():
+                self.highlight_scheduler.start(inserted_at)
+            else:
+                self.highlight_scheduler.viewport_changed()
+            self.document_title_changed.emit(self.get_tab_title())
+
+        # Spin fast while data is flowing, back off while waiting on the disk
+        self._load_timer.setInterval(0 if received else 10)
+
+    def _finish_loading(self):
+        self._load_worker = None
+        self._load_timer.stop()
+
+        self.setUndoRedoEnabled(True)
+        self.setReadOnly(False)
+        self.moveCursor(QTextCursor.Start)
+        self.completer.words.rebuild() # Chunks were inserted with signals blocked
+        self.fold_index.rebuild()
+        if self._pending_view_state is not None:
+            self.restore_view_state(*self._pending_view_state)
+            self._pending_view_state = None
+        self.document().setModified(False)
+        self._is_dirty = False
+        if not self.highlight_scheduler.is_running():
+            self.highlight_scheduler.start()
+
+        Debug(f"DEBUG: Finished streaming {self._file_path}.")
+        self.document_title_changed.emit(self.get_tab_title())
+        self.loading_finished.emit()
+
+    def _on_load_failed(self, message):
+        if self._load_worker is None:
+            return # Cancelled in the meantime
+        self.cancel_loading()
+        QMessageBox.warning(self, "Open Error", f"Cannot read file {self._file_path}:\n{message}")
+        self.loading_failed.emit(message)
+
 # ------------------------------------------------------------------
 # 🚨 EDITOR (QTabWidget wrapper, REQUIRED FOR MAIN WINDOW)
 # ------------------------------------------------------------------
@@ -418,12 +1041,27 @@ class CodeEditorCore(QPlainTextEdit):
 
 class Editor(QTabWidget):
     document_title_changed = Signal(str)
+    # Tab widgets as they are added / right before they are deleted
+    editor_opened = Signal(object)
+    editor_closed = Signal(object)
+    # A tab was hibernated or woken up (see core/hibernation.py)
+    tab_hibernation_changed = Signal()
+    # Path a tab was successfully written to
+    file_saved = Signal(str)
+    # Path load_file opened or brought to the front
+    file_opened = Signal(str)
+
+    # Files from this size up (and below the large file threshold) are streamed in
+    STREAM_LOAD_THRESHOLD = 1024 * 1024
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setTabsClosable(True)
         self.tabCloseRequested.connect(self._close_tab)
         self.currentChanged.connect(self._handle_tab_change)
+
+        # Open files by canonical path (see core/document_registry.py)
+        self.documents = DocumentRegistry()
         
         # Create an initial empty file
         self.create_new_file()
@@ -443,9 +1081,11 @@ class Editor(QTabWidget):
         
         # Connect the new editor's title change signal to the QTabWidget's signal
         new_editor.document_title_changed.connect(self._update_tab_title)
+        new_editor.save_finished.connect(self._on_document_saved)
         
         index = self.addTab(new_editor, new_editor.get_tab_title())
         self.setCurrentIndex(index)
+        self.editor_opened.emit(new_editor)
         
         # Manually ensure the main window title is updated for the new tab
         self.document_title_changed.emit(new_editor.get_tab_title())
@@ -453,21 +1093,196 @@ class Editor(QTabWidget):
 
     def load_file(self, path):
         """Checks if file is open, otherwise opens it."""
-        # Check if file is already open
-        for i in range(self.count()):
-            editor = self.widget(i)
-            if editor.get_file_path() == path:
-                self.setCurrentIndex(i)
-                return
+        # Check if file is already open (under any spelling of its path)
+        editor = self.documents.find(path)
+        if editor is not None:
+            self.setCurrentIndex(self.indexOf(editor))
+            self.file_opened.emit(path)
+            return
 
-        new_editor = CodeEditorCore(self)
-        if new_editor.load_file_content(path):
-            new_editor.document_title_changed.connect(self._update_tab_title)
+        new_editor = self._open_widget(path)
+        if new_editor is not None:
+            self.documents.register(new_editor, path)
             index = self.addTab(new_editor, new_editor.get_tab_title())
             self.setCurrentIndex(index)
+            self.editor_opened.emit(new_editor)
+            self.file_opened.emit(path)
+
+    def _open_widget(self, path):
+        """Creates the right kind of tab widget for a file, or None if it cannot be read."""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0 # Let load_file_content report the error
+
+        if size >= self._large_file_threshold():
+            new_editor = LargeFileViewer(self)
+            loaded = new_editor.load_file_content(path)
+        elif size >= self.STREAM_LOAD_THRESHOLD:
+            # Open the tab right away and let the content stream in
+            new_editor = CodeEditorCore(self)
+            new_editor.loading_failed.connect(self._on_loading_failed)
+            loaded = new_editor.start_streaming_load(path)
         else:
+            new_editor = CodeEditorCore(self)
+            loaded = new_editor.load_file_content(path)
+
+        if not loaded:
             # Cleanup the failed editor instance
-            del new_editor
+            new_editor.deleteLater()
+            return None
+        new_editor.document_title_changed.connect(self._update_tab_title)
+        if hasattr(new_editor, "save_finished"):
+            new_editor.save_finished.connect(self._on_document_saved)
+        return new_editor
+
+    # -------------------------------------------------------------
+    # --- Tab hibernation (policy lives in core/hibernation.py)
+    # -------------------------------------------------------------
+
+    def _swap_widget(self, index, widget):
+        """Replaces the widget of a tab in place, keeping its position and selection."""
+        old = self.widget(index)
+        was_current = self.currentIndex() == index
+        self.insertTab(index, widget, widget.get_tab_title())
+        if was_current:
+            self.setCurrentIndex(index)
+        self.removeTab(index + 1)
+        return old
+
+    def hibernate_tab(self, index, reclaimed_bytes=0):
+        """Drops the document of a clean, inactive tab, keeping only path, cursor and scroll."""
+        editor = self.widget(index)
+        if index == self.currentIndex() or not hasattr(editor, "view_state"):
+            return False
+        if editor.is_modified() or editor.is_loading() or editor.get_file_path() is None:
+            return False
+
+        cursor_position, scroll_position = editor.view_state()
+        placeholder = HibernatedTab(editor.get_file_path(), cursor_position, scroll_position, reclaimed_bytes, self)
+        self._swap_widget(index, placeholder)
+        self.documents.replace(editor, placeholder)
+        self.editor_closed.emit(editor)
+        editor.deleteLater()
+        self.tab_hibernation_changed.emit()
+        return True
+
+    def restore_tab(self, index):
+        """Reloads a hibernated tab from disk, back at its old cursor and scroll position."""
+        placeholder = self.widget(index)
+        self.documents.unregister(placeholder)
+        new_editor = self._open_widget(placeholder.get_file_path())
+        if new_editor is None:
+            # The file is gone or unreadable, nothing to bring back
+            self.removeTab(index)
+            placeholder.deleteLater()
+            if self.count() == 0:
+                self.create_new_file()
+            self.tab_hibernation_changed.emit()
+            return
+
+        self._swap_widget(index, new_editor)
+        self.documents.register(new_editor, new_editor.get_file_path())
+        if hasattr(new_editor, "restore_view_state"):
+            new_editor.restore_view_state(placeholder.cursor_position, placeholder.scroll_position)
+        placeholder.deleteLater()
+        self.editor_opened.emit(new_editor)
+        self.tab_hibernation_changed.emit()
+
+    # -------------------------------------------------------------
+    # --- Workspace tabs (saved and restored by core/workspace_cache.py)
+    # -------------------------------------------------------------
+
+    def tab_states(self):
+        """[(path, cursor position, (horizontal, vertical) scroll)] of the tabs showing files, in tab order."""
+        states = []
+        for index in range(self.count()):
+            widget = self.widget(index)
+            path = widget.get_file_path()
+            if path is None:
+                continue
+            if hasattr(widget, "is_hibernated"):
+                states.append((path, widget.cursor_position, widget.scroll_position))
+            elif hasattr(widget, "view_state") and not widget.is_loading():
+                states.append((path,) + widget.view_state())
+            else:
+                states.append((path, 0, (0, 0)))
+        return states
+
+    def open_hibernated(self, states, current_path=None):
+        """
+        Adds tabs for (path, cursor position, scroll) states as hibernated
+        placeholders, so no file is read until its tab is shown. Files
+        already open are skipped; the tab of current_path is brought to the
+        front (and so loaded). A lone blank Untitled tab is closed. Returns
+        the number of tabs added.
+        """
+        blank = self.widget(0) if self.count() == 1 else None
+        if blank is not None and (blank.get_file_path() is not None or blank.is_modified()
+                                  or not hasattr(blank, "document") or not blank.document().isEmpty()):
+            blank = None
+        added = 0
+        for path, cursor_position, scroll_position in states:
+            if self.documents.find(path) is not None or not os.path.isfile(path):
+                continue
+            placeholder = HibernatedTab(path, cursor_position, scroll_position, 0, self)
+            self.documents.register(placeholder, path)
+            self.addTab(placeholder, placeholder.get_tab_title())
+            added += 1
+        current = self.documents.find(current_path) if current_path else None
+        if current is not None:
+            self.setCurrentIndex(self.indexOf(current))
+        if added and blank is not None:
+            self._close_tab(self.indexOf(blank)) # After the switch, or closing it would wake a neighbour
+        if added:
+            self.tab_hibernation_changed.emit()
+        return added
+
+    def open_recovered(self, path, text, edits):
+        """
+        Opens a tab with work recovered from a crash journal (see core/journal.py):
+        the base text plus the replayed edits, left unsaved. Raises JournalError
+        if the edits do not fit the text.
+        """
+        new_editor = CodeEditorCore(self, path)
+        new_editor.highlight_scheduler.start()
+        with QSignalBlocker(new_editor.document()):
+            new_editor.setPlainText(text)
+        new_editor.completer.words.rebuild()
+        new_editor.fold_index.rebuild()
+        try:
+            # One undo step, so Ctrl+Z goes back to the base text
+            replay_journal(new_editor.document(), edits)
+        except Exception:
+            new_editor.deleteLater()
+            raise
+        new_editor.document().setModified(True)
+
+        new_editor.document_title_changed.connect(self._update_tab_title)
+        new_editor.save_finished.connect(self._on_document_saved)
+        self.documents.register(new_editor, path)
+        index = self.addTab(new_editor, new_editor.get_tab_title())
+        self.setCurrentIndex(index)
+        self.editor_opened.emit(new_editor)
+
+    def _large_file_threshold(self):
+        """Size in bytes from which files open in the large file viewer."""
+        threshold_mb = load_settings().get("large_file_threshold_mb", default_settings["large_file_threshold_mb"])
+        return threshold_mb * 1024 * 1024
+
+    def cancel_current_load(self):
+        """Cancels a streaming load in the current tab and closes it."""
+        editor = self.get_current_editor()
+        if editor is None or not editor.is_loading():
+            return False
+        self._close_tab(self.currentIndex())
+        return True
+
+    def _on_loading_failed(self, message):
+        """Drops the tab of a file that could not be streamed in."""
+        index = self.indexOf(self.sender())
+        if index != -1:
+            self._close_tab(index)
         
     def save_current_file(self):
         """Saves the current file, prompting for path if unsaved."""
@@ -477,7 +1292,7 @@ class Editor(QTabWidget):
             return False
             
         # Only skip saving if the document is NOT modified AND already has a path.
-        if not editor.document().isModified() and editor.get_file_path() is not None:
+        if not editor.is_modified() and editor.get_file_path() is not None:
             Debug("DEBUG: Document not modified and already saved, skipping.")
             return True
 
@@ -501,6 +1316,45 @@ class Editor(QTabWidget):
             Debug(f"DEBUG: Saving existing file to: {editor.get_file_path()}")
             return editor.save_file()
 
+    def has_unsaved_changes(self):
+        return any(self.widget(i).is_modified() for i in range(self.count()))
+
+    def save_all_files(self):
+        """
+        Saves every dirty tab. Files with a path are written in parallel by the
+        background writers; untitled ones prompt for a path first.
+        Returns False if the user cancelled a Save As dialog.
+        """
+        for i in range(self.count()):
+            editor = self.widget(i)
+            if not editor.is_modified():
+                continue
+            if editor.get_file_path() is None:
+                self.setCurrentIndex(i) # Show which document the dialog is for
+                if not self.save_current_file():
+                    return False
+            else:
+                editor.save_file()
+        return True
+
+    def _on_document_saved(self, path, success):
+        """Re-keys a saved document: Save As moves it, an atomic save gives it a new inode."""
+        editor = self.sender()
+        if self.indexOf(editor) != -1:
+            self.documents.register(editor, editor.get_file_path())
+        if success:
+            self.file_saved.emit(path)
+
+    def update_file_path_and_title(self, editor, new_path):
+        """Points a tab at its file's new location after a rename or move."""
+        editor.set_file_path(new_path)
+        self.documents.register(editor, new_path)
+        index = self.indexOf(editor)
+        if index != -1:
+            self.setTabText(index, editor.get_tab_title())
+            if index == self.currentIndex():
+                self.document_title_changed.emit(editor.get_tab_title())
+
     def _update_tab_title(self, title):
         """Updates the tab title and forwards the signal to the main window."""
         editor = self.sender()
@@ -515,13 +1369,16 @@ class Editor(QTabWidget):
     def _handle_tab_change(self, index):
         """Handles when the active tab changes."""
         editor = self.widget(index)
+        if editor and hasattr(editor, "is_hibernated"):
+            self.restore_tab(index) # Switching back wakes the tab up transparently
+            return
         if editor:
             self.document_title_changed.emit(editor.get_tab_title())
 
     def _close_tab(self, index):
         """Handles closing a tab, checking for unsaved changes."""
         editor = self.widget(index)
-        if editor.document().isModified():
+        if not editor.is_loading() and editor.is_modified(): # Nothing to save in a half-loaded buffer
             # Prompt user to save changes
             ret = QMessageBox.warning(self, "Unsaved Changes",
                 f"Document '{editor.get_tab_title().rstrip(' *')}' has been modified.\nDo you want to save your changes?",
@@ -534,7 +1391,17 @@ class Editor(QTabWidget):
                 return # Cancelled close
 
         # Safe to close
-        self.removeTab(index)
+        self.discard_tab(editor)
+
+    def discard_tab(self, editor):
+        """Closes the tab of editor without asking to save it (its file was deleted)."""
+        if editor.is_loading():
+            editor.cancel_loading()
+        self.removeTab(self.indexOf(editor))
+        self.documents.unregister(editor)
+        self.editor_closed.emit(editor)
+        if hasattr(editor, 'close_file'):
+            editor.close_file() # Releases the mapping of large file tabs
         editor.deleteLater() 
         
         # If all tabs are closed, create a new one
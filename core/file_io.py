@@ -0,0 +1,240 @@
+# --- File: core/file_io.py ---
+# Background file I/O used by CodeEditorCore.
+
+import codecs
+import itertools
+import os
+import queue
+import tempfile
+import threading
+
+from PySide6.QtCore import Signal, QObject, QRunnable, QThreadPool, Slot
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# ------------------------------------------------------------------
+# 📥 STREAMING LOAD WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class FileLoadWorkerSignals(QObject):
+    """Signals available from the file load worker."""
+    failed = Signal(str) # Error message
+
+class FileLoadWorker(QRunnable):
+    """
+    Reads and decodes a file in chunks on a QThreadPool thread.
+
+    Decoded chunks are handed over through a bounded queue as
+    (text, bytes_read) tuples, followed by None at the end of the file.
+    The UI thread drains the queue at its own pace, and the bound keeps
+    the worker from running ahead and buffering the whole file.
+    """
+    CHUNK_SIZE = 64 * 1024
+    QUEUE_SIZE = 8
+
+    def __init__(self, path):
+        super().__init__()
+        self.signals = FileLoadWorkerSignals()
+        self.path = path
+        self.chunks = queue.Queue(self.QUEUE_SIZE)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _put(self, item):
+        """Blocks until the UI takes the chunk, giving up if cancelled."""
+        while not self._cancelled:
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @Slot()
+    def run(self):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        bytes_read = 0
+        carry = ""
+        try:
+            with open(self.path, 'rb') as f:
+                while not self._cancelled:
+                    data = f.read(self.CHUNK_SIZE)
+                    final = not data
+                    bytes_read += len(data)
+                    text = carry + decoder.decode(data, final)
+
+                    # Same newline handling as QIODevice.Text: \r\n -> \n.
+                    # A trailing \r waits for the next chunk in case \n follows.
+                    carry = ""
+                    if not final and text.endswith('\r'):
+                        text, carry = text[:-1], '\r'
+                    text = text.replace('\r\n', '\n')
+
+                    if text and not self._put((text, bytes_read)):
+                        return
+                    if final:
+                        break
+        except (OSError, UnicodeDecodeError) as e:
+            Debug(f"DEBUG: Streaming load of {self.path} failed: {e}")
+            self.signals.failed.emit(str(e))
+            return
+
+        if not self._cancelled:
+            self._put(None)
+
+# ------------------------------------------------------------------
+# 💾 ATOMIC SAVE WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+# Permission bits for brand new files, like open() would give them.
+# Read once here: os.umask can only be queried by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_save_pool = None
+
+def save_thread_pool():
+    """Pool shared by all background saves, so exit can wait for just these."""
+    global _save_pool
+    if _save_pool is None:
+        _save_pool = QThreadPool()
+        _save_pool.setMaxThreadCount(4)
+    return _save_pool
+
+def wait_for_saves(msecs=10000):
+    """Blocks until every queued save is on disk. Returns False on timeout."""
+    if _save_pool is None:
+        return True
+    return _save_pool.waitForDone(msecs)
+
+class FileSaveWorkerSignals(QObject):
+    """Signals available from the file save worker."""
+    finished = Signal(str, bool, str) # Path, success, error message
+
+class FileSaveWorker(QRunnable):
+    """
+    Writes a text snapshot to a temp file next to the target, fsyncs it and
+    renames it over the target, so a crash mid-write never leaves a
+    truncated file behind.
+
+    Saves of the same file (through any symlink to it) run one at a time,
+    and a snapshot that was superseded by a newer save of that file is
+    skipped.
+    """
+    _generations = itertools.count(1)
+    _latest = {}  # Real path -> generation of the newest queued save
+    _locks = {}   # Real path -> lock serializing writes to it
+    _queued = {}  # Real path -> saves queued and not finished yet
+    _guard = threading.Lock()
+
+    def __init__(self, path, text):
+        super().__init__()
+        self.signals = FileSaveWorkerSignals()
+        self.path = os.path.abspath(path) # As reported back to the editor
+        self.target = os.path.realpath(self.path)
+        self.text = text
+        with self._guard:
+            self.generation = next(self._generations)
+            self._latest[self.target] = self.generation
+            self._lock = self._locks.setdefault(self.target, threading.Lock())
+            self._queued[self.target] = self._queued.get(self.target, 0) + 1
+
+    @Slot()
+    def run(self):
+        try:
+            with self._lock:
+                with self._guard:
+                    superseded = self._latest.get(self.target) != self.generation
+                if superseded:
+                    # A newer snapshot of this file is queued and will be written instead
+                    self.signals.finished.emit(self.path, True, "")
+                    return
+                try:
+                    write_atomic(self.target, self.text)
+                except OSError as e:
+                    Debug(f"DEBUG: Background save of {self.path} failed: {e}")
+                    self.signals.finished.emit(self.path, False, str(e))
+                    return
+        finally:
+            self._release()
+        Debug(f"DEBUG: Successfully saved file to: {self.path}")
+        self.signals.finished.emit(self.path, True, "")
+
+    def _release(self):
+        """Forgets the target once its last queued save is done, so the tables only hold pending paths."""
+        with self._guard:
+            remaining = self._queued[self.target] - 1
+            if remaining:
+                self._queued[self.target] = remaining
+            else:
+                del self._queued[self.target]
+                del self._latest[self.target]
+                del self._locks[self.target]
+
+def write_atomic(path, text):
+    """
+    Writes text (UTF-8, platform newlines like QIODevice.Text) via temp file + rename.
+    A symlink is followed, so its target is written and the link stays. A
+    file with other hard links is rewritten in place instead: a rename
+    would split it from them.
+    """
+    path = os.path.realpath(path)
+    try:
+        if os.stat(path).st_nlink > 1:
+            _write_in_place(path, text)
+            return
+    except FileNotFoundError:
+        pass
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # mkstemp creates 0600 files: keep the target's mode, or the usual default
+        try:
+            mode = os.stat(path).st_mode
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode & 0o7777)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    # Make the rename itself durable (not supported on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+def _write_in_place(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
@@ -1,8 +1,24 @@
 # --- File: core/file_manager.py ---
+# Project file tree. ProjectTreeModel lists a directory only when it is
+# expanded, with os.scandir in a worker thread, and drops entries matched by
+# the project's .gitignore files or the "exclude_patterns" setting before
+# they reach the model, so ignored trees (.git, node_modules, venvs, build
+# output) are never listed or held in memory. Listed directories are watched;
+# bursts of changes (a git checkout) are merged in as one batch.
 
-from PySide6.QtWidgets import QTreeView, QFileSystemModel
-from PySide6.QtCore import Signal, QDir, QModelIndex # Import QModelIndex for type hinting
-# ... other imports ...
+import os
+import time
+from bisect import bisect_left
+
+from PySide6.QtWidgets import QTreeView, QFileIconProvider
+from PySide6.QtGui import QColor
+from PySide6.QtCore import (
+    Signal, QDir, QModelIndex, QAbstractItemModel, Qt, QObject, QRunnable, QThreadPool, Slot,
+    QFileSystemWatcher, QTimer
+)
+
+from core.settings import load_settings, default_settings
+from core.workspace import IgnoreRules
 
 # Define Debug function (copied from your snippet for completeness)
 logger = "0"
@@ -20,58 +36,730 @@ def Debug(val):
         print(val)
 # ------------------------------------
 
+def _sorted_names(names):
+    """
+    Case-insensitive order with ties broken by case, like QFileSystemModel
+    (directories are sorted apart and go first). Two C-level sorts instead of a Python key.
+    """
+    names.sort()
+    names.sort(key=str.lower)
+    return names
+
+# ------------------------------------------------------------------
+# 🧵 DIRECTORY LISTING WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class DirectoryListWorkerSignals(QObject):
+    """Signals available from the directory listing worker."""
+    finished = Signal(int, object) # Generation, [(node, entries, rules, skipped, error, stamp)] in job order
+
+class DirectoryListWorker(QRunnable):
+    """
+    Lists a batch of directories: per directory the sorted (name, is_dir, stamp)
+    entries that no ignore rule matches. stamp is (mtime_ns, size) for files.
+    A directory is stamped with its mtime and the signatures of the ignore
+    rules and exclude patterns it was filtered with. While that stamp is
+    unchanged no entry was added or removed and the same names pass the
+    filters: the names of the previous listing are reused and only its
+    files are stat'ed again.
+    """
+    RACY_NS = 2 * 10**9 # Directory mtimes this recent are not trusted (coarse file system clocks)
+
+    def __init__(self, generation, jobs, excludes):
+        super().__init__()
+        self.signals = DirectoryListWorkerSignals()
+        self.generation = generation
+        # [(node, path, relative_path, parent_rules, previous)], parent_rules None for the root
+        # and for directories whose parent is listed earlier in the batch,
+        # previous (stamp, entries) of the last listing or None
+        self.jobs = jobs
+        self.excludes = excludes   # The exclude_patterns setting
+
+    @Slot()
+    def run(self):
+        results = []
+        rules_of = {} # Node -> rules found in this batch, for children listed in the same batch
+        for node, path, relative_path, parent_rules, previous in self.jobs:
+            if parent_rules is None and node.parent is not None:
+                parent_rules = rules_of.get(node.parent)
+            result = self._list(path, relative_path, parent_rules, previous)
+            rules_of[node] = result[1]
+            results.append((node,) + result)
+        self.signals.finished.emit(self.generation, results)
+
+    def _list(self, path, relative_path, parent_rules, previous):
+        directories = []
+        files = {}
+        skipped = 0
+        try:
+            if parent_rules is None:
+                rules = IgnoreRules.for_root(path)
+            else:
+                rules = parent_rules.child(path, relative_path)
+            prefix = relative_path + "/" if relative_path else ""
+            mtime = os.stat(path).st_mtime_ns
+            stamp = (mtime, rules.signature, self.excludes.signature)
+            if previous is not None and previous[0] == stamp:
+                listing = [(name, is_dir, os.path.join(path, name)) for name, is_dir, _ in previous[1]]
+            else:
+                with os.scandir(path) as scan:
+                    listing = [(entry.name, _is_dir(entry), entry) for entry in scan]
+            for name, is_dir, source in listing:
+                entry_path = prefix + name
+                if self.excludes.is_ignored(entry_path, is_dir) or rules.is_ignored(entry_path, is_dir):
+                    skipped += 1
+                    continue
+                if is_dir:
+                    directories.append(name)
+                    continue
+                try:
+                    stat = source.stat() if isinstance(source, os.DirEntry) else os.stat(source)
+                    files[name] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    files[name] = None
+            entries = [(name, True, None) for name in _sorted_names(directories)]
+            entries.extend((name, False, files[name]) for name in _sorted_names(list(files)))
+            if time.time_ns() - mtime < self.RACY_NS:
+                stamp = None
+            return entries, rules, skipped, "", stamp
+        except OSError as e:
+            return [], parent_rules, skipped, str(e), None
+
+def _is_dir(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+# ------------------------------------------------------------------
+# 🌲 PROJECT TREE MODEL
+# ------------------------------------------------------------------
+
+class _TreeNode:
+    __slots__ = ("name", "parent", "is_dir", "row", "children", "rules", "skipped", "listing", "stamp")
+
+    def __init__(self, name, parent, is_dir, row, stamp=None):
+        self.name = name
+        self.parent = parent
+        self.is_dir = is_dir
+        self.row = row
+        self.children = None   # None until the directory has been listed
+        self.rules = None      # Ignore rules for the entries of this directory, once listed
+        self.skipped = 0       # Entries the rules kept out of the last listing
+        self.listing = False   # A worker is listing it right now
+        self.stamp = stamp     # (mtime_ns, size) of a file when it was last listed; see DirectoryListWorker for directories
+
+def _sort_key(name, is_dir):
+    return (not is_dir, name.lower(), name)
+
+class ProjectTreeModel(QAbstractItemModel):
+    """
+    Single-column file tree of a root directory. The children of a
+    directory are fetched (canFetchMore / fetchMore, i.e. on expand) by a
+    DirectoryListWorker and the directory is then watched. Watch events are
+    coalesced: the directories they name are listed again together once
+    things have been quiet for COALESCE_MS, and the differences merged,
+    keeping what is expanded. The IDE's own renames, deletes and saves patch
+    the affected nodes directly (add_path / remove_path).
+    """
+    listing_finished = Signal(str, int, int) # Directory path, entries shown, entries skipped
+    paths_changed = Signal(list)             # Files added, deleted or modified on disk, one batch at a time
+    directories_changed = Signal(list)       # Directories added or deleted on disk (with whatever is in them), one batch at a time
+
+    COALESCE_MS = 200       # Quiet time that ends a burst of watch events
+    MAX_COALESCE_MS = 2000  # ...but a steady stream of events is flushed at least this often
+    MAX_ROW_RUNS = 32       # Diffs in more separate places are applied as one layout change
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = _TreeNode("", None, True, 0)
+        self._root_path = ""
+        self._generation = 0 # Bumped by setRootPath, so listings of the old root are dropped
+        self._waiting = []   # Directories to list once their restored parent has been listed (and has rules)
+        self._excludes = IgnoreRules(load_settings().get("exclude_patterns", default_settings["exclude_patterns"]))
+        icons = QFileIconProvider()
+        self._folder_icon = icons.icon(QFileIconProvider.Folder)
+        self._file_icon = icons.icon(QFileIconProvider.File)
+        # Text colour by absolute path (git status, see core/git_integration.py)
+        self._path_colors = {}
+        self._colors = {} # Colour name -> QColor
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._changed_dirs = set()
+        self._first_change = 0.0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_changes)
+
+    # -------------------------------------------------------------
+    # --- QFileSystemModel-style API used by FileManager / GW
+    # -------------------------------------------------------------
+
+    def rootPath(self):
+        return self._root_path
+
+    def setRootPath(self, path):
+        self.beginResetModel()
+        self._reset(path)
+        self.endResetModel()
+        self._list([self._root])
+
+    def _reset(self, path):
+        """Empty tree for a new root; listings and watch events of the old one are dropped."""
+        self._generation += 1
+        self._root_path = os.path.abspath(path)
+        self._root = _TreeNode(self._root_path, None, True, 0)
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._changed_dirs.clear()
+        self._flush_timer.stop()
+        self._waiting = []
+
+    # -------------------------------------------------------------
+    # --- Snapshots (see core/workspace_cache.py)
+    # -------------------------------------------------------------
+
+    def snapshot(self):
+        """
+        {relative directory ("" for the root): [stamp, [[name, is_dir, stamp], ...]]}
+        of every listed directory, stamps being lists or None.
+        """
+        directories = {}
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                continue
+            directories[self._relative_path(node)] = [
+                list(node.stamp) if node.stamp else None, [[child.name, child.is_dir, list(child.stamp) if child.stamp and not child.is_dir else None] for child in node.children],
+            ]
+            stack.extend(child for child in node.children if child.children is not None)
+        return directories
+
+    def restore_snapshot(self, path, directories):
+        """
+        Shows a root with the listings of a snapshot right away, then lists
+        every restored directory again in the background (reusing the
+        snapshot's names where a directory's stamp is unchanged) and merges
+        the differences in as usual.
+        """
+        self.beginResetModel()
+        self._reset(path)
+        restored = []
+        pending = [(self._root, "")]
+        while pending:
+            node, relative_path = pending.pop()
+            listing = directories.get(relative_path)
+            if listing is None:
+                continue
+            stamp, entries = listing
+            node.stamp = tuple(stamp) if stamp else None
+            node.children = [
+                _TreeNode(name, node, is_dir, row, tuple(stamp) if stamp else None)
+                for row, (name, is_dir, stamp) in enumerate(entries)
+            ]
+            restored.append(node)
+            prefix = relative_path + "/" if relative_path else ""
+            pending.extend((child, prefix + child.name) for child in node.children if child.is_dir)
+        self.endResetModel()
+        self._list(restored if restored else [self._root])
+
+    def set_exclude_patterns(self, patterns):
+        """New exclude_patterns: the tree is listed again from the root."""
+        self._excludes = IgnoreRules(patterns)
+        self.setRootPath(self._root_path)
+
+    def filePath(self, index):
+        return self.node_path(self._node(index))
+
+    def isDir(self, index):
+        return self._node(index).is_dir
+
+    def skipped_count(self):
+        """Entries kept out of every directory listed so far."""
+        total = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            total += node.skipped
+            if node.children:
+                stack.extend(child for child in node.children if child.children is not None)
+        return total
+
+    def node_path(self, node):
+        names = []
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return os.path.join(self._root_path, *reversed(names))
+
+    def _relative_path(self, node):
+        names = []
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/".join(reversed(names))
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node):
+        return self.createIndex(node.row, 0, node) if node.parent is not None else QModelIndex()
+
+    def index_of_path(self, path):
+        """Index of a path listed into the tree (invalid if it is not)."""
+        node = self._find(path)
+        return self._index_of(node) if node is not None else QModelIndex()
+
+    def _find(self, path):
+        """Node of path if it has been listed into the tree, else None."""
+        if not self._root_path:
+            return None
+        relative_path = os.path.relpath(os.path.abspath(path), self._root_path)
+        if relative_path == ".":
+            return self._root
+        if relative_path.startswith(".."):
+            return None
+        node = self._root
+        for name in relative_path.split(os.sep):
+            if not node.children:
+                return None
+            node = next((child for child in node.children if child.name == name), None)
+            if node is None:
+                return None
+        return node
+
+    # -------------------------------------------------------------
+    # --- QAbstractItemModel
+    # -------------------------------------------------------------
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        node = self._node(parent)
+        if column != 0 or node.children is None or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        node = self._node(parent)
+        return len(node.children) if node.children is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        # Unlisted directories show an expander until listing finds them empty
+        return node.is_dir and (node.children is None or bool(node.children))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.name
+        if role == Qt.DecorationRole:
+            return self._folder_icon if node.is_dir else self._file_icon
+        if role == Qt.ToolTipRole:
+            return self.node_path(node)
+        if role == Qt.ForegroundRole and self._path_colors:
+            color = self._path_colors.get(self.node_path(node))
+            if color is not None:
+                if color not in self._colors:
+                    self._colors[color] = QColor(color)
+                return self._colors[color]
+        return None
+
+    def set_path_colors(self, colors):
+        """Text colours by absolute path ({} for none); listed rows whose colour changed repaint."""
+        old = self._path_colors
+        self._path_colors = colors
+        changed = {os.path.dirname(path) for path in old.keys() ^ colors.keys()}
+        changed.update(os.path.dirname(path) for path in old.keys() & colors.keys() if old[path] != colors[path])
+        for directory in changed:
+            node = self._find(directory)
+            if node is not None and node.children:
+                parent = self._index_of(node)
+                self.dataChanged.emit(self.index(0, 0, parent), self.index(len(node.children) - 1, 0, parent), [Qt.ForegroundRole])
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node.is_dir and node.children is None and not node.listing
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node.is_dir and node.children is None:
+            self._list([node])
+
+    # -------------------------------------------------------------
+    # --- Listing
+    # -------------------------------------------------------------
+
+    def refresh(self):
+        """Lists every fetched directory again (new, deleted, modified and newly ignored entries)."""
+        nodes = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.children is not None:
+                nodes.append(node)
+                stack.extend(child for child in reversed(node.children) if child.children is not None)
+        self._list(nodes)
+
+    def _list(self, nodes):
+        """Lists nodes (parents before children) in one worker, so their changes reach the view together."""
+        if not self._root_path:
+            return
+        jobs = []
+        batch = set()
+        for node in nodes:
+            if node.listing:
+                continue
+            node.listing = True
+            if node.parent is not None and node.parent.rules is None and node.parent not in batch:
+                # Restored from a snapshot and not listed yet: its ignore rules come with that listing
+                self._waiting.append(node)
+                continue
+            batch.add(node)
+            parent_rules = node.parent.rules if node.parent is not None else None
+            previous = None
+            if node.children is not None and node.stamp is not None:
+                previous = (node.stamp, [(child.name, child.is_dir, child.stamp) for child in node.children])
+            jobs.append((node, self.node_path(node), self._relative_path(node), parent_rules, previous))
+        if jobs:
+            worker = DirectoryListWorker(self._generation, jobs, self._excludes)
+            worker.signals.finished.connect(self._on_listed)
+            QThreadPool.globalInstance().start(worker)
+
+    def _on_listed(self, generation, results):
+        changed = []
+        changed_directories = []
+        for node, entries, rules, skipped, error, stamp in results:
+            node.listing = False
+            if generation != self._generation or not self._attached(node):
+                continue # Listing of a previous root, or of a directory deleted meanwhile
+            first_listing = node.rules is None # Also true for directories restored from a snapshot
+            node.rules = rules
+            node.skipped = skipped
+            node.stamp = stamp
+            if error:
+                Debug(f"DEBUG: Cannot list {self.node_path(node)}: {error}")
+            if node.children is None:
+                self._insert_listing(node, entries)
+                self.listing_finished.emit(self.node_path(node), len(node.children), skipped)
+            else:
+                self._merge(node, entries, changed, changed_directories)
+            if first_listing and not error:
+                self._watcher.addPath(self.node_path(node))
+        if changed:
+            self.paths_changed.emit(changed)
+        if changed_directories:
+            self.directories_changed.emit(changed_directories)
+        if generation == self._generation and self._waiting:
+            ready = [node for node in self._waiting if node.parent.rules is not None or not self._attached(node)]
+            self._waiting = [node for node in self._waiting if node not in ready]
+            for node in ready:
+                node.listing = False
+            self._list([node for node in ready if self._attached(node)])
+
+    def _insert_listing(self, node, entries):
+        if entries:
+            self.beginInsertRows(self._index_of(node), 0, len(entries) - 1)
+            node.children = [_TreeNode(name, node, is_dir, row, stamp) for row, (name, is_dir, stamp) in enumerate(entries)]
+            self.endInsertRows()
+        else:
+            self.layoutAboutToBeChanged.emit()
+            node.children = [] # Drops the expander
+            self.layoutChanged.emit()
+
+    def _merge(self, node, entries, changed, changed_directories):
+        """
+        Brings the children of a listed directory in line with a new listing,
+        appends the files added, deleted or modified to changed and the
+        subdirectories added or deleted to changed_directories. Each run
+        of adjacent rows is removed / inserted in one go; a diff scattered over
+        more than MAX_ROW_RUNS places becomes a single layout change.
+        """
+        children = node.children
+        known = {(child.name, child.is_dir): child for child in children}
+        directory = self.node_path(node)
+        merged = []
+        for name, is_dir, stamp in entries:
+            child = known.pop((name, is_dir), None)
+            if child is None:
+                child = _TreeNode(name, node, is_dir, -1, stamp)
+                (changed_directories if is_dir else changed).append(os.path.join(directory, name))
+            elif not is_dir and child.stamp != stamp:
+                child.stamp = stamp
+                changed.append(os.path.join(directory, name))
+            merged.append(child)
+        removed = known # What the listing no longer has
+        if not removed and len(merged) == len(children):
+            return
+        for child in removed.values():
+            (changed_directories if child.is_dir else changed).append(os.path.join(directory, child.name))
+            self._unwatch(child)
+
+        # Separate places the diff touches: runs of new rows plus runs of removed ones
+        runs = sum(1 for row, child in enumerate(merged) if child.row == -1 and (row == 0 or merged[row - 1].row != -1))
+        runs += sum(1 for row, child in enumerate(children)
+                    if (child.name, child.is_dir) in removed and (row == 0 or (children[row - 1].name, children[row - 1].is_dir) not in removed))
+        if runs > self.MAX_ROW_RUNS:
+            self._replace_children(node, merged)
+            return
+
+        parent = self._index_of(node)
+        # Removals bottom-up, so the rows above stay where they are
+        row = len(children) - 1
+        while row >= 0:
+            if (children[row].name, children[row].is_dir) not in removed:
+                row -= 1
+                continue
+            end = row
+            while row > 0 and (children[row - 1].name, children[row - 1].is_dir) in removed:
+                row -= 1
+            self.beginRemoveRows(parent, row, end)
+            del children[row:end + 1]
+            self._renumber(children, row)
+            self.endRemoveRows()
+            row -= 1
+        # Insertions top-down; children now holds the kept nodes, in merged order
+        row = 0
+        while row < len(merged):
+            if row < len(children) and children[row] is merged[row]:
+                row += 1
+                continue
+            following = children[row] if row < len(children) else None
+            end = row
+            while end + 1 < len(merged) and merged[end + 1] is not following:
+                end += 1
+            self.beginInsertRows(parent, row, end)
+            children[row:row] = merged[row:end + 1]
+            self._renumber(children, row)
+            self.endInsertRows()
+            row = end + 1
+
+    def _replace_children(self, node, children):
+        """Swaps in a new child list as one layout change, moving the views' persistent indexes along."""
+        self.layoutAboutToBeChanged.emit()
+        node.children = children
+        self._renumber(children, 0)
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for index in old_indexes:
+            item = index.internalPointer()
+            new_indexes.append(self.createIndex(item.row, 0, item) if self._attached(item) else QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _attached(self, node):
+        while node.parent is not None:
+            siblings = node.parent.children
+            if not siblings or not 0 <= node.row < len(siblings) or siblings[node.row] is not node:
+                return False
+            node = node.parent
+        return node is self._root
+
+    @staticmethod
+    def _renumber(children, start):
+        for row in range(start, len(children)):
+            children[row].row = row
+
+    # -------------------------------------------------------------
+    # --- Watching
+    # -------------------------------------------------------------
+
+    def _on_directory_changed(self, path):
+        now = time.monotonic()
+        if not self._changed_dirs:
+            self._first_change = now
+        self._changed_dirs.add(path)
+        # Each event pushes the flush back, until the burst has waited MAX_COALESCE_MS
+        if not self._flush_timer.isActive() or (now - self._first_change) * 1000 < self.MAX_COALESCE_MS:
+            self._flush_timer.start(self.COALESCE_MS)
+
+    def _flush_changes(self):
+        nodes = []
+        waiting = set()
+        for path in sorted(self._changed_dirs, key=len): # Parents before children
+            node = self._find(path)
+            if node is None or node.children is None:
+                continue # Gone, or never listed: nothing on screen to update
+            if node.listing:
+                waiting.add(path)
+            else:
+                nodes.append(node)
+        self._changed_dirs = waiting
+        if waiting:
+            self._first_change = time.monotonic()
+            self._flush_timer.start(self.COALESCE_MS)
+        self._list(nodes)
+
+    def _unwatch(self, node):
+        """Stops watching the listed directories of a subtree leaving the tree."""
+        paths = []
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if item.children is not None:
+                paths.append(self.node_path(item))
+                stack.extend(child for child in item.children if child.children is not None)
+        watched = set(self._watcher.directories())
+        paths = [path for path in paths if path in watched]
+        if paths:
+            self._watcher.removePaths(paths)
+
+    # -------------------------------------------------------------
+    # --- Patches from the IDE's own file operations
+    # -------------------------------------------------------------
+
+    def add_path(self, path):
+        """
+        A file or directory the IDE created or wrote: inserted into its
+        directory if that is listed (a known file just gets its new stamp).
+        """
+        path = os.path.abspath(path)
+        node = self._find(os.path.dirname(path))
+        if node is None or node.children is None or not os.path.lexists(path):
+            return
+        name = os.path.basename(path)
+        is_dir = os.path.isdir(path)
+        stamp = None
+        if not is_dir:
+            try:
+                stat = os.stat(path)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+        children = node.children
+        row = bisect_left(children, _sort_key(name, is_dir), key=lambda child: _sort_key(child.name, child.is_dir))
+        if row < len(children) and children[row].name == name and children[row].is_dir == is_dir:
+            children[row].stamp = stamp
+            return
+        relative_path = self._relative_path(node)
+        relative_path = relative_path + "/" + name if relative_path else name
+        if self._excludes.is_ignored(relative_path, is_dir) or (node.rules is not None and node.rules.is_ignored(relative_path, is_dir)):
+            return
+        self.beginInsertRows(self._index_of(node), row, row)
+        children.insert(row, _TreeNode(name, node, is_dir, row, stamp))
+        self._renumber(children, row)
+        self.endInsertRows()
+
+    def remove_path(self, path):
+        """A file or directory the IDE deleted: its node (and subtree) leaves the tree."""
+        node = self._find(path)
+        if node is None or node.parent is None:
+            return
+        self._unwatch(node)
+        siblings = node.parent.children
+        row = node.row
+        self.beginRemoveRows(self._index_of(node.parent), row, row)
+        del siblings[row]
+        self._renumber(siblings, row)
+        self.endRemoveRows()
+
+    def rename_path(self, old_path, new_path):
+        self.remove_path(old_path)
+        self.add_path(new_path)
+
+# ------------------------------------------------------------------
+# 🗂️ FILE MANAGER (tree view)
+# ------------------------------------------------------------------
+
 class FileManager(QTreeView):
     file_open_requested = Signal(str)
+    status_message = Signal(str)
+    paths_changed = Signal(list)       # Files changed on disk behind the IDE's back (see ProjectTreeModel)
+    directories_changed = Signal(list) # Directories added or deleted on disk behind the IDE's back
 
     def __init__(self):
         super().__init__()
-        self.model = QFileSystemModel()
-        
-        default_path = QDir.currentPath()
-        self.model.setRootPath(default_path)
-        
+        self.model = ProjectTreeModel(self)
+        self.model.listing_finished.connect(self._on_listing_finished)
+        self.model.paths_changed.connect(self.paths_changed)
+        self.model.directories_changed.connect(self.directories_changed)
         self.setModel(self.model)
-        self.setRootIndex(self.model.index(default_path))
-        
+        self.model.setRootPath(QDir.currentPath())
+
         self.doubleClicked.connect(self.on_double_click)
-        
-        for i in range(1, self.model.columnCount()):
-            self.setColumnHidden(i, True)
-            
-        self.setColumnWidth(0, 300) 
+
+        self.setUniformRowHeights(True) # Rows are never measured one by one, even in huge directories
         self.setHeaderHidden(True)
 
     def on_double_click(self, index):
         if self.model.isDir(index):
             return
-        
+
         file_path = self.model.filePath(index)
         self.file_open_requested.emit(file_path)
 
     def set_root_path(self, path):
         if QDir(path).exists():
             self.model.setRootPath(path)
-            self.setRootIndex(self.model.index(path))
             return True
         else:
             Debug(f"Error: Directory not found: {path}")
             return False
 
-    # ✅ CORRECTION 3: ADDING THE MISSING refresh_view METHOD
+    def set_exclude_patterns(self, patterns):
+        self.model.set_exclude_patterns(patterns)
+
+    def restore(self, path, directories, expanded):
+        """
+        Shows a root from a model snapshot (see ProjectTreeModel.restore_snapshot)
+        with the expanded relative directories open again.
+        """
+        if not QDir(path).exists():
+            return False
+        self.model.restore_snapshot(path, directories)
+        for relative_path in sorted(expanded, key=lambda relative_path: relative_path.count("/")):
+            index = self.model.index_of_path(os.path.join(path, *relative_path.split("/")))
+            if index.isValid():
+                self.expand(index)
+        return True
+
+    def expanded_paths(self):
+        """Relative ("/"-separated) paths of the expanded directories."""
+        root = self.model.rootPath()
+        paths = []
+        pending = [QModelIndex()]
+        while pending:
+            parent = pending.pop()
+            for row in range(self.model.rowCount(parent)):
+                index = self.model.index(row, 0, parent)
+                if self.isExpanded(index):
+                    paths.append(os.path.relpath(self.model.filePath(index), root).replace(os.sep, "/"))
+                    pending.append(index)
+        return paths
+
     def refresh_view(self):
+        """Lists the expanded directories again, keeping the expanded state."""
+        self.model.refresh()
+        Debug("DEBUG: FileManager view refreshing.")
+
+    # --- File operations done by the IDE itself: only the affected nodes change
+
+    def file_saved(self, path):
+        self.model.add_path(path)
+
+    def file_renamed(self, old_path, new_path):
+        self.model.rename_path(old_path, new_path)
+
+    def file_deleted(self, path):
+        self.model.remove_path(path)
 
-        current_root_path = self.model.rootPath()
-        root_index = self.model.index(current_root_path)
-    
-    # 1. Ask the model to reload the contents of the root index.
-    # This is the correct PySide/Qt way to manually trigger an update 
-    # of the directory listing if auto-monitoring is delayed or missed.
-        self.model.setRootPath(current_root_path)
-    
-    # 2. Tell the view to re-display the contents starting from the root index.
-        self.setRootIndex(root_index)
-    
-    # 3. Force the view to repaint itself to guarantee the change is visible.
-        self.viewport().update()
-    
-        Debug("DEBUG: FileManager view updated via model reload.")
\ No newline at end of file
+    def _on_listing_finished(self, path, shown, skipped):
+        if skipped:
+            name = os.path.relpath(path, self.model.rootPath()) if path != self.model.rootPath() else os.path.basename(path) or path
+            self.status_message.emit(
+                f"{name}: {skipped} ignored entries hidden ({self.model.skipped_count()} in the project tree so far)."
+            )
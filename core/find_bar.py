@@ -0,0 +1,609 @@
+# --- File: core/find_bar.py ---
+# Find / replace bar for CodeEditorCore tabs. Matches are collected by a
+# worker thread over a snapshot of the text, and only the matches inside
+# the viewport are ever turned into extra selections.
+
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from PySide6.QtWidgets import (
+    QWidget, QHBoxLayout, QVBoxLayout, QLineEdit, QLabel,
+    QPushButton, QToolButton, QTextEdit
+)
+from PySide6.QtGui import QColor, QTextCursor
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QTimer, Slot
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+MATCH_COLOR = "#613214"
+CURRENT_MATCH_COLOR = "#9e6a03"
+
+# Characters outside the BMP take two UTF-16 units in QTextDocument positions
+_ASTRAL_RE = re.compile("[\U00010000-\U0010FFFF]")
+
+def compile_search(text, regex=False, case_sensitive=False, whole_word=False):
+    """Builds the pattern used for both searching and Replace All. Raises re.error."""
+    pattern = text if regex else re.escape(text)
+    if whole_word:
+        pattern = rf"\b(?:{pattern})\b"
+    flags = re.MULTILINE
+    if not case_sensitive:
+        flags |= re.IGNORECASE
+    return re.compile(pattern, flags)
+
+# ------------------------------------------------------------------
+# 🔎 SEARCH WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class SearchWorkerSignals(QObject):
+    """Signals available from the search worker."""
+    matches_found = Signal(int, object, object) # Generation, starts, lengths (document positions)
+    finished = Signal(int, int)                 # Generation, total matches
+
+def _astral_positions(text):
+    """Document (UTF-16) positions of the characters outside the BMP, which take two positions each."""
+    if text.isascii():
+        return []
+    return [m.start() + i for i, m in enumerate(_ASTRAL_RE.finditer(text))]
+
+class SearchWorker(QRunnable):
+    """
+    Scans a text snapshot with a compiled pattern and hands matches to the
+    UI in batches, already converted to QTextDocument (UTF-16) positions.
+    """
+    BATCH_SIZE = 5000
+
+    def __init__(self, generation, text, pattern):
+        super().__init__()
+        self.signals = SearchWorkerSignals()
+        self.generation = generation
+        self.text = text
+        self.pattern = pattern
+        self.astral = [] # UTF-16 positions of astral characters, set by run()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self):
+        text = self.text
+        # Stored as document positions so Replace All can map back (see to_index)
+        self.astral = _astral_positions(text)
+        astral = [position - i for i, position in enumerate(self.astral)]
+
+        starts = array('q')
+        lengths = array('q')
+        total = 0
+        shift = 0 # Astral characters before the current match
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            if start == end:
+                continue # Empty matches (e.g. '^') cannot be selected or replaced
+            if astral:
+                while shift < len(astral) and astral[shift] < start:
+                    shift += 1
+                inside = bisect_left(astral, end, shift) - shift
+                starts.append(start + shift)
+                lengths.append(end - start + inside)
+            else:
+                starts.append(start)
+                lengths.append(end - start)
+
+            if len(starts) >= self.BATCH_SIZE:
+                if self._cancelled:
+                    return
+                total += len(starts)
+                self.signals.matches_found.emit(self.generation, starts, lengths)
+                starts = array('q')
+                lengths = array('q')
+
+        if self._cancelled:
+            return
+        total += len(starts)
+        if starts:
+            self.signals.matches_found.emit(self.generation, starts, lengths)
+        self.signals.finished.emit(self.generation, total)
+
+    def to_index(self, position):
+        """Maps a document position back to an index into the snapshot string."""
+        return position - bisect_left(self.astral, position)
+
+# ------------------------------------------------------------------
+# 🧭 FIND BAR
+# ------------------------------------------------------------------
+
+class FindBar(QWidget):
+    """
+    Incremental find (literal or regex) and replace for the current tab of
+    an Editor. Edits to the document restart the search on a new snapshot.
+    """
+    status_message = Signal(str)
+
+    SEARCH_DELAY_MS = 150      # Typing pause before a new search starts
+    MAX_VISIBLE_MATCHES = 2000 # Extra selections created per viewport
+    REPLACE_TIME_BUDGET = 0.01 # Seconds of Replace All per event loop tick
+
+    def __init__(self, editor_tabs, parent=None):
+        super().__init__(parent)
+        self.editor_tabs = editor_tabs
+        self.editor = None
+
+        self._generation = 0
+        self._worker = None
+        self._searching = False
+        self._snapshot_revision = -1
+        self._starts = array('q')
+        self._lengths = array('q')
+        self._current = -1
+        self._replace_all_pending = False
+        self._replace_job = None
+        self._attach_pending = False # Tab changed during Replace All: follow it once that is done
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self.start_search)
+
+        self._replace_timer = QTimer(self)
+        self._replace_timer.setInterval(0)
+        self._replace_timer.timeout.connect(self._replace_all_step)
+
+        self.init_ui()
+        self.hide()
+
+        editor_tabs.currentChanged.connect(self._on_tab_changed)
+        editor_tabs.editor_closed.connect(self._on_editor_closed)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(4, 2, 4, 2)
+        layout.setSpacing(2)
+        self.setLayout(layout)
+
+        find_row = QHBoxLayout()
+        self.find_edit = QLineEdit()
+        self.find_edit.setPlaceholderText("Find")
+        self.find_edit.setClearButtonEnabled(True)
+        self.case_button = self._option_button("Aa", "Match case")
+        self.word_button = self._option_button("W", "Match whole word")
+        self.regex_button = self._option_button(".*", "Use regular expression")
+        self.count_label = QLabel("")
+        self.count_label.setMinimumWidth(120)
+        prev_button = QPushButton("Previous")
+        next_button = QPushButton("Next")
+        close_button = QToolButton()
+        close_button.setText("✕")
+        close_button.setAutoRaise(True)
+
+        for widget in (self.find_edit, self.case_button, self.word_button, self.regex_button,
+                       self.count_label, prev_button, next_button, close_button):
+            find_row.addWidget(widget)
+        layout.addLayout(find_row)
+
+        self.replace_row = QWidget()
+        replace_layout = QHBoxLayout()
+        replace_layout.setContentsMargins(0, 0, 0, 0)
+        self.replace_row.setLayout(replace_layout)
+        self.replace_edit = QLineEdit()
+        self.replace_edit.setPlaceholderText("Replace")
+        replace_button = QPushButton("Replace")
+        self.replace_all_button = QPushButton("Replace All")
+        replace_layout.addWidget(self.replace_edit)
+        replace_layout.addWidget(replace_button)
+        replace_layout.addWidget(self.replace_all_button)
+        layout.addWidget(self.replace_row)
+
+        # Signals
+        self.find_edit.textChanged.connect(self._schedule_search)
+        self.find_edit.returnPressed.connect(self.find_next)
+        for button in (self.case_button, self.word_button, self.regex_button):
+            button.toggled.connect(self._schedule_search)
+        prev_button.clicked.connect(self.find_previous)
+        next_button.clicked.connect(self.find_next)
+        close_button.clicked.connect(self.close_bar)
+        self.replace_edit.returnPressed.connect(self.replace_current)
+        replace_button.clicked.connect(self.replace_current)
+        self.replace_all_button.clicked.connect(self.replace_all)
+
+    def _option_button(self, text, tooltip):
+        button = QToolButton()
+        button.setText(text)
+        button.setToolTip(tooltip)
+        button.setCheckable(True)
+        return button
+
+    # -------------------------------------------------------------
+    # --- Showing / hiding
+    # -------------------------------------------------------------
+
+    def open_bar(self, replace=False):
+        """Shows the bar (with the replace row if asked), seeded from the selection."""
+        self.replace_row.setVisible(replace)
+        self.show()
+        editor = self.editor_tabs.get_current_editor()
+        if editor is not None and hasattr(editor, "textCursor"):
+            selected = editor.textCursor().selectedText()
+            if selected and "\u2029" not in selected: # Single line selections only
+                self.find_edit.setText(selected)
+        self._attach(editor)
+        self.find_edit.setFocus()
+        self.find_edit.selectAll()
+        self._schedule_search()
+
+    def close_bar(self):
+        self._cancel_search()
+        self._clear_matches()
+        self.hide()
+        if self.editor is not None:
+            self.editor.setFocus()
+        self._attach(None)
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close_bar()
+        elif event.key() in (Qt.Key_Return, Qt.Key_Enter) and event.modifiers() & Qt.ShiftModifier:
+            self.find_previous()
+        else:
+            super().keyPressEvent(event)
+
+    def _on_tab_changed(self, index):
+        if self.isVisible():
+            self._attach(self.editor_tabs.get_current_editor())
+            self._schedule_search()
+
+    def _on_editor_closed(self, editor):
+        job = self._replace_job
+        if job is not None and job["editor"] is editor:
+            self._end_replace_all(job)
+            self.status_message.emit("Replace All stopped: the tab was closed.")
+
+    def _attach(self, editor):
+        """Follows a new editor tab (only CodeEditorCore has a searchable document)."""
+        if editor is not None and not hasattr(editor, "set_extra_selections"):
+            editor = None
+        if editor is self.editor:
+            return
+        if self._replace_job is not None:
+            self._attach_pending = True # Replace All keeps its editor until it is done
+            return
+        if self.editor is not None:
+            self._clear_matches()
+            try:
+                self.editor.document().contentsChange.disconnect(self._on_contents_change)
+                self.editor.verticalScrollBar().valueChanged.disconnect(self._update_highlights)
+            except (TypeError, RuntimeError):
+                pass
+        self.editor = editor
+        if editor is not None:
+            editor.document().contentsChange.connect(self._on_contents_change)
+            editor.verticalScrollBar().valueChanged.connect(self._update_highlights)
+
+    # -------------------------------------------------------------
+    # --- Searching
+    # -------------------------------------------------------------
+
+    def _schedule_search(self, *_):
+        self._search_timer.start(self.SEARCH_DELAY_MS)
+
+    def _on_contents_change(self, position, removed, added):
+        if self._replace_job is not None:
+            return # Our own Replace All, the search restarts once it is done
+        if self.editor.document().revision() != self._snapshot_revision:
+            self._schedule_search()
+
+    def _pattern(self):
+        return compile_search(
+            self.find_edit.text(),
+            regex=self.regex_button.isChecked(),
+            case_sensitive=self.case_button.isChecked(),
+            whole_word=self.word_button.isChecked(),
+        )
+
+    def start_search(self):
+        """Starts a fresh search of the current document in the background."""
+        if self._replace_job is not None:
+            return # Searched again once Replace All is done
+        self._cancel_search()
+        self._clear_matches()
+        if self.editor is None or not self.find_edit.text():
+            self.count_label.setText("")
+            return
+        try:
+            pattern = self._pattern()
+        except re.error as e:
+            self.count_label.setText("Invalid pattern")
+            self.count_label.setToolTip(str(e))
+            return
+        self.count_label.setToolTip("")
+
+        self._generation += 1
+        self._snapshot_revision = self.editor.document().revision()
+        self._worker = SearchWorker(self._generation, self.editor.toPlainText(), pattern)
+        self._worker.signals.matches_found.connect(self._on_matches_found)
+        self._worker.signals.finished.connect(self._on_search_finished)
+        self._searching = True
+        self.count_label.setText("Searching...")
+        QThreadPool.globalInstance().start(self._worker)
+
+    def _cancel_search(self):
+        self._search_timer.stop()
+        if self._worker is not None:
+            self._worker.cancel()
+        self._searching = False
+
+    def _on_matches_found(self, generation, starts, lengths):
+        if generation != self._generation:
+            return # From a search that was replaced by a newer one
+        first_batch = not self._starts
+        self._starts.extend(starts)
+        self._lengths.extend(lengths)
+        if first_batch and self._current < 0:
+            self._select_nearest()
+        self._update_count()
+        # Repaint only if this batch reaches into the viewport
+        first, last = self._visible_span()
+        if starts[0] <= last and starts[-1] >= first:
+            self._update_highlights()
+
+    def _on_search_finished(self, generation, total):
+        if generation != self._generation:
+            return
+        self._searching = False
+        self._update_count()
+        if self._replace_all_pending:
+            self._replace_all_pending = False
+            self.replace_all()
+
+    def _clear_matches(self):
+        self._starts = array('q')
+        self._lengths = array('q')
+        self._current = -1
+        if self.editor is not None:
+            self.editor.set_extra_selections("find", [])
+
+    def _update_count(self):
+        total = len(self._starts)
+        more = "+" if self._searching else ""
+        if total == 0:
+            self.count_label.setText("Searching..." if self._searching else "No results")
+        elif self._current >= 0:
+            self.count_label.setText(f"{self._current + 1} of {total}{more}")
+        else:
+            self.count_label.setText(f"{total}{more} matches")
+
+    # -------------------------------------------------------------
+    # --- Highlighting (viewport only)
+    # -------------------------------------------------------------
+
+    def _visible_span(self):
+        """First and last document positions shown in the viewport."""
+        editor = self.editor
+        if editor is None:
+            return 0, -1
+        first = editor.firstVisibleBlock().position()
+        viewport = editor.viewport().rect()
+        last = editor.cursorForPosition(viewport.bottomRight()).block()
+        return first, last.position() + last.length()
+
+    def _update_highlights(self, *_):
+        if self.editor is None:
+            return
+        first, last = self._visible_span()
+        starts = self._starts
+        lo = bisect_left(starts, first)
+        hi = min(bisect_right(starts, last), lo + self.MAX_VISIBLE_MATCHES)
+
+        document = self.editor.document()
+        selections = []
+        for i in range(lo, hi):
+            selection = QTextEdit.ExtraSelection()
+            color = CURRENT_MATCH_COLOR if i == self._current else MATCH_COLOR
+            selection.format.setBackground(QColor(color))
+            cursor = QTextCursor(document)
+            cursor.setPosition(starts[i])
+            cursor.setPosition(starts[i] + self._lengths[i], QTextCursor.KeepAnchor)
+            selection.cursor = cursor
+            selections.append(selection)
+        self.editor.set_extra_selections("find", selections)
+
+    # -------------------------------------------------------------
+    # --- Navigation
+    # -------------------------------------------------------------
+
+    def _select_nearest(self):
+        """Makes the first match at or after the cursor current, without moving the view."""
+        position = self.editor.textCursor().selectionStart()
+        i = bisect_left(self._starts, position)
+        self._current = i if i < len(self._starts) else -1
+
+    def find_next(self):
+        if self.editor is None or not self._starts:
+            return
+        position = self.editor.textCursor().selectionEnd()
+        i = bisect_left(self._starts, position)
+        if i >= len(self._starts):
+            if self._searching:
+                self.status_message.emit("Still searching...")
+                return
+            i = 0 # Wrap around
+        self._go_to(i)
+
+    def find_previous(self):
+        if self.editor is None or not self._starts:
+            return
+        position = self.editor.textCursor().selectionStart()
+        i = bisect_left(self._starts, position) - 1
+        if i < 0:
+            i = len(self._starts) - 1 # Wrap around
+        self._go_to(i)
+
+    def _go_to(self, i):
+        self._current = i
+        cursor = self.editor.textCursor()
+        cursor.setPosition(self._starts[i])
+        cursor.setPosition(self._starts[i] + self._lengths[i], QTextCursor.KeepAnchor)
+        self.editor.setTextCursor(cursor)
+        self.editor.centerCursor()
+        self._update_count()
+        self._update_highlights()
+
+    # -------------------------------------------------------------
+    # --- Replacing
+    # -------------------------------------------------------------
+
+    def _replacement(self, start):
+        """
+        Replacement for the match at document position start: regex mode
+        expands \\1 / \\g<name> groups of the match found in the whole text,
+        so lookarounds, anchors and \\b see what surrounds it.
+        """
+        replace_text = self.replace_edit.text()
+        if not self.regex_button.isChecked():
+            return replace_text
+        worker = self._worker
+        if worker is not None and self.editor.document().revision() == self._snapshot_revision:
+            text, index, pattern = worker.text, worker.to_index(start), worker.pattern
+        else:
+            # Edited since the last search: map the position into the current text
+            text = self.editor.toPlainText()
+            index = start - bisect_left(_astral_positions(text), start)
+            pattern = self._pattern()
+        match = pattern.match(text, index)
+        return match.expand(replace_text) if match else replace_text
+
+    def replace_current(self):
+        """Replaces the selected match and moves on to the next one."""
+        if self.editor is None or self.editor.isReadOnly():
+            return
+        cursor = self.editor.textCursor()
+        i = bisect_left(self._starts, cursor.selectionStart())
+        if (i < len(self._starts) and self._starts[i] == cursor.selectionStart()
+                and self._lengths[i] == cursor.selectionEnd() - cursor.selectionStart()):
+            replacement = self._replacement(self._starts[i])
+            cursor.insertText(replacement)
+            # The edit restarts the search; until then the next match is just shifted
+            if i + 1 < len(self._starts):
+                shift = len(replacement.encode("utf-16-le")) // 2 - self._lengths[i]
+                cursor.setPosition(self._starts[i + 1] + shift)
+                cursor.setPosition(self._starts[i + 1] + shift + self._lengths[i + 1], QTextCursor.KeepAnchor)
+                self.editor.setTextCursor(cursor)
+                self.editor.centerCursor()
+            return
+        self.find_next()
+
+    def replace_all(self):
+        """
+        Replaces every match as one undo step. Runs in time slices from the
+        event loop, last match first so earlier positions stay valid.
+        """
+        if self.editor is None or self.editor.isReadOnly() or self._replace_job is not None:
+            return
+        if self._searching or self._search_timer.isActive() or \
+                self.editor.document().revision() != self._snapshot_revision:
+            # Wait for the match list of the current text
+            self._replace_all_pending = True
+            if not self._searching:
+                self.start_search()
+            return
+        if not self._starts:
+            return
+
+        worker = self._worker
+        replace_text = self.replace_edit.text()
+        pattern = worker.pattern if self.regex_button.isChecked() else None
+        cursor = QTextCursor(self.editor.document())
+        cursor.beginEditBlock()
+        self.editor.setReadOnly(True) # No typing into a half-replaced buffer
+        self._replace_job = {
+            "editor": self.editor,
+            "cursor": cursor,
+            "worker": worker,
+            "pattern": pattern,
+            "replace_text": replace_text,
+            # Own copies: the match list is cleared / refilled by searches and tab switches
+            "starts": array('q', self._starts),
+            "lengths": array('q', self._lengths),
+            "next": len(self._starts) - 1,
+            "total": len(self._starts),
+        }
+        self.replace_all_button.setEnabled(False)
+        self._replace_timer.start()
+
+    def _replace_all_step(self):
+        job = self._replace_job
+        try:
+            self._replace_slice(job)
+        except Exception as e:
+            # E.g. the tab was closed underneath us: stop, but never leave the edit block open
+            Debug(f"DEBUG: Replace All stopped: {e}")
+            self._end_replace_all(job)
+            self.status_message.emit(f"Replace All stopped after {job['total'] - job['next'] - 1} of {job['total']} occurrence(s).")
+            return
+        if job["next"] < 0:
+            self._end_replace_all(job)
+            self.status_message.emit(f"Replaced {job['total']} occurrence(s).")
+
+    def _replace_slice(self, job):
+        """Replaces matches for one REPLACE_TIME_BUDGET, last first."""
+        cursor = job["cursor"]
+        worker = job["worker"]
+        pattern = job["pattern"]
+        replace_text = job["replace_text"]
+        starts = job["starts"]
+        lengths = job["lengths"]
+
+        deadline = time.perf_counter() + self.REPLACE_TIME_BUDGET
+        i = job["next"]
+        while i >= 0:
+            start = starts[i]
+            if pattern is not None:
+                index = worker.to_index(start)
+                match = pattern.match(worker.text, index)
+                replacement = match.expand(replace_text) if match else replace_text
+            else:
+                replacement = replace_text
+            cursor.setPosition(start)
+            cursor.setPosition(start + lengths[i], QTextCursor.KeepAnchor)
+            cursor.insertText(replacement)
+            i -= 1
+            if i & 0xFF == 0 and time.perf_counter() >= deadline:
+                break
+        job["next"] = i
+
+        done = job["total"] - i - 1
+        self.count_label.setText(f"Replacing {done} of {job['total']}...")
+
+    def _end_replace_all(self, job):
+        """Closes the edit block (one undo step) and hands the editor back, finished or not."""
+        self._replace_timer.stop()
+        self._replace_job = None
+        self.replace_all_button.setEnabled(True)
+        try:
+            # The whole edit reaches the highlighter here: keep it to the viewport
+            scheduler = getattr(job["editor"], "highlight_scheduler", None)
+            if scheduler is not None:
+                scheduler.begin_bulk_edit()
+            job["cursor"].endEditBlock()
+            if scheduler is not None:
+                scheduler.end_bulk_edit(job["starts"][0])
+            job["editor"].setReadOnly(False)
+        except RuntimeError:
+            pass # The editor is gone
+        if self._attach_pending:
+            self._attach_pending = False
+            self._attach(self.editor_tabs.get_current_editor())
+        self.start_search()
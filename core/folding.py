@@ -0,0 +1,290 @@
+# --- File: core/folding.py ---
+# Indentation-based code folding for CodeEditorCore. FoldIndex mirrors the
+# indentation of every block (re-read only for the blocks an edit touched)
+# and derives fold regions from it: a line opens a region when the next
+# non-blank line is indented deeper, and the region runs to the last line
+# before the indentation drops back. Collapsing hides the region's blocks
+# with QTextBlock.setVisible, keeping their layouts for the next unfold.
+
+from array import array
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+BLANK = -1    # Indent of an empty / whitespace-only line (belongs to whatever surrounds it)
+TAB_SIZE = 4
+
+def line_indent(text):
+    """Indentation width of a line in columns, BLANK if it has no text."""
+    stripped = text.lstrip()
+    if not stripped:
+        return BLANK
+    indent = text[:len(text) - len(stripped)]
+    return len(indent.expandtabs(TAB_SIZE)) if "\t" in indent else len(indent)
+
+def _set_visible(block, visible):
+    """
+    Shows / hides a block and updates the document's line count by hand.
+    markContentsDirty would do the same but throw the laid out lines of every
+    block away, and laying thousands of them out again is what made big folds slow.
+    """
+    block.setVisible(visible)
+    block.setLineCount(max(1, block.layout().lineCount()) if visible else 0)
+
+# ------------------------------------------------------------------
+# 📐 FOLD INDEX
+# ------------------------------------------------------------------
+
+class FoldIndex:
+    """
+    Fold regions and collapsed state of a document, by block number.
+    Text set with the document's signals blocked is picked up by rebuild()
+    (called by the editor, or by sync() on the next query).
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self.indents = array('i', [BLANK])  # Indent of every block
+        self.collapsed = bytearray(1)        # 1 for headers whose region is folded away
+        self._ends = {}                      # Header -> last block of its region, until the next structural edit
+        self.revision = 0                    # Bumped whenever blocks are shown or hidden
+        document.contentsChange.connect(self._on_contents_change)
+
+    def rebuild(self):
+        """Re-reads every line. Folds are dropped: the blocks they hid are gone."""
+        self.indents = array('i', [line_indent(line) for line in self.document.toPlainText().split("\n")])
+        self.collapsed = bytearray(len(self.indents))
+        self._ends.clear()
+
+    def sync(self):
+        if len(self.indents) != self.document.blockCount():
+            self.rebuild()
+
+    def _on_contents_change(self, position, removed, added):
+        document = self.document
+        block_count = document.blockCount()
+        first_block = document.findBlock(position)
+        end_block = document.findBlock(position + added)
+        first = first_block.blockNumber()
+        # Qt may report a first change that runs past the end of the document
+        last = end_block.blockNumber() if end_block.isValid() else block_count - 1
+        old_last = last - (block_count - len(self.indents))
+        if first < 0 or old_last < first - 1 or old_last >= len(self.indents):
+            self.rebuild() # Out of step (text set while signals were blocked)
+            return
+
+        new_indents = array('i')
+        touches_fold = False
+        block = first_block
+        for _ in range(first, last + 1):
+            new_indents.append(line_indent(block.text()))
+            touches_fold = touches_fold or not block.isVisible()
+            block = block.next()
+
+        if old_last == last == first and self.indents[first] == new_indents[0]:
+            return # Typing inside a line: no region moved, a folded header stays folded
+
+        touches_fold = touches_fold or any(self.collapsed[first:old_last + 1])
+        self.indents[first:old_last + 1] = new_indents
+        self.collapsed[first:old_last + 1] = bytes(len(new_indents))
+        self._ends.clear()
+
+        # Blank lines between a fold and the edit do not keep the edit from changing the fold's region
+        above = first - 1
+        while above >= 0 and self.indents[above] == BLANK:
+            above -= 1
+        if touches_fold or (above >= 0 and (self.collapsed[above] or not document.findBlockByNumber(above).isVisible())):
+            self._unfold_around(first, last)
+
+    def _unfold_around(self, first, last):
+        """
+        Opens the folds an edit of blocks first..last landed in or next to
+        (their regions may have grown or shrunk), leaving other folds alone.
+        """
+        start = first
+        block = self.document.findBlockByNumber(first).previous()
+        while block.isValid():
+            start = block.blockNumber()
+            self.collapsed[start] = 0
+            if block.isVisible() and self.indents[start] != BLANK:
+                break # The header of the outermost fold around the edit
+            block = block.previous()
+        self._apply(start, last)
+
+    # -------------------------------------------------------------
+    # --- Regions
+    # -------------------------------------------------------------
+
+    def is_header(self, number):
+        """True if block number opens a fold region (cheap: looks past blank lines only)."""
+        indents = self.indents
+        indent = indents[number]
+        if indent == BLANK:
+            return False
+        for following in range(number + 1, len(indents)):
+            if indents[following] != BLANK:
+                return indents[following] > indent
+        return False
+
+    def is_collapsed(self, number):
+        return 0 <= number < len(self.collapsed) and bool(self.collapsed[number])
+
+    def has_folds(self):
+        return 1 in self.collapsed
+
+    def next_shown(self, number):
+        """Block number of the first line shown after block number (skips its folded region)."""
+        if self.is_collapsed(number):
+            number = self.region_end(number)
+        return number + 1
+
+    def region_end(self, header):
+        """Last block of the region opened by header (header itself if it opens none). Trailing blank lines stay outside."""
+        end = self._ends.get(header)
+        if end is not None:
+            return end
+        indents = self.indents
+        indent = indents[header]
+        end = header
+        if indent != BLANK:
+            for number in range(header + 1, len(indents)):
+                indent_at = indents[number]
+                if indent_at != BLANK:
+                    if indent_at <= indent:
+                        break
+                    end = number
+        self._ends[header] = end
+        return end
+
+    def enclosing_header(self, number):
+        """Innermost unfolded header whose region holds block number (or number itself), None at top level."""
+        if self.is_header(number) and not self.collapsed[number]:
+            return number
+        indents = self.indents
+        indent = indents[number]
+        if indent == BLANK:
+            # A blank line belongs to the deeper of its neighbours
+            below = next((indents[i] for i in range(number + 1, len(indents)) if indents[i] != BLANK), 0)
+            above = next((indents[i] for i in range(number - 1, -1, -1) if indents[i] != BLANK), 0)
+            indent = max(above, below)
+        for header in range(number - 1, -1, -1):
+            if 0 <= indents[header] < indent:
+                return header
+        return None
+
+    def regions(self):
+        """[(header, end, level)] of every region in one linear pass; level 1 is outermost."""
+        indents = self.indents
+        result = []
+        stack = []       # Indices into result of the regions still open
+        previous = -1    # Last non-blank line
+        for number, indent in enumerate(indents):
+            if indent == BLANK:
+                continue
+            if previous >= 0 and indent > indents[previous]:
+                stack.append(len(result))
+                result.append([previous, previous, len(stack)])
+            else:
+                while stack and indents[result[stack[-1]][0]] >= indent:
+                    result[stack.pop()][1] = previous
+            previous = number
+        for region in stack:
+            result[region][1] = previous
+        for header, end, _ in result:
+            self._ends[header] = end
+        return result
+
+    # -------------------------------------------------------------
+    # --- Folding (shows / hides blocks)
+    # -------------------------------------------------------------
+
+    def fold(self, header):
+        """Hides the region of header. Returns False if it opens none or is folded already."""
+        end = self.region_end(header)
+        if end <= header or self.collapsed[header]:
+            return False
+        self.collapsed[header] = 1
+        block = self.document.findBlockByNumber(header + 1)
+        for _ in range(header + 1, end + 1):
+            _set_visible(block, False)
+            block = block.next()
+        self._layout_changed()
+        return True
+
+    def unfold(self, header):
+        """Shows the region of header again (folds nested in it stay folded)."""
+        if not self.is_collapsed(header):
+            return False
+        self.collapsed[header] = 0
+        self._apply(header + 1, self.region_end(header))
+        return True
+
+    def reveal(self, number):
+        """Unfolds whatever hides block number. Returns True if anything was unfolded."""
+        block = self.document.findBlockByNumber(number)
+        revealed = False
+        while block.isValid() and not block.isVisible():
+            header = block.previous()
+            while header.isValid() and not header.isVisible():
+                header = header.previous()
+            if not header.isValid() or not self.unfold(header.blockNumber()):
+                self._apply(number, number) # Stale visibility with no fold behind it
+                break
+            revealed = True
+        return revealed
+
+    def fold_to_level(self, level):
+        """
+        Folds every region at level (1 = outermost) and unfolds all others,
+        so level levels of structure stay visible; 0 unfolds everything.
+        Linear in the number of blocks. Returns the folded (header, end)s.
+        """
+        self.sync()
+        collapsed = bytearray(len(self.indents))
+        folded = []
+        if level > 0:
+            for header, end, region_level in self.regions():
+                if region_level == level:
+                    collapsed[header] = 1
+                    folded.append((header, end))
+        self.collapsed = collapsed
+        self._apply(0, len(self.indents) - 1)
+        return folded
+
+    def _apply(self, first, last):
+        """
+        Shows or hides blocks from first on to match the collapsed flags,
+        through last and any blocks still hidden right after it. Block
+        first must not lie inside a fold.
+        """
+        block = self.document.findBlockByNumber(first)
+        collapsed = self.collapsed
+        hidden_until = -1
+        number = first
+        while block.isValid() and (number <= last or number <= hidden_until or not block.isVisible()):
+            visible = number > hidden_until
+            if block.isVisible() != visible:
+                _set_visible(block, visible)
+            if visible and collapsed[number]:
+                hidden_until = self.region_end(number)
+            block = block.next()
+            number += 1
+        self._layout_changed()
+
+    def _layout_changed(self):
+        """One scroll range / repaint update for a batch of _set_visible calls."""
+        self.revision += 1
+        layout = self.document.documentLayout()
+        layout.documentSizeChanged.emit(layout.documentSize())
+        layout.update.emit()
@@ -0,0 +1,121 @@
+# --- File: core/fuzzy.py ---
+# Fuzzy matching for pickers (symbols, files). Filtering runs as one C-level
+# regex scan over all candidates joined into a single string, so only the
+# few thousand survivors are ranked in Python.
+
+import heapq
+import re
+import sys
+from bisect import bisect_left, bisect_right
+
+# Splits identifiers and paths into words: snake_case, CamelCase, digits
+WORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Possessive repeats (Python 3.11+) never give back what they matched
+REPEAT = "*+" if sys.version_info >= (3, 11) else "*"
+
+def initials(text):
+    """First letter of every word, lower case: 'go_to_line' -> 'gtl', 'QTextCursor' -> 'qtc'."""
+    return "".join(word[0] for word in WORD_RE.findall(text)).lower()
+
+class FuzzyMatcher:
+    """
+    Ranks a fixed list of strings against a query. A string matches if the
+    query's characters appear in it in order (case-insensitive); exact,
+    prefix, word-initial and substring matches rank above scattered ones,
+    then shorter strings first.
+    """
+    MAX_RANKED = 20000 # Scattered matches ranked per query; bounds very broad queries
+
+    def __init__(self, items, keys=None):
+        """keys (defaults to items) are the strings matched against the query."""
+        self.items = items
+        keys = items if keys is None else keys
+
+        # Names repeat a lot (every class has an __init__): match each once
+        slots = {}
+        self._keys = []    # Distinct lower-case keys
+        self._members = [] # Distinct key -> indices of its items
+        self._initials = []
+        for index, key in enumerate(keys):
+            lower = key.lower()
+            slot = slots.get(lower)
+            if slot is None:
+                slots[lower] = len(self._keys)
+                self._keys.append(lower)
+                self._members.append([index])
+                self._initials.append(initials(key))
+            else:
+                self._members[slot].append(index)
+
+        self._haystack = "\n".join(self._keys)
+        self._starts = [] # Offset of every key in the haystack
+        offset = 0
+        for key in self._keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+        # Prefix lookups by binary search
+        self._sorted = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[slot] for slot in self._sorted]
+
+    def __len__(self):
+        return len(self.items)
+
+    def match(self, query, limit=100):
+        """Indices of the best matching items, best first."""
+        query = query.lower().replace(" ", "")
+        if not query:
+            return list(range(min(limit, len(self.items))))
+        if "\n" in query:
+            return []
+
+        # Prefix matches come straight from the sorted keys
+        start = bisect_left(self._sorted_keys, query)
+        end = bisect_right(self._sorted_keys, query + "\uffff", start)
+        prefixed = self._sorted[start:end]
+        if len(prefixed) >= limit:
+            return self._expand(heapq.nsmallest(limit, prefixed, key=self._rank_key(query)), limit)
+
+        # Everything else: one regex scan. "a[^b\n]*b[^c\n]*c" finds the
+        # earliest subsequence match after an "a"; possessive repeats stop
+        # the engine from backtracking along lines that cannot match
+        pattern = re.compile(re.escape(query[0]) + "".join(
+            f"[^{re.escape(char)}\n]{REPEAT}{re.escape(char)}" for char in query[1:]
+        ))
+        starts = self._starts
+        candidates = []
+        for match in pattern.finditer(self._haystack):
+            candidates.append(bisect_right(starts, match.start()) - 1)
+            if len(candidates) >= self.MAX_RANKED:
+                break
+        candidates = set(candidates)
+        candidates.update(prefixed)
+        return self._expand(heapq.nsmallest(limit, candidates, key=self._rank_key(query)), limit)
+
+    def _expand(self, slots, limit):
+        """Item indices of ranked distinct keys, up to limit."""
+        indices = []
+        for slot in slots:
+            indices.extend(self._members[slot])
+            if len(indices) >= limit:
+                return indices[:limit]
+        return indices
+
+    def _rank_key(self, query):
+        keys = self._keys
+        word_initials = self._initials
+
+        def rank(slot):
+            key = keys[slot]
+            if key == query:
+                tier = 0
+            elif key.startswith(query):
+                tier = 1
+            elif word_initials[slot].startswith(query):
+                tier = 2
+            elif query in key:
+                tier = 3
+            else:
+                tier = 4
+            return tier, len(key), key
+        return rank
@@ -0,0 +1,633 @@
+# --- File: core/git_integration.py ---
+# Git status colours in the file tree, a changed-lines bar in the editor
+# gutter and blame of the cursor line. GitRepository does all git work
+# from worker threads: objects (HEAD / index versions of files) are read
+# through one long-lived `git cat-file --batch` process, status and blame
+# are parsed from git's porcelain output, and everything is cached until
+# HEAD or the index changes; between such changes only the paths reported
+# dirty are asked about again.
+
+import difflib
+import os
+import subprocess
+import threading
+import time
+from array import array
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, QFileSystemWatcher, Signal, Slot
+
+from core.settings import load_settings, default_settings
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# File status codes (from `git status --porcelain=v2`)
+MODIFIED, ADDED, DELETED, RENAMED, UNTRACKED, CONFLICT = "M", "A", "D", "R", "?", "U"
+
+STATUS_COLORS = {
+    MODIFIED: "#E2C08D", ADDED: "#81B88B", RENAMED: "#73C991",
+    UNTRACKED: "#73C991", CONFLICT: "#E4676B", DELETED: "#C74E39",
+}
+DIRECTORY_COLOR = "#C9B27F" # Directories holding changed files
+
+# Changed-line markers, one per line of the buffer
+LINE_UNCHANGED, LINE_ADDED, LINE_MODIFIED, LINE_DELETED_BELOW = 0, 1, 2, 3
+
+# More dirty paths than this are refreshed with one full status instead of a path list
+MAX_DIRTY_PATHS = 500
+
+def find_repository(path):
+    """(work tree root, git directory) of the repository holding path, or None."""
+    path = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return path, dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules: ".git" is a file pointing at the git directory
+            try:
+                with open(dot_git, "r", encoding="utf-8") as f:
+                    line = f.readline().strip()
+            except OSError:
+                line = ""
+            if line.startswith("gitdir:"):
+                return path, os.path.normpath(os.path.join(path, line[len("gitdir:"):].strip()))
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+# ------------------------------------------------------------------
+# 📜 PORCELAIN PARSING / LINE DIFF (pure functions)
+# ------------------------------------------------------------------
+
+def parse_status(data):
+    """{relative path: status code} from `git status --porcelain=v2 -z` output (bytes)."""
+    status = {}
+    records = data.split(b"\0")
+    i = 0
+    while i < len(records):
+        record = records[i].decode("utf-8", "surrogateescape")
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "1":
+            fields = record.split(" ", 8)
+            status[fields[8]] = _change_code(fields[1])
+        elif kind == "2":
+            fields = record.split(" ", 9)
+            status[fields[9]] = RENAMED
+            i += 1 # The original path follows in its own record
+        elif kind == "u":
+            status[record.split(" ", 10)[10]] = CONFLICT
+        elif kind == "?":
+            status[record[2:]] = UNTRACKED
+    return status
+
+def _change_code(xy):
+    index, worktree = xy[0], xy[1]
+    if index == "A":
+        return ADDED
+    if DELETED in (index, worktree):
+        return DELETED
+    return MODIFIED
+
+def parse_blame(data):
+    """
+    [(commit, author, author time, summary)] per line of the blamed
+    revision, from `git blame --porcelain` output (bytes).
+    """
+    commits = {}
+    lines = []
+    commit = None
+    final_line = 0
+    for raw in data.split(b"\n"):
+        if raw.startswith(b"\t"):
+            # Content line: closes the entry of final_line
+            info = commits[commit]
+            while len(lines) < final_line:
+                lines.append(None)
+            lines[final_line - 1] = (commit, info.get("author", ""), info.get("author-time", 0), info.get("summary", ""))
+            continue
+        line = raw.decode("utf-8", "replace")
+        fields = line.split(" ")
+        if len(fields[0]) in (40, 64) and len(fields) >= 3 and fields[1].isdigit():
+            commit = fields[0]
+            final_line = int(fields[2])
+            commits.setdefault(commit, {})
+        elif commit is not None and fields[0] in ("author", "summary"):
+            commits[commit][fields[0]] = line[len(fields[0]) + 1:]
+        elif commit is not None and fields[0] == "author-time":
+            commits[commit]["author-time"] = int(fields[1])
+    return lines
+
+def line_changes(base_text, text):
+    """
+    Compares a buffer with the version it came from, line by line.
+    Returns (markers, origin): a bytearray of LINE_* codes and an
+    array('i') of the base line each buffer line is unchanged from (-1
+    for changed lines), both indexed by buffer line.
+    """
+    base = base_text.split("\n")
+    lines = text.split("\n")
+    markers = bytearray(len(lines))
+    origin = array('i', [-1]) * len(lines)
+    # Edits are usually local: only the middle that differs goes to difflib
+    prefix = 0
+    limit = min(len(base), len(lines))
+    while prefix < limit and base[prefix] == lines[prefix]:
+        origin[prefix] = prefix
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and base[-1 - suffix] == lines[-1 - suffix]:
+        origin[len(lines) - 1 - suffix] = len(base) - 1 - suffix
+        suffix += 1
+    matcher = difflib.SequenceMatcher(None, base[prefix:len(base) - suffix], lines[prefix:len(lines) - suffix], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        i1 += prefix
+        j1 += prefix
+        j2 += prefix
+        if tag == "equal":
+            for offset in range(j2 - j1):
+                origin[j1 + offset] = i1 + offset
+        elif tag == "insert":
+            markers[j1:j2] = bytes([LINE_ADDED]) * (j2 - j1)
+        elif tag == "replace":
+            markers[j1:j2] = bytes([LINE_MODIFIED]) * (j2 - j1)
+        elif tag == "delete" and lines:
+            line = max(0, j1 - 1)
+            if not markers[line]:
+                markers[line] = LINE_DELETED_BELOW
+    return markers, origin
+
+def relative_time(timestamp, now=None):
+    seconds = max(0, int((now or time.time()) - timestamp))
+    for unit, size in (("year", 365 * 86400), ("month", 30 * 86400), ("week", 7 * 86400),
+                       ("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+    return "just now"
+
+# ------------------------------------------------------------------
+# 🌿 REPOSITORY (synchronous, used from worker threads)
+# ------------------------------------------------------------------
+
+class GitRepository:
+    """
+    One work tree. Thread-safe; every method may block on git, so call
+    them from workers. Object reads share one `git cat-file --batch`
+    process. Status, index / HEAD file versions and blame are cached for
+    the current (HEAD, index mtime) state.
+    """
+
+    def __init__(self, root, git_dir):
+        self.root = root
+        self.git_dir = git_dir
+        self._batch = None
+        self._batch_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._state = None   # (HEAD commit, index mtime) the caches belong to
+        self._status = None  # Relative path -> status code
+        self._dirty = set()  # Relative paths to ask about before status() answers again
+        self._objects = {}   # Revision spec ("HEAD:a.py", ":a.py") -> (object id, bytes) or None
+        self._blame = {}     # Relative path -> parse_blame() lines of HEAD, or None
+
+    def close(self):
+        with self._batch_lock:
+            self._stop_batch()
+
+    def relative(self, path):
+        """'/'-separated path relative to the work tree, or None for paths outside it."""
+        relative_path = os.path.relpath(os.path.abspath(path), self.root)
+        if relative_path == os.curdir or relative_path.split(os.sep)[0] == os.pardir:
+            return None
+        return relative_path.replace(os.sep, "/")
+
+    def git(self, *args):
+        """stdout of a git command run in the work tree. Raises subprocess.CalledProcessError."""
+        return subprocess.run(
+            ["git", "--no-optional-locks", *args], cwd=self.root, capture_output=True, check=True,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        ).stdout
+
+    # -------------------------------------------------------------
+    # --- Objects (git cat-file --batch)
+    # -------------------------------------------------------------
+
+    def read_object(self, spec):
+        """(object id, type, bytes) of a revision spec such as "HEAD" or "HEAD:path", or None."""
+        if "\n" in spec:
+            return None
+        with self._batch_lock:
+            for _ in range(2): # A process that died is restarted once
+                try:
+                    process = self._batch_process()
+                    process.stdin.write(spec.encode("utf-8", "surrogateescape") + b"\n")
+                    process.stdin.flush()
+                    header = process.stdout.readline()
+                    if not header:
+                        raise OSError("git cat-file exited")
+                    if header.endswith((b" missing\n", b" ambiguous\n")):
+                        return None
+                    object_id, kind, size = header.split()
+                    data = process.stdout.read(int(size) + 1)[:-1]
+                    return object_id.decode(), kind.decode(), data
+                except (OSError, ValueError) as e:
+                    Debug(f"DEBUG: git cat-file failed: {e}")
+                    self._stop_batch()
+        return None
+
+    def _batch_process(self):
+        if self._batch is None or self._batch.poll() is not None:
+            self._batch = subprocess.Popen(
+                ["git", "cat-file", "--batch"], cwd=self.root,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        return self._batch
+
+    def _stop_batch(self):
+        if self._batch is not None:
+            try:
+                self._batch.stdin.close()
+            except OSError:
+                pass
+            self._batch.kill()
+            self._batch.wait()
+            self._batch = None
+
+    # -------------------------------------------------------------
+    # --- Cached state
+    # -------------------------------------------------------------
+
+    def state(self):
+        try:
+            index_mtime = os.stat(os.path.join(self.git_dir, "index")).st_mtime_ns
+        except OSError:
+            index_mtime = 0
+        if self._state is not None and index_mtime != self._state[1]:
+            # cat-file reads the index once: a new one needs a new process
+            with self._batch_lock:
+                self._stop_batch()
+        head = self.read_object("HEAD")
+        return (head[0] if head else None), index_mtime
+
+    def refresh_state(self):
+        """Drops every cache if HEAD moved or the index was written. Returns True if it did."""
+        state = self.state()
+        with self._cache_lock:
+            if state == self._state:
+                return False
+            self._state = state
+            self._status = None
+            self._dirty.clear()
+            self._objects.clear()
+            self._blame.clear()
+            return True
+
+    def mark_dirty(self, relative_paths):
+        """Files (or whole directories) changed in the work tree: their status is asked for again."""
+        with self._cache_lock:
+            self._dirty.update(relative_paths)
+
+    def status(self):
+        """{relative path: status code} of every changed or untracked file."""
+        self.refresh_state()
+        with self._cache_lock:
+            status, dirty = self._status, self._dirty
+            self._dirty = set()
+        command = ["status", "--porcelain=v2", "-z", "--untracked-files=all"]
+        if status is None or len(dirty) > MAX_DIRTY_PATHS:
+            status = parse_status(self.git(*command))
+        elif dirty:
+            fresh = parse_status(self.git("--literal-pathspecs", *command, "--", *sorted(dirty)))
+            prefixes = tuple(relative_path + "/" for relative_path in dirty)
+            status = {path: code for path, code in status.items() if path not in dirty and not path.startswith(prefixes)}
+            status.update(fresh)
+        with self._cache_lock:
+            self._status = status
+        return status
+
+    def file_version(self, revision, relative_path):
+        """(object id, text) of a file in a revision ("HEAD", or "" for the index), or None."""
+        spec = f"{revision}:{relative_path}"
+        with self._cache_lock:
+            if spec in self._objects:
+                return self._objects[spec]
+        found = self.read_object(spec)
+        version = None
+        if found is not None and found[1] == "blob":
+            version = (found[0], found[2].decode("utf-8", "replace").replace("\r\n", "\n"))
+        with self._cache_lock:
+            self._objects[spec] = version
+        return version
+
+    def blame(self, relative_path):
+        """parse_blame() lines of the file in HEAD, or None if HEAD does not have it."""
+        with self._cache_lock:
+            if relative_path in self._blame:
+                return self._blame[relative_path]
+        try:
+            lines = parse_blame(self.git("blame", "--porcelain", "HEAD", "--", relative_path))
+        except subprocess.CalledProcessError:
+            lines = None
+        with self._cache_lock:
+            self._blame[relative_path] = lines
+        return lines
+
+# ------------------------------------------------------------------
+# 🧵 GIT WORKERS (Run in a separate thread)
+# ------------------------------------------------------------------
+
+class GitWorkerSignals(QObject):
+    """Signals available from the git workers."""
+    finished = Signal(int, object) # Generation, result (None if git failed)
+
+class GitStatusWorker(QRunnable):
+    """Status of the repository as tree colours: {absolute path: colour} for files and their directories."""
+
+    def __init__(self, generation, repository):
+        super().__init__()
+        self.signals = GitWorkerSignals()
+        self.generation = generation
+        self.repository = repository
+
+    @Slot()
+    def run(self):
+        repository = self.repository
+        result = None
+        try:
+            state_changed = repository.refresh_state()
+            colors = {}
+            for relative_path, code in repository.status().items():
+                path = os.path.join(repository.root, *relative_path.split("/"))
+                colors[path] = STATUS_COLORS[code]
+                directory = os.path.dirname(path)
+                while len(directory) > len(repository.root) and directory not in colors:
+                    colors[directory] = DIRECTORY_COLOR
+                    directory = os.path.dirname(directory)
+            result = {"colors": colors, "state_changed": state_changed}
+        except (OSError, subprocess.CalledProcessError) as e:
+            Debug(f"DEBUG: git status in {repository.root} failed: {e}")
+        self.signals.finished.emit(self.generation, result)
+
+class GitDiffWorker(QRunnable):
+    """
+    Changed lines of a buffer against the index version of its file, and
+    (with blame) the HEAD blame lines and which of them each buffer line is.
+    """
+
+    def __init__(self, generation, repository, relative_path, text, with_blame):
+        super().__init__()
+        self.signals = GitWorkerSignals()
+        self.generation = generation
+        self.repository = repository
+        self.relative_path = relative_path
+        self.text = text
+        self.with_blame = with_blame
+
+    @Slot()
+    def run(self):
+        repository = self.repository
+        result = None
+        try:
+            base = repository.file_version("", self.relative_path)
+            markers = None
+            origin = None
+            if base is not None:
+                markers, origin = line_changes(base[1], self.text)
+            blame = None
+            if self.with_blame:
+                head = repository.file_version("HEAD", self.relative_path)
+                blame = repository.blame(self.relative_path) if head is not None else None
+                if blame is not None and head[0] != (base[0] if base else None):
+                    origin = line_changes(head[1], self.text)[1] # Staged changes: map onto HEAD instead
+            result = {"markers": markers, "origin": origin, "blame": blame}
+        except (OSError, subprocess.CalledProcessError) as e:
+            Debug(f"DEBUG: git diff of {self.relative_path} failed: {e}")
+        self.signals.finished.emit(self.generation, result)
+
+# ------------------------------------------------------------------
+# 📄 OPEN DOCUMENT
+# ------------------------------------------------------------------
+
+class GitDocument(QObject):
+    """
+    Keeps the gutter markers and the cursor line's blame of one tab
+    current: the buffer is compared again DIFF_DELAY_MS after an edit.
+    """
+    DIFF_DELAY_MS = 300
+
+    def __init__(self, integration, editor, relative_path):
+        super().__init__(editor)
+        self.integration = integration
+        self.editor = editor
+        self.relative_path = relative_path
+        self.with_blame = load_settings().get("git_inline_blame", default_settings["git_inline_blame"])
+        self._generation = 0
+        self._worker = None # Kept alive until its result is delivered
+        self._origin = None
+        self._blame = None
+
+        self._diff_timer = QTimer(self)
+        self._diff_timer.setSingleShot(True)
+        self._diff_timer.timeout.connect(self.refresh)
+        editor.document().contentsChanged.connect(self._on_edited)
+        editor.cursorPositionChanged.connect(self._show_blame)
+        editor.loading_finished.connect(self.refresh)
+        self.refresh()
+
+    def close(self):
+        self._generation += 1
+        self._diff_timer.stop()
+        self.editor.document().contentsChanged.disconnect(self._on_edited)
+        self.editor.cursorPositionChanged.disconnect(self._show_blame)
+        self.editor.loading_finished.disconnect(self.refresh)
+        self.editor.set_diff_markers(None)
+        self.editor.set_line_annotation(-1, "")
+
+    def refresh(self):
+        if self.editor.is_loading():
+            return # loading_finished calls again
+        self._generation += 1
+        self._worker = GitDiffWorker(self._generation, self.integration.repository, self.relative_path,
+                                     self.editor.toPlainText(), self.with_blame)
+        self._worker.signals.finished.connect(self._on_diffed)
+        QThreadPool.globalInstance().start(self._worker)
+
+    def _on_edited(self):
+        if self.editor.is_loading():
+            return
+        self._generation += 1 # A diff still running compared older text
+        self._origin = None   # Line numbers moved: no blame until the next diff
+        self.editor.set_line_annotation(-1, "")
+        self._diff_timer.start(self.DIFF_DELAY_MS)
+
+    def _on_diffed(self, generation, result):
+        if generation != self._generation:
+            return
+        self._worker = None
+        if result is None:
+            return
+        self.editor.set_diff_markers(result["markers"])
+        self._origin = result["origin"]
+        self._blame = result["blame"]
+        self._show_blame()
+
+    def _show_blame(self):
+        if not self.with_blame:
+            return
+        line = self.editor.textCursor().blockNumber()
+        text = ""
+        if self._origin is not None and self._blame is not None and line < len(self._origin):
+            head_line = self._origin[line]
+            entry = self._blame[head_line] if 0 <= head_line < len(self._blame) else None
+            if head_line < 0:
+                text = "Uncommitted changes"
+            elif entry is not None:
+                commit, author, author_time, summary = entry
+                text = f"{author}, {relative_time(author_time)} • {summary}"
+        self.editor.set_line_annotation(line, text)
+
+# ------------------------------------------------------------------
+# 🌿 GIT INTEGRATION (UI side)
+# ------------------------------------------------------------------
+
+class GitIntegration(QObject):
+    """
+    Git for the project folder: colours the FileManager tree by status and
+    attaches a GitDocument to every tab of a file in the repository. Saves
+    and the file tree's change batches mark paths dirty; the git directory
+    is watched for commits, checkouts and staging.
+    """
+    status_message = Signal(str)
+
+    STATUS_DELAY_MS = 300 # Changes are folded into one status refresh after this pause
+
+    def __init__(self, editor, file_manager, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.file_manager = file_manager
+        self.repository = None
+        self.documents = {} # Tab widget -> GitDocument
+        self._generation = 0
+        self._status_worker = None # Running status refresh (only one at a time)
+        self._status_wanted = False
+        self._failed = False
+
+        self._git_dir_watcher = QFileSystemWatcher(self)
+        self._git_dir_watcher.directoryChanged.connect(self._schedule_status)
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.timeout.connect(self._refresh_status)
+
+        editor.editor_opened.connect(self.attach)
+        editor.editor_closed.connect(self.detach)
+        editor.file_saved.connect(self.notify_changed)
+        file_manager.paths_changed.connect(self.notify_paths_changed)
+        file_manager.directories_changed.connect(self.notify_paths_changed)
+
+    def set_root(self, root):
+        """Project folder: finds its repository (if any) and starts over."""
+        for widget in list(self.documents):
+            self.detach(widget)
+        if self.repository is not None:
+            self.repository.close()
+        watched = self._git_dir_watcher.directories()
+        if watched:
+            self._git_dir_watcher.removePaths(watched)
+        self._generation += 1
+        self.file_manager.model.set_path_colors({})
+
+        enabled = load_settings().get("git_integration", default_settings["git_integration"])
+        found = find_repository(root) if enabled and root else None
+        self.repository = GitRepository(*found) if found else None
+        if self.repository is None:
+            return
+        self._git_dir_watcher.addPath(self.repository.git_dir)
+        self._refresh_status()
+        for i in range(self.editor.count()):
+            self.attach(self.editor.widget(i))
+
+    def shutdown(self):
+        if self.repository is not None:
+            self.repository.close()
+
+    def attach(self, editor):
+        if self.repository is None or editor in self.documents or not hasattr(editor, "set_diff_markers"):
+            return
+        path = editor.get_file_path()
+        relative_path = self.repository.relative(path) if path else None
+        if relative_path is not None:
+            self.documents[editor] = GitDocument(self, editor, relative_path)
+
+    def detach(self, editor):
+        document = self.documents.pop(editor, None)
+        if document is not None:
+            document.close()
+            document.deleteLater()
+
+    def notify_changed(self, path):
+        """A file in the work tree was saved, created or deleted."""
+        self.notify_paths_changed([path])
+
+    def notify_paths_changed(self, paths):
+        if self.repository is None:
+            return
+        relative_paths = [relative_path for relative_path in map(self.repository.relative, paths) if relative_path]
+        if relative_paths:
+            self.repository.mark_dirty(relative_paths)
+            self._schedule_status()
+        # A tab saved under a new name (Save As) starts being tracked
+        for i in range(self.editor.count()):
+            widget = self.editor.widget(i)
+            document = self.documents.get(widget)
+            if document is not None and self.repository.relative(widget.get_file_path()) != document.relative_path:
+                self.detach(widget)
+            self.attach(widget)
+
+    def _schedule_status(self, *_):
+        if self.repository is not None:
+            self._status_timer.start(self.STATUS_DELAY_MS)
+
+    def _refresh_status(self):
+        if self._status_worker is not None:
+            self._status_wanted = True
+            return
+        self._status_worker = GitStatusWorker(self._generation, self.repository)
+        self._status_worker.signals.finished.connect(self._on_status)
+        QThreadPool.globalInstance().start(self._status_worker)
+
+    def _on_status(self, generation, result):
+        self._status_worker = None
+        if generation != self._generation:
+            if self.repository is not None:
+                self._refresh_status() # Finished for the previous root; the new one still needs one
+            return
+        if result is None:
+            if not self._failed:
+                self._failed = True
+                self.status_message.emit("Git: status could not be read (is git installed?).")
+        else:
+            self._failed = False
+            self.file_manager.model.set_path_colors(result["colors"])
+            if result["state_changed"]:
+                # New HEAD or index: every tab compares against new versions
+                for document in self.documents.values():
+                    document.refresh()
+        if self._status_wanted:
+            self._status_wanted = False
+            self._schedule_status()
@@ -0,0 +1,189 @@
+# --- File: core/hibernation.py ---
+# Frees the documents of clean background tabs. A hibernated tab is a
+# lightweight placeholder that Editor swaps back for a real editor (reloaded
+# from disk) as soon as the tab is selected again.
+
+import time
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Signal, QObject, QTimer, QFileInfo
+
+from core.settings import load_settings, default_settings
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# Rough per-line cost of a QTextDocument block: block data, text layout and
+# highlighter spans, on top of the UTF-16 text itself
+BLOCK_OVERHEAD_BYTES = 200
+
+def estimate_memory(editor):
+    """Approximate bytes held by a CodeEditorCore's document."""
+    document = editor.document()
+    return document.characterCount() * 2 + document.blockCount() * BLOCK_OVERHEAD_BYTES
+
+# ------------------------------------------------------------------
+# 💤 HIBERNATED TAB (placeholder widget)
+# ------------------------------------------------------------------
+
+class HibernatedTab(QWidget):
+    """
+    Stands in for a clean CodeEditorCore whose document was dropped.
+    Keeps only what is needed to bring the tab back as it was.
+    """
+
+    # Same interface as CodeEditorCore so Editor/GW can treat tabs alike
+    document_title_changed = Signal(str)
+    cursorPositionChanged = Signal()
+
+    def __init__(self, path, cursor_position, scroll_position, reclaimed_bytes, parent=None):
+        super().__init__(parent)
+        self._file_path = path
+        self._title = QFileInfo(path).fileName()
+        self.cursor_position = cursor_position
+        self.scroll_position = scroll_position # (horizontal, vertical) scroll bar values
+        self.reclaimed_bytes = reclaimed_bytes
+
+    def get_tab_title(self):
+        return self._title
+
+    def get_file_path(self):
+        return self._file_path
+
+    def get_default_filename(self):
+        return self._title
+
+    def set_file_path(self, path):
+        self._file_path = path
+        self._title = QFileInfo(path).fileName()
+
+    def is_modified(self):
+        return False # Only clean tabs are hibernated
+
+    def is_loading(self):
+        return False
+
+    def is_hibernated(self):
+        return True
+
+    def save_file(self, path=None, quiet=False):
+        # The file on disk is the whole document
+        return True
+
+# ------------------------------------------------------------------
+# 🛏️ HIBERNATION MANAGER
+# ------------------------------------------------------------------
+
+class HibernationManager(QObject):
+    """
+    Periodically hibernates clean background tabs of an Editor that have
+    been idle for "hibernate_idle_minutes", and the least recently used
+    ones first whenever open documents exceed "memory_budget_mb".
+    """
+    reclaimed_changed = Signal(int, int) # Hibernated tab count, bytes reclaimed
+
+    CHECK_INTERVAL_MS = 30000
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self._last_active = {} # Tab widget -> time.monotonic() it was last shown
+        self._current = editor.currentWidget()
+
+        editor.editor_opened.connect(self._on_editor_opened)
+        editor.editor_closed.connect(self._on_editor_closed)
+        editor.currentChanged.connect(self._on_current_changed)
+        editor.tab_hibernation_changed.connect(self._report)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.check)
+        self._timer.start(self.CHECK_INTERVAL_MS)
+
+    def _on_editor_opened(self, widget):
+        self._last_active[widget] = time.monotonic()
+        # A new document may have pushed us over the budget
+        QTimer.singleShot(0, self.check)
+
+    def _on_editor_closed(self, widget):
+        self._last_active.pop(widget, None)
+        if widget is self._current:
+            self._current = None
+        self._report()
+
+    def _on_current_changed(self, index):
+        now = time.monotonic()
+        if self._current is not None and self._current in self._last_active:
+            self._last_active[self._current] = now
+        self._current = self.editor.widget(index)
+        if self._current is not None:
+            self._last_active[self._current] = now
+
+    def _candidates(self):
+        """Clean, loaded editor tabs that are not on screen, least recently used first."""
+        current = self.editor.currentWidget()
+        tabs = []
+        for i in range(self.editor.count()):
+            widget = self.editor.widget(i)
+            if widget is current or not hasattr(widget, "document"):
+                continue # Placeholders and large file views have no document to drop
+            if widget.is_modified() or widget.is_loading() or widget.get_file_path() is None:
+                continue
+            tabs.append(widget)
+        tabs.sort(key=lambda widget: self._last_active.get(widget, 0))
+        return tabs
+
+    def check(self):
+        """Hibernates idle tabs, then more until the memory budget is met."""
+        settings = load_settings()
+        idle_minutes = settings.get("hibernate_idle_minutes", default_settings["hibernate_idle_minutes"])
+        budget = settings.get("memory_budget_mb", default_settings["memory_budget_mb"]) * 1024 * 1024
+
+        now = time.monotonic()
+        candidates = self._candidates()
+        remaining = []
+        for widget in candidates:
+            idle = now - self._last_active.get(widget, now)
+            if idle_minutes > 0 and idle >= idle_minutes * 60:
+                self._hibernate(widget)
+            else:
+                remaining.append(widget)
+
+        if budget > 0:
+            in_use = sum(
+                estimate_memory(self.editor.widget(i))
+                for i in range(self.editor.count())
+                if hasattr(self.editor.widget(i), "document")
+            )
+            for widget in remaining:
+                if in_use <= budget:
+                    break
+                in_use -= self._hibernate(widget)
+
+    def _hibernate(self, widget):
+        reclaimed = estimate_memory(widget)
+        index = self.editor.indexOf(widget)
+        if index == -1 or not self.editor.hibernate_tab(index, reclaimed):
+            return 0
+        Debug(f"DEBUG: Hibernated {widget.get_file_path()} (~{reclaimed} bytes)")
+        return reclaimed
+
+    def _report(self):
+        count = 0
+        reclaimed = 0
+        for i in range(self.editor.count()):
+            widget = self.editor.widget(i)
+            if hasattr(widget, "is_hibernated"):
+                count += 1
+                reclaimed += widget.reclaimed_bytes
+        self.reclaimed_changed.emit(count, reclaimed)
@@ -0,0 +1,313 @@
+# --- File: core/journal.py ---
+# Crash recovery: every edited document appends its contentsChange deltas to
+# a swap file under core/user_data/journal. Clean saves and closes delete it,
+# so whatever is left at startup belongs to a session that did not exit cleanly
+# (unless the process named in its file name is still running: another instance).
+
+import json
+import os
+import uuid
+
+from PySide6.QtCore import QObject
+from PySide6.QtGui import QTextCursor
+
+from core.settings import USER_DATA_DIR
+from core.file_io import write_atomic
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+JOURNAL_DIR = os.path.join(USER_DATA_DIR, "journal")
+JOURNAL_VERSION = 1
+
+# Rewrite a journal as a snapshot once it is this large and bigger than the text itself
+COMPACT_MIN_BYTES = 256 * 1024
+
+# QTextDocument separates blocks with U+2029 in selectedText()
+PARAGRAPH_SEPARATOR = "\u2029"
+
+# ------------------------------------------------------------------
+# 📓 DOCUMENT JOURNAL
+# ------------------------------------------------------------------
+
+class DocumentJournal(QObject):
+    """
+    Append-only journal of one CodeEditorCore's edits.
+
+    The first line is a JSON header naming the base the edits apply to:
+    the file on disk ("disk", with its size and mtime), an empty buffer
+    ("empty") or a full copy of the text ("snapshot"). Every following
+    line is one [position, chars_removed, added_text] delta, so a
+    keystroke costs a few bytes no matter how large the file is.
+    """
+
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+        self.document = editor.document()
+        self.path = None  # Journal file, created on the first edit
+        self._file = None
+        self._bytes = 0
+        self._revision = self.document.revision()
+
+        self.document.contentsChange.connect(self._on_contents_change)
+        editor.save_finished.connect(self._on_save_finished)
+        editor.loading_finished.connect(self._on_loading_finished)
+
+        if editor.is_modified():
+            self._start() # Already dirty (e.g. a recovered buffer): start from a snapshot
+
+    # -------------------------------------------------------------
+    # --- Recording
+    # -------------------------------------------------------------
+
+    def _on_contents_change(self, position, removed, added):
+        revision = self.document.revision()
+        if revision == self._revision:
+            return # Highlighter format updates, the text did not change
+        self._revision = revision
+        if self.editor.is_loading():
+            return # Streamed-in file content, the disk already has it
+
+        if self._file is None:
+            # The document was clean right before this edit, i.e. equal to the disk
+            self._start(pending_edit=True)
+
+        end = min(position + added, self.document.characterCount() - 1)
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(position)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        text = cursor.selectedText().replace(PARAGRAPH_SEPARATOR, "\n")
+        self._append(json.dumps([position, removed, text], ensure_ascii=False))
+
+        if self._bytes > COMPACT_MIN_BYTES and self._bytes > 2 * self.document.characterCount():
+            self.compact()
+
+    def _on_loading_finished(self):
+        # Streamed chunks go in with signals blocked, catch up with their revisions
+        self._revision = self.document.revision()
+
+    def _start(self, pending_edit=False):
+        """Opens a new journal. pending_edit: the current change is not in the base yet."""
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        # The owning process id comes first, so other instances leave live journals alone
+        self.path = os.path.join(JOURNAL_DIR, f"{os.getpid()}-{uuid.uuid4().hex}.journal")
+        file_path = self.editor.get_file_path()
+        header = {"version": JOURNAL_VERSION, "path": file_path, "title": self.editor.get_default_filename()}
+
+        if not pending_edit:
+            header["base"] = "snapshot"
+            header["text"] = self.editor.toPlainText()
+        elif file_path:
+            try:
+                stat = os.stat(file_path)
+                header.update(base="disk", size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            except OSError:
+                header["base"] = "empty"
+        else:
+            header["base"] = "empty"
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._bytes = 0
+        self._append(json.dumps(header, ensure_ascii=False))
+
+    def _append(self, line):
+        # Flushed right away so the OS has it even if the process dies next
+        self._file.write(line + "\n")
+        self._file.flush()
+        self._bytes += len(line) + 1
+
+    def compact(self):
+        """Replaces the deltas with a snapshot of the current text."""
+        if self._file is None:
+            return
+        header = {
+            "version": JOURNAL_VERSION,
+            "path": self.editor.get_file_path(),
+            "title": self.editor.get_default_filename(),
+            "base": "snapshot",
+            "text": self.editor.toPlainText(),
+        }
+        self._file.close()
+        line = json.dumps(header, ensure_ascii=False) + "\n"
+        write_atomic(self.path, line)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._bytes = len(line)
+        Debug(f"DEBUG: Compacted journal {self.path}")
+
+    # -------------------------------------------------------------
+    # --- Lifetime
+    # -------------------------------------------------------------
+
+    def _on_save_finished(self, path, success):
+        if not success or self._file is None:
+            return
+        if self.editor.is_modified():
+            # Edited again while the save was in flight: keep only what is unsaved
+            self.compact()
+        else:
+            self.discard()
+
+    def discard(self):
+        """Deletes the journal: the document was saved, or closed on purpose."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+        self._bytes = 0
+
+# ------------------------------------------------------------------
+# 🗂️ JOURNAL SERVICE
+# ------------------------------------------------------------------
+
+class JournalService(QObject):
+    """Keeps a DocumentJournal on every editable tab of an Editor."""
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self._journals = {} # Tab widget -> DocumentJournal
+
+        editor.editor_opened.connect(self.track)
+        editor.editor_closed.connect(self.untrack)
+        for i in range(editor.count()):
+            self.track(editor.widget(i))
+
+    def track(self, widget):
+        if hasattr(widget, "document"):
+            self._journals[widget] = DocumentJournal(widget)
+
+    def untrack(self, widget):
+        journal = self._journals.pop(widget, None)
+        if journal is not None:
+            journal.discard()
+
+    def discard_all(self):
+        """Called on a clean exit."""
+        for journal in self._journals.values():
+            journal.discard()
+
+# ------------------------------------------------------------------
+# ♻️ RECOVERY
+# ------------------------------------------------------------------
+
+class JournalError(Exception):
+    pass
+
+def find_journals():
+    """Paths of journals left behind by sessions that did not exit cleanly (not those of running instances)."""
+    if not os.path.isdir(JOURNAL_DIR):
+        return []
+    journals = []
+    for name in os.listdir(JOURNAL_DIR):
+        if not name.endswith(".journal"):
+            continue
+        owner = name.split("-", 1)[0]
+        if "-" in name and owner.isdigit() and _process_alive(int(owner)):
+            continue
+        journals.append(os.path.join(JOURNAL_DIR, name))
+    return sorted(journals)
+
+def _process_alive(pid):
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows: ask for its exit code instead
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        alive = kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)) and exit_code.value == STILL_ACTIVE
+        kernel32.CloseHandle(handle)
+        return bool(alive)
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        return True # Exists, owned by someone else
+    except OSError:
+        return False
+    return True
+
+def read_journal(journal_path):
+    """
+    Returns (header, edits). A torn last line (crash mid-write) is dropped.
+    Raises JournalError if the header is unreadable.
+    """
+    with open(journal_path, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.read().split("\n")
+    try:
+        header = json.loads(lines[0])
+    except (ValueError, IndexError) as e:
+        raise JournalError(f"Unreadable journal header: {e}")
+    if header.get("version") != JOURNAL_VERSION:
+        raise JournalError(f"Unsupported journal version {header.get('version')}")
+
+    edits = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        try:
+            edits.append(json.loads(line))
+        except ValueError:
+            break
+    return header, edits
+
+def journal_base_text(header):
+    """The text the journal's edits apply to. Raises JournalError if it is gone."""
+    base = header.get("base")
+    if base == "snapshot":
+        return header.get("text", "")
+    if base == "empty":
+        return ""
+    if base == "disk":
+        path = header.get("path")
+        try:
+            stat = os.stat(path)
+            if stat.st_size != header.get("size") or stat.st_mtime_ns != header.get("mtime_ns"):
+                raise JournalError(f"{path} changed on disk since the edits were made")
+            with open(path, "r", encoding="utf-8", newline=None) as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise JournalError(f"Cannot read {path}: {e}")
+    raise JournalError(f"Unknown journal base {base!r}")
+
+def replay_journal(document, edits):
+    """Applies the recorded deltas to a document holding the base text, as one undo step."""
+    cursor = QTextCursor(document)
+    cursor.beginEditBlock()
+    try:
+        for position, removed, text in edits:
+            last = document.characterCount() - 1
+            if position > last:
+                raise JournalError(f"Edit at {position} is past the end of the document")
+            cursor.setPosition(position)
+            cursor.setPosition(min(position + removed, last), QTextCursor.KeepAnchor)
+            cursor.insertText(text)
+    finally:
+        cursor.endEditBlock()
+
+def remove_journal(journal_path):
+    try:
+        os.remove(journal_path)
+    except OSError:
+        pass
@@ -0,0 +1,313 @@
+# --- File: core/large_file.py ---
+# Read-only, memory-mapped viewer used by Editor for files above the
+# "large_file_threshold_mb" setting. Only the visible lines are ever decoded.
+
+import mmap
+import os
+import re
+from array import array
+
+from PySide6.QtWidgets import QAbstractScrollArea
+from PySide6.QtGui import QPainter, QColor, QFont
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QFileInfo, Slot
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# Same palette as the regular editor (see COLORS in core/editor.py)
+BACKGROUND = "#1E1E1E"
+FOREGROUND = "#D4D4D4"
+GUTTER_TEXT = "#5c6370"
+
+# Longest slice of a single line that is decoded for painting
+MAX_LINE_BYTES = 16384
+
+# ------------------------------------------------------------------
+# 🧵 LINE INDEX WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class LineIndexWorkerSignals(QObject):
+    """Signals available from the line index worker."""
+    progress = Signal(int, int) # Lines indexed so far, bytes scanned
+    finished = Signal()
+
+class LineIndexWorker(QRunnable):
+    """
+    Scans a memory-mapped file for newlines and appends the start offset of
+    every line to a shared array, so the viewer can use the index while it
+    is still being built.
+    """
+    CHUNK_SIZE = 8 * 1024 * 1024
+    NEWLINE = re.compile(b"\n")
+
+    def __init__(self, data, offsets):
+        super().__init__()
+        self.signals = LineIndexWorkerSignals()
+        self.data = data
+        self.offsets = offsets
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self):
+        size = len(self.data)
+        pos = 0
+        try:
+            while pos < size and not self._cancelled:
+                end = min(size, pos + self.CHUNK_SIZE)
+                chunk = self.data[pos:end]
+                self.offsets.extend([pos + m.end() for m in self.NEWLINE.finditer(chunk)])
+                pos = end
+                self.signals.progress.emit(len(self.offsets), pos)
+        except ValueError:
+            # The mapping was closed under us (tab closed while indexing)
+            return
+        if not self._cancelled:
+            self.signals.finished.emit()
+
+# ------------------------------------------------------------------
+# 📜 LARGE FILE VIEWER
+# ------------------------------------------------------------------
+
+class LargeFileViewer(QAbstractScrollArea):
+    """
+    Virtualized read-only view over a memory-mapped file.
+    The vertical scroll bar works in lines, so go-to-line and scrolling
+    cost the same for a 1 KB file and for a file with millions of lines.
+    """
+
+    # Same interface as CodeEditorCore so Editor/GW can treat tabs alike
+    document_title_changed = Signal(str)
+    cursorPositionChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._file_path = None
+        self._title = "Untitled"
+        self._file = None
+        self._data = None
+        self._size = 0
+        self._offsets = array('Q', [0])
+        self._indexed = False
+        self._index_percent = 0
+        self._worker = None
+        self._pending_line = None
+        self._max_columns = 0
+
+        font = QFont("Monospace", 10)
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.viewport().setAutoFillBackground(False)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setStyleSheet(f"QAbstractScrollArea {{ background-color: {BACKGROUND}; border: 1px solid {BACKGROUND}; }}")
+
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    # -------------------------------------------------------------
+    # --- Interface shared with CodeEditorCore
+    # -------------------------------------------------------------
+
+    def get_tab_title(self):
+        if not self._indexed:
+            return f"{self._title} (indexing {self._index_percent}%)"
+        return f"{self._title} (read-only)"
+
+    def get_file_path(self):
+        return self._file_path
+
+    def get_default_filename(self):
+        return self._title
+
+    def set_file_path(self, path):
+        self._file_path = path
+        self._title = QFileInfo(path).fileName()
+        self.document_title_changed.emit(self.get_tab_title())
+
+    def is_modified(self):
+        return False # Read-only, never dirty
+
+    def is_loading(self):
+        return False # The line index builds in the background but the view is usable
+
+    def save_file(self, path=None):
+        # Nothing to write back, the file on disk is the buffer
+        return True
+
+    def current_line(self):
+        """1-indexed number of the top visible line."""
+        return self.verticalScrollBar().value() + 1
+
+    def line_count(self):
+        return len(self._offsets)
+
+    # -------------------------------------------------------------
+    # --- File handling
+    # -------------------------------------------------------------
+
+    def load_file_content(self, path):
+        """Maps the file and starts indexing it in the background."""
+        try:
+            self._file = open(path, "rb")
+            self._size = os.fstat(self._file.fileno()).st_size
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            Debug(f"DEBUG: Failed to map large file {path}: {e}")
+            self.close_file()
+            return False
+
+        self._file_path = path
+        self._title = QFileInfo(path).fileName()
+        # 4-byte offsets are enough below 4 GB and halve the index size
+        self._offsets = array('I' if self._size < 2 ** 32 else 'Q', [0])
+
+        self._worker = LineIndexWorker(self._data, self._offsets)
+        self._worker.signals.progress.connect(self._on_index_progress)
+        self._worker.signals.finished.connect(self._on_index_finished)
+        QThreadPool.globalInstance().start(self._worker)
+
+        Debug(f"DEBUG: Opened {path} ({self._size} bytes) in large file mode.")
+        self.document_title_changed.emit(self.get_tab_title())
+        return True
+
+    def close_file(self):
+        """Stops indexing and releases the mapping (called when the tab closes)."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _on_index_progress(self, lines, scanned):
+        self._index_percent = int(scanned * 100 / self._size) if self._size else 100
+        self._update_scroll_range()
+        if self._pending_line is not None and self._pending_line <= lines:
+            self.go_to_line(self._pending_line)
+        self.document_title_changed.emit(self.get_tab_title())
+
+    def _on_index_finished(self):
+        self._indexed = True
+        self._worker = None
+        self._update_scroll_range()
+        if self._pending_line is not None:
+            self.go_to_line(min(self._pending_line, self.line_count()))
+        Debug(f"DEBUG: Indexed {self.line_count()} lines of {self._file_path}.")
+        self.document_title_changed.emit(self.get_tab_title())
+
+    # -------------------------------------------------------------
+    # --- Navigation
+    # -------------------------------------------------------------
+
+    def go_to_line(self, line):
+        """Scrolls so that the 1-indexed line is at the top of the view."""
+        if line > self.line_count() and not self._indexed:
+            # Not indexed yet: jump there as soon as the index reaches it
+            self._pending_line = line
+            line = self.line_count()
+        else:
+            self._pending_line = None
+        self.verticalScrollBar().setValue(max(0, line - 1))
+
+    def _visible_rows(self):
+        return max(1, self.viewport().height() // self.fontMetrics().height())
+
+    def _update_scroll_range(self):
+        rows = self._visible_rows()
+        bar = self.verticalScrollBar()
+        bar.setRange(0, max(0, self.line_count() - 1))
+        bar.setPageStep(rows)
+        bar.setSingleStep(1)
+        self.viewport().update()
+
+    def _on_scrolled(self, _):
+        self.viewport().update()
+        self.cursorPositionChanged.emit()
+
+    def keyPressEvent(self, event):
+        bar = self.verticalScrollBar()
+        key = event.key()
+        if key == Qt.Key_Down:
+            bar.setValue(bar.value() + 1)
+        elif key == Qt.Key_Up:
+            bar.setValue(bar.value() - 1)
+        elif key == Qt.Key_PageDown:
+            bar.setValue(bar.value() + bar.pageStep())
+        elif key == Qt.Key_PageUp:
+            bar.setValue(bar.value() - bar.pageStep())
+        elif key == Qt.Key_Home and event.modifiers() & Qt.ControlModifier:
+            bar.setValue(0)
+        elif key == Qt.Key_End and event.modifiers() & Qt.ControlModifier:
+            bar.setValue(bar.maximum())
+        else:
+            super().keyPressEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_range()
+
+    def scrollContentsBy(self, dx, dy):
+        # Nothing is cached on screen, just repaint the new window
+        self.viewport().update()
+
+    # -------------------------------------------------------------
+    # --- Painting (only the visible window is read and decoded)
+    # -------------------------------------------------------------
+
+    def _line_text(self, number):
+        """Decodes the 0-indexed line, limited to MAX_LINE_BYTES."""
+        offsets = self._offsets
+        start = offsets[number]
+        end = offsets[number + 1] if number + 1 < len(offsets) else self._size
+        raw = self._data[start:min(end, start + MAX_LINE_BYTES)]
+        return raw.rstrip(b"\r\n").decode("utf-8", "replace").expandtabs(4)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), QColor(BACKGROUND))
+        if self._data is None:
+            return
+
+        metrics = self.fontMetrics()
+        line_height = metrics.height()
+        ascent = metrics.ascent()
+        char_width = metrics.horizontalAdvance('0')
+
+        first = self.verticalScrollBar().value()
+        last = min(self.line_count(), first + self._visible_rows() + 1)
+        gutter = char_width * len(str(last)) + 16
+        x_offset = self.horizontalScrollBar().value()
+
+        y = 0
+        for number in range(first, last):
+            text = self._line_text(number)
+            if len(text) > self._max_columns:
+                self._max_columns = len(text)
+
+            painter.setPen(QColor(FOREGROUND))
+            painter.drawText(gutter - x_offset, y + ascent, text)
+
+            # Gutter is drawn on top so it stays put when scrolling sideways
+            painter.fillRect(0, y, gutter - 8, line_height, QColor(BACKGROUND))
+            painter.setPen(QColor(GUTTER_TEXT))
+            painter.drawText(0, y, gutter - 12, line_height, Qt.AlignRight, str(number + 1))
+            y += line_height
+
+        bar = self.horizontalScrollBar()
+        bar.setRange(0, max(0, self._max_columns * char_width + gutter - self.viewport().width()))
+        bar.setPageStep(self.viewport().width())
@@ -0,0 +1,658 @@
+# --- File: core/lsp_client.py ---
+# Language Server Protocol client. A server is started per command and
+# project root over stdio (QProcess, so nothing ever waits on it), and open
+# CodeEditorCore tabs are kept in sync with incremental didChange deltas.
+# Diagnostics are shown as squiggles, hovers as tool tips and completions
+# are merged into the word completion popup (see core/completion.py).
+
+import json
+import os
+from array import array
+
+from PySide6.QtWidgets import QTextEdit, QToolTip
+from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor
+from PySide6.QtCore import QObject, QProcess, QTimer, QUrl, QEvent, Signal
+
+from core.settings import load_settings, default_settings
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# textDocument/didChange kinds (TextDocumentSyncKind)
+SYNC_NONE, SYNC_FULL, SYNC_INCREMENTAL = 0, 1, 2
+
+# JSON-RPC error codes
+METHOD_NOT_FOUND = -32601
+
+LANGUAGE_IDS = {
+    ".py": "python", ".pyi": "python", ".pyw": "python",
+    ".js": "javascript", ".ts": "typescript", ".html": "html", ".css": "css",
+    ".c": "c", ".h": "c", ".cpp": "cpp", ".hpp": "cpp", ".cc": "cpp",
+    ".rs": "rust", ".go": "go", ".java": "java", ".json": "json",
+}
+
+# Squiggle colours by DiagnosticSeverity (1 = error ... 4 = hint)
+SEVERITY_COLORS = {1: "#F44747", 2: "#CCA700", 3: "#3794FF", 4: "#808080"}
+
+def path_to_uri(path):
+    return QUrl.fromLocalFile(os.path.abspath(path)).toString()
+
+def uri_to_path(uri):
+    return os.path.normcase(os.path.abspath(QUrl(uri).toLocalFile()))
+
+def hover_text(contents):
+    """Plain text of a Hover's contents (MarkupContent, MarkedString or a list of them)."""
+    if isinstance(contents, list):
+        return "\n\n".join(filter(None, (hover_text(part) for part in contents)))
+    if isinstance(contents, dict):
+        return contents.get("value", "").strip()
+    return (contents or "").strip()
+
+# ------------------------------------------------------------------
+# 🔌 SERVER CONNECTION
+# ------------------------------------------------------------------
+
+class LanguageServerClient(QObject):
+    """
+    One language server process. Messages are framed JSON-RPC over its
+    stdin / stdout; replies arrive through callbacks from the event loop.
+    Requests made before the initialize handshake is done are queued.
+    """
+    ready = Signal()                      # Handshake done, capabilities known
+    notification = Signal(str, object)    # Method, params of a server notification
+    stopped = Signal(str)                 # Why the server is gone
+
+    def __init__(self, command, root, parent=None):
+        super().__init__(parent)
+        self.command = list(command)
+        self.root = root
+        self.capabilities = {}
+        self.sync_kind = SYNC_NONE
+        self.is_ready = False
+        self.is_running = False
+        self._next_id = 1
+        self._callbacks = {}   # Request id -> callback(result, error)
+        self._queue = []       # Messages held back until the handshake is done
+        self._buffer = bytearray()
+
+        self.process = QProcess(self)
+        self.process.setWorkingDirectory(root)
+        self.process.readyReadStandardOutput.connect(self._on_stdout)
+        self.process.readyReadStandardError.connect(self._on_stderr)
+        self.process.errorOccurred.connect(self._on_process_error)
+        self.process.finished.connect(self._on_process_finished)
+
+    def start(self):
+        self.is_running = True
+        self.process.start(self.command[0], self.command[1:])
+        params = {
+            "processId": os.getpid(),
+            "clientInfo": {"name": "GW IDE"},
+            "rootUri": path_to_uri(self.root),
+            "workspaceFolders": [{"uri": path_to_uri(self.root), "name": os.path.basename(self.root) or self.root}],
+            "capabilities": {
+                "general": {"positionEncodings": ["utf-16"]},
+                "textDocument": {
+                    "synchronization": {"didSave": True, "dynamicRegistration": False},
+                    "completion": {"completionItem": {"snippetSupport": False}},
+                    "hover": {"contentFormat": ["plaintext", "markdown"]},
+                    "publishDiagnostics": {"relatedInformation": False},
+                },
+                "workspace": {"workspaceFolders": True, "configuration": True},
+            },
+        }
+        self._send_request("initialize", params, self._on_initialized)
+
+    def stop(self):
+        """Asks the server to shut down and closes its stdin, without waiting for it."""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._callbacks.clear()
+        self._queue.clear()
+        if self.is_ready:
+            self._write({"jsonrpc": "2.0", "id": self._take_id(), "method": "shutdown"})
+            self._write({"jsonrpc": "2.0", "method": "exit"})
+        self.process.closeWriteChannel()
+        # Servers that ignore exit are killed once they had a moment to quit
+        QTimer.singleShot(2000, self.process.kill)
+
+    # -------------------------------------------------------------
+    # --- Sending
+    # -------------------------------------------------------------
+
+    def request(self, method, params, callback):
+        """Sends a request; callback(result, error) runs when the reply arrives. Returns the id."""
+        if not self.is_running:
+            return None
+        request_id = self._take_id()
+        self._callbacks[request_id] = callback
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        if self.is_ready:
+            self._write(message)
+        else:
+            self._queue.append(message)
+        return request_id
+
+    def notify(self, method, params):
+        if not self.is_running:
+            return
+        message = {"jsonrpc": "2.0", "method": method, "params": params}
+        if self.is_ready:
+            self._write(message)
+        else:
+            self._queue.append(message)
+
+    def cancel(self, request_id):
+        """Drops the callback of a request and tells the server it is no longer needed."""
+        if self._callbacks.pop(request_id, None) is None:
+            return
+        if self.is_ready:
+            self._write({"jsonrpc": "2.0", "method": "$/cancelRequest", "params": {"id": request_id}})
+        else:
+            self._queue = [message for message in self._queue if message.get("id") != request_id]
+
+    def supports(self, provider):
+        """Whether the server announced a capability (given as true or an options object)."""
+        return self.capabilities.get(provider, False) is not False and provider in self.capabilities
+
+    def _take_id(self):
+        request_id = self._next_id
+        self._next_id += 1
+        return request_id
+
+    def _send_request(self, method, params, callback):
+        """Like request(), but bypasses the queue (for the handshake itself)."""
+        request_id = self._take_id()
+        self._callbacks[request_id] = callback
+        self._write({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+    def _write(self, message):
+        body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        self.process.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+
+    def _on_initialized(self, result, error):
+        if error is not None:
+            self._fail(f"initialize failed: {error.get('message', error)}")
+            return
+        self.capabilities = (result or {}).get("capabilities", {})
+        sync = self.capabilities.get("textDocumentSync", SYNC_NONE)
+        self.sync_kind = sync.get("change", SYNC_NONE) if isinstance(sync, dict) else (sync or SYNC_NONE)
+        self._write({"jsonrpc": "2.0", "method": "initialized", "params": {}})
+        self.is_ready = True
+        queue, self._queue = self._queue, []
+        for message in queue:
+            self._write(message)
+        self.ready.emit()
+
+    # -------------------------------------------------------------
+    # --- Receiving
+    # -------------------------------------------------------------
+
+    def _on_stdout(self):
+        self._buffer += self.process.readAllStandardOutput().data()
+        while True:
+            header_end = self._buffer.find(b"\r\n\r\n")
+            if header_end == -1:
+                return
+            length = None
+            for line in bytes(self._buffer[:header_end]).split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value.strip())
+            if length is None:
+                self._fail("malformed message header")
+                return
+            body_start = header_end + 4
+            if len(self._buffer) < body_start + length:
+                return # Rest of the body still in transit
+            body = bytes(self._buffer[body_start:body_start + length])
+            del self._buffer[:body_start + length]
+            try:
+                message = json.loads(body.decode("utf-8"))
+            except ValueError as e:
+                Debug(f"DEBUG: Unreadable message from {self.command[0]}: {e}")
+                continue
+            self._dispatch(message)
+
+    def _dispatch(self, message):
+        method = message.get("method")
+        if method is None:
+            callback = self._callbacks.pop(message.get("id"), None)
+            if callback is not None: # None: cancelled or superseded
+                callback(message.get("result"), message.get("error"))
+        elif "id" in message:
+            self._answer(message["id"], method, message.get("params") or {})
+        else:
+            self.notification.emit(method, message.get("params"))
+
+    def _answer(self, request_id, method, params):
+        """Replies to requests from the server: nothing to configure, nothing to register."""
+        if method == "workspace/configuration":
+            reply = {"result": [None] * len(params.get("items", ()))}
+        elif method in ("client/registerCapability", "client/unregisterCapability", "window/workDoneProgress/create"):
+            reply = {"result": None}
+        elif method == "workspace/workspaceFolders":
+            reply = {"result": [{"uri": path_to_uri(self.root), "name": os.path.basename(self.root) or self.root}]}
+        else:
+            reply = {"error": {"code": METHOD_NOT_FOUND, "message": f"{method} is not supported"}}
+        self._write({"jsonrpc": "2.0", "id": request_id, **reply})
+
+    def _on_stderr(self):
+        text = self.process.readAllStandardError().data().decode("utf-8", "replace").rstrip()
+        if text:
+            Debug(f"DEBUG: [{self.command[0]}] {text}")
+
+    def _on_process_error(self, error):
+        if error == QProcess.FailedToStart:
+            self._fail(f"could not be started ({self.process.errorString()})")
+
+    def _on_process_finished(self, exit_code, exit_status):
+        if self.is_running:
+            self._fail(f"exited unexpectedly (code {exit_code})")
+
+    def _fail(self, reason):
+        was_running = self.is_running
+        self.is_running = False
+        self.is_ready = False
+        self._callbacks.clear()
+        self._queue.clear()
+        if self.process.state() != QProcess.NotRunning:
+            self.process.kill()
+        if was_running:
+            self.stopped.emit(f"Language server {self.command[0]} {reason}.")
+
+# ------------------------------------------------------------------
+# 📄 OPEN DOCUMENT
+# ------------------------------------------------------------------
+
+class LspDocument(QObject):
+    """
+    Keeps one editor's document open on a server. Every contentsChange is
+    turned into an LSP range edit at once (the range is in the text as it
+    was before the change, rebuilt from a mirror of block lengths) and the
+    edits are sent together after FLUSH_DELAY_MS, or before any request.
+    """
+    FLUSH_DELAY_MS = 50
+
+    def __init__(self, client, editor, language_id):
+        super().__init__(editor)
+        self.client = client
+        self.editor = editor
+        self.language_id = language_id
+        self.path = editor.get_file_path()
+        self.uri = path_to_uri(self.path)
+        self.version = 0
+        self.is_open = False
+        self._lengths = array("I")   # Length of every block in UTF-16 units, separator included
+        self._changes = []
+        self._full_sync = False
+        self._completion_request = None
+        self._hover_request = None
+        self._diagnostics = []       # Squiggle ExtraSelections (cursors follow edits)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+        editor.document().contentsChange.connect(self._on_contents_change)
+        editor.document_title_changed.connect(self._on_title_changed)
+        editor.viewport().installEventFilter(self)
+        editor.completer.async_source = self.request_completion
+        if client.is_ready:
+            self.open()
+        else:
+            client.ready.connect(self.open)
+
+    def open(self):
+        if self.is_open or not self.client.is_ready:
+            return
+        self.is_open = True
+        self._reset_lengths()
+        self.client.notify("textDocument/didOpen", {"textDocument": {
+            "uri": self.uri, "languageId": self.language_id, "version": self.version,
+            "text": self.editor.toPlainText(),
+        }})
+
+    def close(self):
+        """Closes the document on the server and removes everything added to the editor."""
+        self.flush()
+        if self.is_open:
+            self.client.notify("textDocument/didClose", {"textDocument": {"uri": self.uri}})
+        self.is_open = False
+        self._cancel_requests()
+        try:
+            self.client.ready.disconnect(self.open)
+        except (TypeError, RuntimeError):
+            pass
+        editor = self.editor
+        editor.document().contentsChange.disconnect(self._on_contents_change)
+        editor.document_title_changed.disconnect(self._on_title_changed)
+        editor.viewport().removeEventFilter(self)
+        if editor.completer.async_source == self.request_completion:
+            editor.completer.async_source = None
+        self.clear_diagnostics()
+
+    def did_save(self):
+        self.flush()
+        if self.is_open:
+            self.client.notify("textDocument/didSave", {"textDocument": {"uri": self.uri}})
+
+    def _on_title_changed(self, _title):
+        """Save As and renames move the document: reopen it under the new URI."""
+        path = self.editor.get_file_path()
+        if path and path != self.path:
+            was_open = self.is_open
+            self.flush()
+            if was_open:
+                self.client.notify("textDocument/didClose", {"textDocument": {"uri": self.uri}})
+            self.clear_diagnostics()
+            self.path, self.uri, self.version, self.is_open = path, path_to_uri(path), 0, False
+            if was_open:
+                self.open()
+
+    # -------------------------------------------------------------
+    # --- Incremental sync
+    # -------------------------------------------------------------
+
+    def _reset_lengths(self):
+        block = self.editor.document().firstBlock()
+        lengths = array("I")
+        while block.isValid():
+            lengths.append(block.length())
+            block = block.next()
+        self._lengths = lengths
+
+    def _on_contents_change(self, position, removed, added):
+        if not self.is_open or self.client.sync_kind == SYNC_NONE:
+            return
+        self._flush_timer.start(self.FLUSH_DELAY_MS)
+        if self._full_sync or self.client.sync_kind == SYNC_FULL:
+            self._full_sync = True
+            return
+
+        document = self.editor.document()
+        start_block = document.findBlock(position)
+        start_line = start_block.blockNumber()
+        start_character = position - start_block.position()
+
+        # End of the removed text, walked through the lengths of the old blocks
+        lengths = self._lengths
+        end_line, remaining = start_line, start_character + removed
+        while end_line < len(lengths) and remaining >= lengths[end_line]:
+            remaining -= lengths[end_line]
+            end_line += 1
+        if start_line < 0 or end_line >= len(lengths):
+            # Qt reports whole-document changes past the end: resend everything
+            self._full_sync = True
+            return
+
+        cursor = QTextCursor(document)
+        cursor.setPosition(position)
+        cursor.setPosition(min(position + added, document.characterCount() - 1), QTextCursor.KeepAnchor)
+        self._changes.append({
+            "range": {
+                "start": {"line": start_line, "character": start_character},
+                "end": {"line": end_line, "character": remaining},
+            },
+            "text": cursor.selection().toPlainText(),
+        })
+
+        new_lengths = array("I")
+        block = start_block
+        end_block = document.findBlock(position + added)
+        last = end_block.blockNumber() if end_block.isValid() else document.blockCount() - 1
+        while block.isValid() and block.blockNumber() <= last:
+            new_lengths.append(block.length())
+            block = block.next()
+        lengths[start_line:end_line + 1] = new_lengths
+        if len(lengths) != document.blockCount():
+            self._full_sync = True
+
+    def flush(self):
+        """Sends the edits made since the last flush as one didChange."""
+        self._flush_timer.stop()
+        if not self.is_open or not (self._changes or self._full_sync):
+            return
+        if self._full_sync:
+            changes = [{"text": self.editor.toPlainText()}]
+            self._reset_lengths()
+        else:
+            changes = self._changes
+        self._changes = []
+        self._full_sync = False
+        self.version += 1
+        self.client.notify("textDocument/didChange", {
+            "textDocument": {"uri": self.uri, "version": self.version},
+            "contentChanges": changes,
+        })
+
+    # -------------------------------------------------------------
+    # --- Requests (a newer one cancels the one still pending)
+    # -------------------------------------------------------------
+
+    def _position(self, cursor):
+        return {"line": cursor.blockNumber(), "character": cursor.positionInBlock()}
+
+    def _cancel_requests(self):
+        for request_id in (self._completion_request, self._hover_request):
+            if request_id is not None:
+                self.client.cancel(request_id)
+        self._completion_request = self._hover_request = None
+
+    def request_completion(self, prefix, callback):
+        """Asks for completions at the cursor; callback(prefix, words) gets the labels."""
+        if not self.is_open or not self.client.supports("completionProvider"):
+            return
+        self.flush()
+        if self._completion_request is not None:
+            self.client.cancel(self._completion_request)
+
+        def on_reply(result, error):
+            self._completion_request = None
+            if error is not None or not result:
+                return
+            items = result.get("items", []) if isinstance(result, dict) else result
+            items = sorted(items, key=lambda item: item.get("sortText") or item.get("label", ""))
+            callback(prefix, [item.get("insertText") or item.get("label", "") for item in items])
+
+        self._completion_request = self.client.request("textDocument/completion", {
+            "textDocument": {"uri": self.uri}, "position": self._position(self.editor.textCursor()),
+        }, on_reply)
+
+    def request_hover(self, cursor, global_pos):
+        if not self.is_open or not self.client.supports("hoverProvider"):
+            return
+        self.flush()
+        if self._hover_request is not None:
+            self.client.cancel(self._hover_request)
+        revision = self.editor.document().revision()
+
+        def on_reply(result, error):
+            self._hover_request = None
+            if error is not None or not result or self.editor.document().revision() != revision:
+                return
+            text = hover_text(result.get("contents"))
+            if text:
+                QToolTip.showText(global_pos, text[:2000], self.editor.viewport())
+
+        self._hover_request = self.client.request("textDocument/hover", {
+            "textDocument": {"uri": self.uri}, "position": self._position(cursor),
+        }, on_reply)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.ToolTip:
+            cursor = self.editor.cursorForPosition(event.pos())
+            messages = self.diagnostics_at(cursor.position())
+            if messages:
+                QToolTip.showText(event.globalPos(), "\n".join(messages), self.editor.viewport())
+            else:
+                QToolTip.hideText()
+                self.request_hover(cursor, event.globalPos())
+            return True
+        return super().eventFilter(obj, event)
+
+    # -------------------------------------------------------------
+    # --- Diagnostics
+    # -------------------------------------------------------------
+
+    def show_diagnostics(self, diagnostics):
+        document = self.editor.document()
+        end = document.characterCount() - 1
+        selections = []
+        for diagnostic in diagnostics[:1000]:
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = QTextCursor(document)
+            start, stop = (self._offset(diagnostic["range"][key]) for key in ("start", "end"))
+            if stop <= start:
+                # Empty range: underline the rest of the word / line instead
+                stop = min(end, max(start + 1, document.findBlock(start).position() + document.findBlock(start).length() - 1))
+                start = min(start, max(0, stop - 1))
+            selection.cursor.setPosition(start)
+            selection.cursor.setPosition(stop, QTextCursor.KeepAnchor)
+            char_format = QTextCharFormat()
+            char_format.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
+            char_format.setUnderlineColor(QColor(SEVERITY_COLORS.get(diagnostic.get("severity"), SEVERITY_COLORS[1])))
+            char_format.setToolTip(diagnostic.get("message", ""))
+            selection.format = char_format
+            selections.append(selection)
+        self._diagnostics = selections
+        self.editor.set_extra_selections("diagnostics", selections)
+
+    def clear_diagnostics(self):
+        self._diagnostics = []
+        self.editor.set_extra_selections("diagnostics", [])
+
+    def diagnostics_at(self, position):
+        return [
+            selection.format.toolTip() for selection in self._diagnostics
+            if selection.cursor.selectionStart() <= position <= selection.cursor.selectionEnd()
+        ]
+
+    def _offset(self, lsp_position):
+        """Document position of an LSP (line, UTF-16 character) position."""
+        document = self.editor.document()
+        block = document.findBlockByNumber(lsp_position.get("line", 0))
+        if not block.isValid():
+            return document.characterCount() - 1
+        return block.position() + min(lsp_position.get("character", 0), block.length() - 1)
+
+# ------------------------------------------------------------------
+# 🧭 LANGUAGE SERVERS
+# ------------------------------------------------------------------
+
+class LanguageServers(QObject):
+    """
+    Starts language servers on demand for the file types of the Editor's
+    tabs, as configured by the "language_servers" setting (extension ->
+    command line), and routes their diagnostics to the open documents.
+    """
+    status_message = Signal(str)
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.clients = {}     # (command, root) -> LanguageServerClient
+        self.documents = {}   # Tab widget -> LspDocument
+        self._failed = set()  # Commands that could not be started; not retried this session
+
+        editor.editor_opened.connect(self.attach)
+        editor.editor_closed.connect(self.detach)
+        editor.file_saved.connect(self.notify_saved)
+        for i in range(editor.count()):
+            self.attach(editor.widget(i))
+
+    def set_root(self, root):
+        """Project folder for servers started from now on."""
+        self.root = os.path.abspath(root) if root else None
+
+    def server_command(self, path):
+        servers = load_settings().get("language_servers", default_settings["language_servers"])
+        return servers.get(os.path.splitext(path)[1].lower())
+
+    def attach(self, editor):
+        """Opens a tab on the server for its file type, if one is configured."""
+        if editor in self.documents or not hasattr(editor, "completer") or not editor.get_file_path():
+            return
+        if editor.is_loading():
+            editor.loading_finished.connect(self._attach_loaded)
+            return
+        path = editor.get_file_path()
+        command = self.server_command(path)
+        if not command or tuple(command) in self._failed:
+            return
+        root = self.root if self.root and os.path.abspath(path).startswith(os.path.join(self.root, "")) else os.path.dirname(os.path.abspath(path))
+        client = self._client(command, root)
+        extension = os.path.splitext(path)[1].lower()
+        self.documents[editor] = LspDocument(client, editor, LANGUAGE_IDS.get(extension, extension.lstrip(".")))
+
+    def _attach_loaded(self):
+        editor = self.sender()
+        editor.loading_finished.disconnect(self._attach_loaded)
+        self.attach(editor)
+
+    def detach(self, editor):
+        """The tab is closing (or hibernating)."""
+        document = self.documents.pop(editor, None)
+        if document is not None:
+            document.close()
+            document.deleteLater()
+
+    def notify_saved(self, path):
+        path = os.path.normcase(os.path.abspath(path))
+        for document in self.documents.values():
+            if os.path.normcase(os.path.abspath(document.path)) == path:
+                document.did_save()
+
+    def shutdown(self):
+        for document in list(self.documents.values()):
+            document.flush()
+        for client in self.clients.values():
+            client.stop()
+        self.clients.clear()
+
+    def _client(self, command, root):
+        key = (tuple(command), root)
+        client = self.clients.get(key)
+        if client is None:
+            client = LanguageServerClient(command, root, self)
+            client.notification.connect(self._on_notification)
+            client.stopped.connect(self._on_client_stopped)
+            self.clients[key] = client
+            client.start()
+        return client
+
+    def _on_notification(self, method, params):
+        if method == "textDocument/publishDiagnostics":
+            path = uri_to_path(params.get("uri", ""))
+            for document in self.documents.values():
+                if os.path.normcase(os.path.abspath(document.path)) == path:
+                    document.show_diagnostics(params.get("diagnostics", []))
+        elif method == "window/showMessage":
+            self.status_message.emit(params.get("message", ""))
+        elif method == "window/logMessage":
+            Debug(f"DEBUG: [language server] {params.get('message', '')}")
+
+    def _on_client_stopped(self, message):
+        client = self.sender()
+        if not client.is_ready and not client.capabilities:
+            self._failed.add(tuple(client.command))
+        for key, known in list(self.clients.items()):
+            if known is client:
+                del self.clients[key]
+        for editor, document in list(self.documents.items()):
+            if document.client is client:
+                self.detach(editor)
+        client.deleteLater()
+        self.status_message.emit(message)
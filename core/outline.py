@@ -0,0 +1,326 @@
+# --- File: core/outline.py ---
+# Outline of the active CodeEditorCore: classes, functions and methods as a
+# tree, click to jump. Parsing happens in the process pool after a typing
+# pause; edits that stay inside one function body only shift the line
+# numbers of the previous tree instead of reparsing.
+
+import re
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QTimer, Slot
+
+from core.process_pool import process_pool
+from core.symbol_index import parse_outline, CLASS, FUNCTION, METHOD
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# Outline node fields (see core/symbol_index.parse_outline)
+NAME, KIND, LINE, END_LINE, COLUMN, CHILDREN, BODY_LINE = range(7)
+
+LINE_ROLE = Qt.UserRole
+NAME_ROLE = Qt.UserRole + 1
+KIND_PREFIX = {CLASS: "C", FUNCTION: "ƒ", METHOD: "m"}
+
+OUTLINE_EXTENSIONS = (".py", ".pyw", ".pyi")
+
+# Lines that could start a new outline entry
+_HEADER_RE = re.compile(r"\s*(?:async\s+)?(?:def|class)\b")
+
+def _walk(nodes, parents=()):
+    """Yields (node, ancestors) in tree order."""
+    for node in nodes:
+        yield node, parents
+        yield from _walk(node[CHILDREN], parents + (node,))
+
+def _shape(nodes):
+    """What the tree widget shows, without line numbers."""
+    return [(node[NAME], node[KIND], _shape(node[CHILDREN])) for node in nodes]
+
+# ------------------------------------------------------------------
+# 🧵 OUTLINE WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class OutlineWorkerSignals(QObject):
+    """Signals available from the outline worker."""
+    finished = Signal(object, int, object, object) # Editor, document revision, nodes, error
+
+class OutlineWorker(QRunnable):
+    """Parses a text snapshot in the process pool (ast holds the GIL, a thread would stall typing)."""
+
+    def __init__(self, editor, revision, text):
+        super().__init__()
+        self.signals = OutlineWorkerSignals()
+        self.editor = editor
+        self.revision = revision
+        self.text = text
+
+    @Slot()
+    def run(self):
+        try:
+            nodes, error = process_pool().submit(parse_outline, self.text).result()
+        except Exception as e:
+            Debug(f"DEBUG: Outline parse failed: {e}")
+            nodes, error = None, (0, str(e))
+        self.signals.finished.emit(self.editor, self.revision, nodes, error)
+
+# ------------------------------------------------------------------
+# 🗂️ OUTLINE PANEL
+# ------------------------------------------------------------------
+
+class OutlinePanel(QWidget):
+    """Outline of the active tab. Call set_editor() whenever the active tab changes."""
+    line_activated = Signal(int) # 1-indexed line
+
+    PARSE_DELAY_MS = 400         # Typing pause before the outline is brought up to date
+    MAX_REUSE_LINES = 200        # Larger edits are always reparsed
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.editor = None
+        self._nodes = None         # Outline of the document as of the last parse / shift
+        self._error = None         # Syntax error of the last parse
+        self._dirty = None         # (first block, last block, line delta) edited since then
+        self._block_count = 0
+        self._parsing = False
+
+        self._parse_timer = QTimer(self)
+        self._parse_timer.setSingleShot(True)
+        self._parse_timer.timeout.connect(self.refresh)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabel("Outline")
+        self.tree.setUniformRowHeights(True)
+        self.tree.itemActivated.connect(self._on_item_activated)
+        self.tree.itemClicked.connect(self._on_item_activated)
+        layout.addWidget(self.tree)
+
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        self.status_label.hide()
+        layout.addWidget(self.status_label)
+
+    def set_editor(self, editor):
+        """Follows a new active tab (or None)."""
+        if editor is self.editor:
+            return
+        if self.editor is not None:
+            try:
+                self.editor.document().contentsChange.disconnect(self._on_contents_change)
+                self.editor.loading_finished.disconnect(self._schedule_parse)
+            except (TypeError, RuntimeError):
+                pass
+        self.editor = None
+        self._nodes = None
+        self._error = None
+        self._dirty = None
+        self._parse_timer.stop()
+        self.tree.clear()
+
+        path = editor.get_file_path() if editor is not None and hasattr(editor, 'get_file_path') else None
+        if editor is None or not hasattr(editor, 'document') or not hasattr(editor, 'loading_finished'):
+            self._show_status("No outline for this tab.")
+            return
+        if path and not path.endswith(OUTLINE_EXTENSIONS):
+            self._show_status("Outline is available for Python files.")
+            return
+
+        self.editor = editor
+        self._block_count = editor.document().blockCount()
+        editor.document().contentsChange.connect(self._on_contents_change)
+        editor.loading_finished.connect(self._schedule_parse)
+        self._show_status(None)
+        self._parse_timer.start(0)
+
+    def _show_status(self, text):
+        self.status_label.setText(text or "")
+        self.status_label.setVisible(bool(text))
+
+    # -------------------------------------------------------------
+    # --- Edits (runs on every keystroke: keep it O(log n))
+    # -------------------------------------------------------------
+
+    def _on_contents_change(self, position, removed, added):
+        document = self.editor.document()
+        block_count = document.blockCount()
+        delta = block_count - self._block_count
+        self._block_count = block_count
+        first = document.findBlock(position).blockNumber()
+        end_block = document.findBlock(position + added)
+        # Qt may report a first change that runs past the end of the document
+        last = end_block.blockNumber() if end_block.isValid() else block_count - 1
+
+        if self._dirty is not None:
+            dirty_first, dirty_last, dirty_delta = self._dirty
+            if dirty_last >= first:
+                dirty_last = max(dirty_last + delta, first)
+            first, last, delta = min(first, dirty_first), max(last, dirty_last), delta + dirty_delta
+        self._dirty = (first, last, delta)
+        self._schedule_parse()
+
+    def _schedule_parse(self):
+        self._parse_timer.start(self.PARSE_DELAY_MS)
+
+    # -------------------------------------------------------------
+    # --- Parsing
+    # -------------------------------------------------------------
+
+    def refresh(self):
+        """Brings the outline up to date: shifts the old tree if possible, else reparses."""
+        editor = self.editor
+        if editor is None or not self.isVisible():
+            return
+        if editor.is_loading() or self._parsing:
+            self._schedule_parse() # Retried once the text (or the running parse) is complete
+            return
+
+        # A broken file is always reparsed, so fixing it clears the error
+        if self._nodes is not None and self._error is None and self._dirty is not None and self._shift_nodes():
+            self._dirty = None
+            self._update_lines()
+            return
+
+        self._dirty = None
+        self._parsing = True
+        document = editor.document()
+        worker = OutlineWorker(editor, document.revision(), editor.toPlainText())
+        worker.signals.finished.connect(self._on_parsed)
+        QThreadPool.globalInstance().start(worker)
+
+    def _shift_nodes(self):
+        """
+        If every edit since the last parse is inside the body of one function
+        and adds no def / class / dedented line, moves the nodes after it by
+        the line delta and returns True.
+        """
+        first, last, delta = self._dirty
+        first, last = first + 1, last + 1 # 1-indexed lines of the edited region (new numbering)
+        old_last = last - delta
+        if last - first > self.MAX_REUSE_LINES:
+            return False
+
+        # Innermost function whose body holds the whole edit
+        owner = None
+        for node, _ in _walk(self._nodes):
+            if first <= node[LINE] <= max(old_last, first):
+                return False # An outline header was edited
+            if node[KIND] != CLASS and node[BODY_LINE] <= first and old_last <= node[END_LINE] and last <= node[END_LINE] + delta:
+                owner = node
+        if owner is None:
+            return False
+
+        document = self.editor.document()
+        block = document.findBlockByNumber(first - 1)
+        for _ in range(first, last + 1):
+            text = block.text()
+            stripped = text.lstrip()
+            if stripped:
+                indent = len(text[:len(text) - len(stripped)].expandtabs())
+                if indent <= owner[COLUMN] or _HEADER_RE.match(text):
+                    return False
+            block = block.next()
+
+        for node, _ in _walk(self._nodes):
+            if node[LINE] > old_last:
+                node[LINE] += delta
+                node[BODY_LINE] += delta
+            if node[END_LINE] >= first:
+                node[END_LINE] += delta
+        return True
+
+    def _on_parsed(self, editor, revision, nodes, error):
+        self._parsing = False
+        if editor is not self.editor:
+            return
+        if editor.document().revision() != revision:
+            self._schedule_parse() # Typed on while parsing; the next pause reparses
+            return
+        if nodes is None:
+            self._show_status(f"Outline unavailable: {error[1]}")
+            return
+
+        self._error = error
+        if error is not None:
+            self._show_status(f"Syntax error on line {error[0]}: {error[1].rstrip('.')}. Showing an approximate outline.")
+        else:
+            self._show_status(None)
+
+        if self._nodes is not None and _shape(nodes) == _shape(self._nodes):
+            self._nodes = nodes
+            self._update_lines()
+        else:
+            self._nodes = nodes
+            self._rebuild_tree()
+
+    # -------------------------------------------------------------
+    # --- Tree
+    # -------------------------------------------------------------
+
+    def _rebuild_tree(self):
+        """Repopulates the tree, keeping the expanded / collapsed state of entries by name."""
+        collapsed = set()
+        for item, path in self._items():
+            if item.childCount() and not item.isExpanded():
+                collapsed.add(path)
+
+        self.tree.clear()
+
+        def add(nodes, parent, path):
+            for node in nodes:
+                item = QTreeWidgetItem([f"{KIND_PREFIX.get(node[KIND], '')}  {node[NAME]}"])
+                item.setData(0, LINE_ROLE, node[LINE])
+                item.setData(0, NAME_ROLE, node[NAME])
+                item.setToolTip(0, f"{node[KIND]} {node[NAME]} (line {node[LINE]})")
+                if parent is None:
+                    self.tree.addTopLevelItem(item)
+                else:
+                    parent.addChild(item)
+                node_path = path + (node[NAME],)
+                add(node[CHILDREN], item, node_path)
+                item.setExpanded(node_path not in collapsed)
+
+        self.tree.setUpdatesEnabled(False)
+        add(self._nodes, None, ())
+        self.tree.setUpdatesEnabled(True)
+
+    def _update_lines(self):
+        """Same entries as shown: only the line numbers moved."""
+        nodes = (node for node, _ in _walk(self._nodes))
+        for (item, _), node in zip(self._items(), nodes):
+            item.setData(0, LINE_ROLE, node[LINE])
+            item.setToolTip(0, f"{node[KIND]} {node[NAME]} (line {node[LINE]})")
+
+    def _items(self):
+        """Yields (item, name path) in tree order."""
+        def walk(item, path):
+            path = path + (item.data(0, NAME_ROLE),)
+            yield item, path
+            for index in range(item.childCount()):
+                yield from walk(item.child(index), path)
+        for index in range(self.tree.topLevelItemCount()):
+            yield from walk(self.tree.topLevelItem(index), ())
+
+    def _on_item_activated(self, item, column=0):
+        line = item.data(0, LINE_ROLE)
+        if line:
+            self.line_activated.emit(line)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.editor is not None and (self._nodes is None or self._dirty is not None):
+            self._parse_timer.start(0) # Edits made while hidden were not looked at
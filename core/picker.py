@@ -0,0 +1,95 @@
+# --- File: core/picker.py ---
+# Keyboard-driven picker popup: type to filter, Up/Down to move, Enter to
+# choose. The caller supplies the search function, so the same dialog
+# serves symbols and files.
+
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+from PySide6.QtCore import Qt, Signal, QEvent, QCoreApplication
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+PAYLOAD_ROLE = Qt.UserRole
+
+class FuzzyPicker(QDialog):
+    """
+    A filter box over a result list. search(query) returns up to `limit`
+    (text, detail, payload) tuples, best first; the payload of the chosen
+    row is emitted with item_chosen.
+    """
+    item_chosen = Signal(object)
+
+    def __init__(self, title, search, placeholder="", limit=100, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumSize(600, 400)
+        self.search = search
+        self.limit = limit
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.setLayout(layout)
+
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText(placeholder)
+        self.query_edit.installEventFilter(self) # Up/Down/PageUp/PageDown move the list
+        layout.addWidget(self.query_edit)
+
+        self.result_list = QListWidget()
+        self.result_list.setUniformItemSizes(True)
+        layout.addWidget(self.result_list)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.query_edit.textChanged.connect(self.refresh)
+        self.query_edit.returnPressed.connect(self.choose_current)
+        self.result_list.itemActivated.connect(self.choose_current)
+
+    def set_query(self, text):
+        self.query_edit.setText(text)
+        self.query_edit.selectAll()
+        self.refresh()
+
+    def refresh(self, *_):
+        self.show_results(self.search(self.query_edit.text()))
+
+    def show_results(self, results, status=None):
+        """Fills the list with (text, detail, payload) rows; status defaults to the result count."""
+        self.result_list.setUpdatesEnabled(False)
+        self.result_list.clear()
+        for text, detail, payload in results[:self.limit]:
+            item = QListWidgetItem(f"{text}    {detail}" if detail else text)
+            item.setData(PAYLOAD_ROLE, payload)
+            self.result_list.addItem(item)
+        self.result_list.setUpdatesEnabled(True)
+        if self.result_list.count():
+            self.result_list.setCurrentRow(0)
+        if status is None:
+            status = f"{len(results)} result(s)" if len(results) < self.limit else f"Top {self.limit} results"
+        self.status_label.setText(status)
+
+    def choose_current(self, *_):
+        item = self.result_list.currentItem()
+        if item is None:
+            return
+        self.accept()
+        self.item_chosen.emit(item.data(PAYLOAD_ROLE))
+
+    def eventFilter(self, obj, event):
+        if obj is self.query_edit and event.type() == QEvent.KeyPress and \
+                event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+            QCoreApplication.sendEvent(self.result_list, event)
+            return True
+        return super().eventFilter(obj, event)
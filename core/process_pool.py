@@ -0,0 +1,42 @@
+# --- File: core/process_pool.py ---
+# One process pool shared by CPU-heavy project features (search, indexing).
+# Processes are spawned rather than forked: forking a running Qt application
+# with its threads is not safe.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# One worker per core, at most 8
+POOL_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+_pool = None
+
+def process_pool():
+    """The shared pool, started on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        Debug(f"DEBUG: Started process pool with {POOL_WORKERS} workers.")
+    return _pool
+
+def shutdown_process_pool():
+    """Stops the workers (called on exit). Queued jobs are dropped."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,284 @@
+# --- File: core/project_index.py ---
+# Keeps a persistent trigram index (see core/trigram_index.py) of the open
+# project folder up to date in the background, so Find in Files only reads
+# the files that can match instead of every file under the root.
+
+import hashlib
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+from core.settings import USER_DATA_DIR
+from core.process_pool import process_pool, POOL_WORKERS
+from core.trigram_index import TrigramIndex, index_file_batch, required_trigrams
+from core.workspace import walk_files, IGNORED_DIRS, MAX_SEARCH_FILE_SIZE
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+INDEX_DIR = os.path.join(USER_DATA_DIR, "indexes")
+
+def index_path_for(root, extension=".trigrams"):
+    """An index file of a project root (one per canonical root path and kind)."""
+    key = os.path.normcase(os.path.realpath(root)).encode("utf-8", "surrogatepass")
+    return os.path.join(INDEX_DIR, hashlib.sha1(key).hexdigest()[:16] + extension)
+
+# ------------------------------------------------------------------
+# 🧵 INDEX WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class IndexWorkerSignals(QObject):
+    """Signals available from the index worker."""
+    finished = Signal(int, object, object) # Generation, index (None if cancelled), stats dict
+
+class IndexWorker(QRunnable):
+    """
+    Brings an index up to date. Without paths it loads the saved index of
+    the root (or starts an empty one), re-indexes every file whose mtime or
+    size changed, drops deleted files and saves the result. With paths it
+    only re-checks those files and does not save.
+    """
+    BATCH_FILES = 64
+
+    def __init__(self, generation, root, index=None, paths=None):
+        super().__init__()
+        self.signals = IndexWorkerSignals()
+        self.generation = generation
+        self.root = root
+        self.index = index
+        self.paths = paths
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self):
+        started = time.perf_counter()
+        stats = {"full": self.paths is None, "indexed": 0, "removed": 0, "size": None}
+        try:
+            index = self.index
+            if index is None:
+                index = TrigramIndex.load(index_path_for(self.root), self.root)
+                if index is None or index.needs_rebuild():
+                    index = TrigramIndex(self.root)
+
+            if self.paths is None:
+                entries, removed = self._scan_root(index)
+            else:
+                entries, removed = self._check_paths(index)
+            index.remove(removed)
+            stats["removed"] = len(removed)
+
+            stats["indexed"] = self._index_entries(index, entries)
+            if self._cancelled:
+                self.signals.finished.emit(self.generation, None, stats)
+                return
+
+            if stats["full"] and (entries or removed or not os.path.exists(index_path_for(self.root))):
+                os.makedirs(INDEX_DIR, exist_ok=True)
+                stats["size"] = index.save(index_path_for(self.root))
+        except Exception as e:
+            Debug(f"DEBUG: Indexing {self.root} failed: {e}")
+            self.signals.finished.emit(self.generation, None, stats)
+            return
+
+        stats["files"] = len(index)
+        stats["seconds"] = time.perf_counter() - started
+        self.signals.finished.emit(self.generation, index, stats)
+
+    def _scan_root(self, index):
+        """(entries to index, relative paths to drop) from one walk of the root."""
+        prefix = len(os.path.join(self.root, ""))
+        seen = set()
+        entries = []
+        for path, stat in walk_files(self.root, max_size=MAX_SEARCH_FILE_SIZE):
+            if self._cancelled:
+                break
+            relative_path = path[prefix:]
+            seen.add(relative_path)
+            if index.stale(relative_path, stat):
+                entries.append((relative_path, stat))
+        if self._cancelled:
+            return [], []
+        # This worker is the only writer, so ids can be read without the lock
+        removed = [relative_path for relative_path in index.ids if relative_path not in seen]
+        return entries, removed
+
+    def _check_paths(self, index):
+        entries = []
+        removed = []
+        for path in self.paths:
+            relative_path = index.relative(path)
+            parts = relative_path.split(os.sep)
+            if parts[0] == os.pardir or IGNORED_DIRS.intersection(parts[:-1]):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                removed.append(relative_path)
+                continue
+            if not os.path.isfile(path) or stat.st_size > MAX_SEARCH_FILE_SIZE:
+                removed.append(relative_path)
+            elif index.stale(relative_path, stat):
+                entries.append((relative_path, stat))
+        return entries, removed
+
+    def _index_entries(self, index, entries):
+        """Indexes entries in the process pool; returns how many were handed out."""
+        pool = process_pool()
+        max_in_flight = POOL_WORKERS * 2
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                first_id, batch = pending.pop(future)
+                try:
+                    text_flags, postings = future.result()
+                except Exception as e:
+                    Debug(f"DEBUG: Index batch failed: {e}")
+                    continue
+                index.apply_batch(first_id, batch, text_flags, postings)
+
+        submitted = 0
+        try:
+            for start in range(0, len(entries), self.BATCH_FILES):
+                if self._cancelled:
+                    break
+                batch = entries[start:start + self.BATCH_FILES]
+                first_id = index.reserve(len(batch))
+                paths = [index.absolute(relative_path) for relative_path, _ in batch]
+                pending[pool.submit(index_file_batch, paths, first_id)] = (first_id, batch)
+                submitted += len(batch)
+                # Backpressure: results are merged as fast as the pool produces them
+                while len(pending) >= max_in_flight and not self._cancelled:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending and not self._cancelled:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                collect(done)
+        finally:
+            for future in pending:
+                future.cancel()
+        return submitted
+
+# ------------------------------------------------------------------
+# 🗂️ PROJECT INDEX
+# ------------------------------------------------------------------
+
+class ProjectIndex(QObject):
+    """
+    The trigram index of the project folder. It is built (or refreshed from
+    the saved one) when a folder is opened, and files reported changed are
+    re-indexed shortly after. Until it is ready searches walk the tree.
+    """
+    status_message = Signal(str)
+
+    UPDATE_DELAY_MS = 500 # Changed files are re-indexed together after this pause
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.index = None   # Only set once the first refresh is done
+        self._generation = 0
+        self._worker = None
+        self._pending = set()  # Changed files waiting to be re-indexed
+        self._updating = set() # Changed files the running worker re-indexes
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._start_update)
+
+    def open_root(self, root):
+        """Switches to a project folder and starts loading / refreshing its index."""
+        self.cancel()
+        self.root = os.path.abspath(root)
+        self.index = None
+        self.status_message.emit("Indexing project for search...")
+        self._start_worker(IndexWorker(self._generation, self.root))
+
+    def cancel(self):
+        self._update_timer.stop()
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._pending.clear()
+        self._updating.clear()
+
+    def covers(self, root):
+        return self.root is not None and root is not None and \
+            os.path.normcase(os.path.abspath(root)) == os.path.normcase(self.root)
+
+    def notify_changed(self, path):
+        """A file under the root was saved, created, renamed or deleted."""
+        if not path or self.root is None:
+            return
+        path = os.path.abspath(path)
+        if not os.path.normcase(path).startswith(os.path.normcase(os.path.join(self.root, ""))):
+            return
+        self._pending.add(path)
+        self._update_timer.start(self.UPDATE_DELAY_MS)
+
+    def candidates(self, pattern):
+        """
+        [(path, size), ...] of the files that may match a compiled pattern, or
+        None if the index cannot narrow the search (not ready, no literals).
+        """
+        if self.index is None:
+            return None
+        trigrams = required_trigrams(pattern)
+        if not trigrams:
+            return None
+        files = self.index.candidates(trigrams)
+        # Files changed since they were indexed are searched regardless
+        unindexed = self._pending | self._updating
+        if unindexed:
+            listed = {path for path, _ in files}
+            files.extend((path, 0) for path in sorted(unindexed - listed) if os.path.isfile(path))
+        return files
+
+    def _start_worker(self, worker):
+        self._worker = worker
+        worker.signals.finished.connect(self._on_worker_finished)
+        QThreadPool.globalInstance().start(worker)
+
+    def _start_update(self):
+        if self._worker is not None or self.index is None or not self._pending:
+            return # Picked up again when the running worker finishes
+        self._updating = self._pending
+        self._pending = set()
+        self._start_worker(IndexWorker(self._generation, self.root, self.index, sorted(self._updating)))
+
+    def _on_worker_finished(self, generation, index, stats):
+        if generation != self._generation:
+            return # For a root that is no longer open
+        self._worker = None
+        self._updating.clear()
+        if index is None:
+            if stats["full"]:
+                self.status_message.emit("Project indexing failed; searches read every file.")
+            return
+        self.index = index
+        if stats["full"]:
+            size = f", {stats['size'] / (1024 * 1024):.1f} MB on disk" if stats["size"] is not None else ""
+            self.status_message.emit(
+                f"Indexed {stats['files']} files in {stats['seconds']:.2f} s "
+                f"({stats['indexed']} re-read{size})."
+            )
+            Debug(f"DEBUG: Project index of {self.root}: {stats}")
+        if self._pending:
+            self._update_timer.start(self.UPDATE_DELAY_MS)
@@ -0,0 +1,301 @@
+# --- File: core/project_search.py ---
+# "Find in Files" panel. A coordinator thread walks the project and feeds
+# batches of files to the shared process pool; results stream back into a
+# tree that only builds the match rows of a file once it is expanded.
+
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel,
+    QToolButton, QTreeWidget, QTreeWidgetItem
+)
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QTimer, Slot
+
+from core.find_bar import compile_search
+from core.process_pool import process_pool, POOL_WORKERS
+from core.workspace import walk_files, search_file_batch, MAX_SEARCH_FILE_SIZE
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# Item data roles for the results tree
+MATCHES_ROLE = Qt.UserRole       # File items: list of (line, column, text)
+LOCATION_ROLE = Qt.UserRole + 1  # Every item: (path, line, column)
+
+# ------------------------------------------------------------------
+# 🧵 PROJECT SEARCH WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class ProjectSearchWorkerSignals(QObject):
+    """Signals available from the project search worker."""
+    results = Signal(int, object)            # Generation, [(path, matches), ...]
+    progress = Signal(int, int)              # Generation, files searched so far
+    finished = Signal(int, int, float, bool) # Generation, files searched, seconds, cancelled
+
+class ProjectSearchWorker(QRunnable):
+    """
+    Walks the project (or goes through the candidate files the trigram
+    index picked) and keeps the process pool busy with batches of files,
+    handing each batch's results to the UI as soon as it is done.
+    """
+    BATCH_FILES = 128             # Files per pool job...
+    BATCH_BYTES = 4 * 1024 * 1024 # ...or this many bytes, whichever comes first
+
+    def __init__(self, generation, root, pattern, files=None):
+        super().__init__()
+        self.signals = ProjectSearchWorkerSignals()
+        self.generation = generation
+        self.root = root
+        self.pattern = pattern
+        self.files = files # [(path, size), ...] or None to walk the root
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self):
+        started = time.perf_counter()
+        pool = process_pool()
+        max_in_flight = POOL_WORKERS * 2
+        pending = set()
+        searched = 0
+
+        def collect(done):
+            nonlocal searched
+            for future in done:
+                try:
+                    count, results = future.result()
+                except Exception as e:
+                    Debug(f"DEBUG: Search batch failed: {e}")
+                    continue
+                searched += count
+                if results:
+                    self.signals.results.emit(self.generation, results)
+            self.signals.progress.emit(self.generation, searched)
+
+        def submit(paths):
+            pending.add(pool.submit(search_file_batch, paths, self.pattern.pattern, self.pattern.flags))
+
+        if self.files is not None:
+            files = self.files
+        else:
+            files = ((path, stat.st_size) for path, stat in walk_files(self.root, max_size=MAX_SEARCH_FILE_SIZE))
+
+        batch = []
+        batch_bytes = 0
+        try:
+            for path, size in files:
+                if self._cancelled:
+                    break
+                batch.append(path)
+                batch_bytes += size
+                if len(batch) >= self.BATCH_FILES or batch_bytes >= self.BATCH_BYTES:
+                    submit(batch)
+                    batch = []
+                    batch_bytes = 0
+                # Backpressure: do not walk further ahead than the pool can search
+                while len(pending) >= max_in_flight and not self._cancelled:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    pending.difference_update(done)
+                    collect(done)
+
+            if batch and not self._cancelled:
+                submit(batch)
+            while pending and not self._cancelled:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+                collect(done)
+        finally:
+            for future in pending:
+                future.cancel() # Jobs of a cancelled search that did not start yet
+
+        self.signals.finished.emit(self.generation, searched, time.perf_counter() - started, self._cancelled)
+
+# ------------------------------------------------------------------
+# 🗂️ FIND IN FILES PANEL
+# ------------------------------------------------------------------
+
+class ProjectSearchPanel(QWidget):
+    """Project-wide search over the FileManager root, results grouped by file."""
+    open_requested = Signal(str, int, int) # Path, 1-indexed line, column
+
+    SEARCH_DELAY_MS = 300 # Typing pause before a new search starts
+
+    def __init__(self, project_index=None, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.project_index = project_index # Narrows searches to candidate files (core/project_index.py)
+        self._indexed = False
+        self._generation = 0
+        self._worker = None
+        self._match_count = 0
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self.start_search)
+
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.setLayout(layout)
+
+        query_row = QHBoxLayout()
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Find in Files")
+        self.query_edit.setClearButtonEnabled(True)
+        self.case_button = self._option_button("Aa", "Match case")
+        self.word_button = self._option_button("W", "Match whole word")
+        self.regex_button = self._option_button(".*", "Use regular expression")
+        query_row.addWidget(self.query_edit)
+        query_row.addWidget(self.case_button)
+        query_row.addWidget(self.word_button)
+        query_row.addWidget(self.regex_button)
+        layout.addLayout(query_row)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.results_tree = QTreeWidget()
+        self.results_tree.setHeaderHidden(True)
+        self.results_tree.setUniformRowHeights(True) # Keeps huge result lists cheap to scroll
+        layout.addWidget(self.results_tree)
+
+        # Signals
+        self.query_edit.textChanged.connect(self._schedule_search)
+        self.query_edit.returnPressed.connect(self.start_search)
+        for button in (self.case_button, self.word_button, self.regex_button):
+            button.toggled.connect(self._schedule_search)
+        self.results_tree.itemExpanded.connect(self._populate_file_item)
+        self.results_tree.itemActivated.connect(self._on_item_activated)
+
+    def _option_button(self, text, tooltip):
+        button = QToolButton()
+        button.setText(text)
+        button.setToolTip(tooltip)
+        button.setCheckable(True)
+        return button
+
+    def set_root(self, path):
+        if path != self.root:
+            self.root = path
+            if self.query_edit.text():
+                self._schedule_search()
+
+    def focus_query(self, text=None):
+        if text:
+            self.query_edit.setText(text)
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+
+    # -------------------------------------------------------------
+    # --- Searching
+    # -------------------------------------------------------------
+
+    def _schedule_search(self, *_):
+        self._search_timer.start(self.SEARCH_DELAY_MS)
+
+    def cancel_search(self):
+        self._search_timer.stop()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def start_search(self):
+        """Cancels the running search (if any) and starts a new one."""
+        self.cancel_search()
+        self.results_tree.clear()
+        self._match_count = 0
+        query = self.query_edit.text()
+        if not query or not self.root:
+            self.status_label.setText("")
+            return
+        try:
+            pattern = compile_search(
+                query,
+                regex=self.regex_button.isChecked(),
+                case_sensitive=self.case_button.isChecked(),
+                whole_word=self.word_button.isChecked(),
+            )
+        except re.error as e:
+            self.status_label.setText(f"Invalid pattern: {e}")
+            return
+
+        files = None
+        if self.project_index is not None and self.project_index.covers(self.root):
+            files = self.project_index.candidates(pattern)
+        self._indexed = files is not None
+
+        self._generation += 1
+        self._worker = ProjectSearchWorker(self._generation, self.root, pattern, files)
+        self._worker.signals.results.connect(self._on_results)
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.finished.connect(self._on_finished)
+        self.status_label.setText("Searching...")
+        QThreadPool.globalInstance().start(self._worker)
+
+    def _on_results(self, generation, results):
+        if generation != self._generation:
+            return # From a search that was replaced by a newer one
+        items = []
+        for path, matches in results:
+            item = QTreeWidgetItem([f"{os.path.relpath(path, self.root)} ({len(matches)})"])
+            item.setToolTip(0, path)
+            item.setData(0, MATCHES_ROLE, matches)
+            item.setData(0, LOCATION_ROLE, (path, matches[0][0], matches[0][1]))
+            # Match rows are only created when the file is expanded
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            items.append(item)
+            self._match_count += len(matches)
+        self.results_tree.addTopLevelItems(items)
+
+    def _on_progress(self, generation, searched):
+        if generation == self._generation:
+            self.status_label.setText(
+                f"Searching... {self._match_count} matches in "
+                f"{self.results_tree.topLevelItemCount()} files ({searched} files searched)"
+            )
+
+    def _on_finished(self, generation, searched, seconds, cancelled):
+        if generation != self._generation or cancelled:
+            return
+        self._worker = None
+        self.status_label.setText(
+            f"{self._match_count} matches in {self.results_tree.topLevelItemCount()} files "
+            f"({searched} {'indexed candidates' if self._indexed else 'files'} searched in {seconds:.2f} s)"
+        )
+
+    # -------------------------------------------------------------
+    # --- Results tree
+    # -------------------------------------------------------------
+
+    def _populate_file_item(self, item):
+        if item.childCount() or item.parent() is not None:
+            return
+        path = item.data(0, LOCATION_ROLE)[0]
+        children = []
+        for line, column, text in item.data(0, MATCHES_ROLE):
+            child = QTreeWidgetItem([f"{line}: {text.strip()}"])
+            child.setData(0, LOCATION_ROLE, (path, line, column))
+            children.append(child)
+        item.addChildren(children)
+
+    def _on_item_activated(self, item, column):
+        path, line, match_column = item.data(0, LOCATION_ROLE)
+        self.open_requested.emit(path, line, match_column)
@@ -0,0 +1,372 @@
+# --- File: core/project_symbols.py ---
+# Keeps the Python symbol index (see core/symbol_index.py) of the open
+# project folder up to date in the background. Go to Definition and the
+# workspace symbol picker query its current snapshot.
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+from core.process_pool import process_pool, POOL_WORKERS
+from core.project_index import INDEX_DIR, index_path_for
+from core.symbol_index import SymbolTable, parse_symbol_batch, parse_document_symbols
+from core.workspace import walk_files, IGNORED_DIRS, MAX_SEARCH_FILE_SIZE
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+SYMBOL_INDEX_EXTENSION = ".symbols"
+PYTHON_EXTENSIONS = (".py", ".pyw", ".pyi")
+
+def _stale(files, relative_path, stat):
+    """True if a file is not parsed with this mtime and size."""
+    entry = files.get(relative_path)
+    return entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size
+
+# ------------------------------------------------------------------
+# 🧵 SYMBOL WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class SymbolIndexWorkerSignals(QObject):
+    """Signals available from the symbol index worker."""
+    finished = Signal(int, object, object) # Generation, SymbolTable (None if cancelled), stats dict
+
+class SymbolIndexWorker(QRunnable):
+    """
+    Builds the next SymbolTable. Without paths it starts from the saved
+    table of the root, reparses the Python files whose mtime or size
+    changed and saves the result; with paths it only re-checks those.
+    """
+    BATCH_FILES = 32
+
+    def __init__(self, generation, root, table=None, paths=None):
+        super().__init__()
+        self.signals = SymbolIndexWorkerSignals()
+        self.generation = generation
+        self.root = root
+        self.table = table
+        self.paths = paths
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @Slot()
+    def run(self):
+        started = time.perf_counter()
+        stats = {"full": self.paths is None, "parsed": 0, "size": None}
+        index_path = index_path_for(self.root, SYMBOL_INDEX_EXTENSION)
+        try:
+            if self.table is not None:
+                files = dict(self.table.files)
+            else:
+                files = SymbolTable.load_files(index_path, self.root) or {}
+
+            if self.paths is None:
+                entries, removed = self._scan_root(files)
+            else:
+                entries, removed = self._check_paths(files)
+            for relative_path in removed:
+                files.pop(relative_path, None)
+
+            stats["parsed"] = self._parse_entries(files, entries)
+            if self._cancelled:
+                self.signals.finished.emit(self.generation, None, stats)
+                return
+
+            table = SymbolTable(self.root, files)
+            table.matcher() # Built here rather than on the first keystroke
+            if stats["full"] and (entries or removed or not os.path.exists(index_path)):
+                os.makedirs(INDEX_DIR, exist_ok=True)
+                stats["size"] = table.save(index_path)
+        except Exception as e:
+            Debug(f"DEBUG: Symbol indexing of {self.root} failed: {e}")
+            self.signals.finished.emit(self.generation, None, stats)
+            return
+
+        stats["files"] = len(files)
+        stats["symbols"] = len(table)
+        stats["seconds"] = time.perf_counter() - started
+        self.signals.finished.emit(self.generation, table, stats)
+
+    def _scan_root(self, files):
+        prefix = len(os.path.join(self.root, ""))
+        seen = set()
+        entries = []
+        for path, stat in walk_files(self.root, max_size=MAX_SEARCH_FILE_SIZE):
+            if self._cancelled:
+                return [], []
+            if not path.endswith(PYTHON_EXTENSIONS):
+                continue
+            relative_path = path[prefix:]
+            seen.add(relative_path)
+            if _stale(files, relative_path, stat):
+                entries.append((relative_path, stat))
+        removed = [relative_path for relative_path in files if relative_path not in seen]
+        return entries, removed
+
+    def _check_paths(self, files):
+        entries = []
+        removed = []
+        for path in self.paths:
+            relative_path = os.path.relpath(path, self.root)
+            parts = relative_path.split(os.sep)
+            if parts[0] == os.pardir or IGNORED_DIRS.intersection(parts[:-1]):
+                continue
+            if not path.endswith(PYTHON_EXTENSIONS) or not os.path.isfile(path):
+                removed.append(relative_path)
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                removed.append(relative_path)
+                continue
+            if _stale(files, relative_path, stat):
+                entries.append((relative_path, stat))
+        return entries, removed
+
+    def _parse_entries(self, files, entries):
+        """Parses entries in the process pool into files; returns how many were handed out."""
+        pool = process_pool()
+        max_in_flight = POOL_WORKERS * 2
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                batch = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    Debug(f"DEBUG: Symbol batch failed: {e}")
+                    continue
+                for (relative_path, stat), (_, symbols) in zip(batch, results):
+                    if symbols is None:
+                        files.pop(relative_path, None)
+                    else:
+                        files[relative_path] = (stat.st_mtime_ns, stat.st_size, symbols)
+
+        submitted = 0
+        try:
+            for start in range(0, len(entries), self.BATCH_FILES):
+                if self._cancelled:
+                    break
+                batch = entries[start:start + self.BATCH_FILES]
+                paths = [os.path.join(self.root, relative_path) for relative_path, _ in batch]
+                pending[pool.submit(parse_symbol_batch, paths)] = batch
+                submitted += len(batch)
+                while len(pending) >= max_in_flight and not self._cancelled:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending and not self._cancelled:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                collect(done)
+        finally:
+            for future in pending:
+                future.cancel()
+        return submitted
+
+class DocumentSymbolsWorkerSignals(QObject):
+    """Signals available from the document symbols worker."""
+    finished = Signal(object, int, object) # Editor, document revision, symbols
+
+class DocumentSymbolsWorker(QRunnable):
+    """Parses the text snapshot of an open tab in the process pool (ast holds the GIL)."""
+
+    def __init__(self, editor, revision, text):
+        super().__init__()
+        self.signals = DocumentSymbolsWorkerSignals()
+        self.editor = editor
+        self.revision = revision
+        self.text = text
+
+    @Slot()
+    def run(self):
+        try:
+            symbols = process_pool().submit(parse_document_symbols, self.text).result()
+        except Exception as e:
+            Debug(f"DEBUG: Document symbol parse failed: {e}")
+            symbols = []
+        self.signals.finished.emit(self.editor, self.revision, symbols)
+
+# ------------------------------------------------------------------
+# 🧭 PROJECT SYMBOLS
+# ------------------------------------------------------------------
+
+class ProjectSymbols(QObject):
+    """
+    The symbol table of the project folder, refreshed when a folder is
+    opened and for files reported changed. `table` is None until the first
+    refresh is done.
+    """
+    status_message = Signal(str)
+
+    UPDATE_DELAY_MS = 500 # Changed files are reparsed together after this pause
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.table = None
+        self._generation = 0
+        self._worker = None
+        self._pending = set()
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._start_update)
+
+    def open_root(self, root):
+        """Switches to a project folder and starts loading / refreshing its symbols."""
+        self.cancel()
+        self.root = os.path.abspath(root)
+        self.table = None
+        self._start_worker(SymbolIndexWorker(self._generation, self.root))
+
+    def cancel(self):
+        self._update_timer.stop()
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._pending.clear()
+
+    def notify_changed(self, path):
+        """A file under the root was saved, created, renamed or deleted."""
+        if not path or self.root is None:
+            return
+        path = os.path.abspath(path)
+        if not os.path.normcase(path).startswith(os.path.normcase(os.path.join(self.root, ""))):
+            return
+        self._pending.add(path)
+        self._update_timer.start(self.UPDATE_DELAY_MS)
+
+    def lookup(self, name):
+        return self.table.lookup(name) if self.table is not None else []
+
+    def search(self, query, limit=100):
+        return self.table.search(query, limit) if self.table is not None else []
+
+    def _start_worker(self, worker):
+        self._worker = worker
+        worker.signals.finished.connect(self._on_worker_finished)
+        QThreadPool.globalInstance().start(worker)
+
+    def _start_update(self):
+        if self._worker is not None or self.table is None or not self._pending:
+            return # Picked up again when the running worker finishes
+        paths = sorted(self._pending)
+        self._pending.clear()
+        self._start_worker(SymbolIndexWorker(self._generation, self.root, self.table, paths))
+
+    def _on_worker_finished(self, generation, table, stats):
+        if generation != self._generation:
+            return # For a root that is no longer open
+        self._worker = None
+        if table is not None:
+            self.table = table
+            if stats["full"]:
+                size = f", {stats['size'] / (1024 * 1024):.1f} MB on disk" if stats["size"] is not None else ""
+                self.status_message.emit(
+                    f"Indexed {stats['symbols']} symbols in {stats['files']} Python files "
+                    f"in {stats['seconds']:.2f} s ({stats['parsed']} parsed{size})."
+                )
+        if self._pending:
+            self._update_timer.start(self.UPDATE_DELAY_MS)
+
+# ------------------------------------------------------------------
+# 📄 DOCUMENT SYMBOLS
+# ------------------------------------------------------------------
+
+class DocumentSymbols(QObject):
+    """
+    Symbols of the unsaved text of open Python tabs, parsed off the UI
+    thread and kept with the text they were parsed from, so repeated
+    lookups on an unchanged tab do not parse again. The document revision
+    is only a shortcut: background highlighting bumps it without an edit.
+    """
+    MAX_CHARACTERS = 2 * 1024 * 1024 # Larger documents only use the project index
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache = {}      # Editor -> [document revision, text, symbols]
+        self._waiting = {}    # Editor -> callback of the latest request
+        self._workers = {}    # Editor -> running worker
+
+    def request(self, editor, callback):
+        """
+        Calls callback(symbols) with the symbols of editor's current text:
+        at once if they are cached, else when the background parse is done.
+        Requests made while a parse runs replace the earlier callback.
+        Returns True if the callback already ran.
+        """
+        if not self._parsable(editor):
+            callback([])
+            return True
+        if editor in self._workers:
+            self._waiting[editor] = callback
+            return False
+        text = self._cached_text(editor)
+        if text is None:
+            callback(self._cache[editor][2])
+            return True
+        self._waiting[editor] = callback
+        self._start(editor, text)
+        return False
+
+    def forget(self, editor):
+        """Drops what is kept for a closed tab (its pending callback never runs)."""
+        self._cache.pop(editor, None)
+        self._waiting.pop(editor, None)
+
+    def _parsable(self, editor):
+        if editor is None or not hasattr(editor, 'document') or not hasattr(editor, 'toPlainText'):
+            return False
+        path = editor.get_file_path() if hasattr(editor, 'get_file_path') else None
+        if path and not path.endswith(PYTHON_EXTENSIONS):
+            return False
+        return editor.document().characterCount() <= self.MAX_CHARACTERS
+
+    def _cached_text(self, editor):
+        """None if the cached symbols of editor are current, else its text (to be parsed)."""
+        revision = editor.document().revision()
+        cached = self._cache.get(editor)
+        if cached is not None and cached[0] == revision:
+            return None
+        text = editor.toPlainText()
+        if cached is not None and cached[1] == text:
+            cached[0] = revision
+            return None
+        return text
+
+    def _start(self, editor, text):
+        worker = DocumentSymbolsWorker(editor, editor.document().revision(), text)
+        self._workers[editor] = worker
+        worker.signals.finished.connect(self._on_parsed)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_parsed(self, editor, revision, symbols):
+        worker = self._workers.pop(editor, None)
+        if editor not in self._waiting or worker is None:
+            return # Closed while parsing
+        self._cache[editor] = [revision, worker.text, symbols]
+        try:
+            text = self._cached_text(editor)
+        except RuntimeError:
+            self.forget(editor)
+            return
+        if text is not None:
+            self._start(editor, text) # Edited while parsing: the callback gets the text as it is now
+            return
+        self._waiting.pop(editor)(symbols)
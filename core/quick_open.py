@@ -0,0 +1,477 @@
+# --- File: core/quick_open.py ---
+# Go to File (Ctrl+P). PathIndex keeps every file path under the project
+# root in a PathTable: the paths are walked with os.scandir in a worker
+# (skipping whatever the file tree ignores) and joined into one lower-case
+# string, so a query is matched by a C-level regex scan instead of a Python
+# loop. QuickOpenPicker runs that scan in TIME_BUDGET slices, so a keystroke
+# never waits for a whole scan, and ranks the matches by where the query
+# landed (file name first), then recently opened files, then length.
+
+import heapq
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from itertools import chain, islice
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+from core.fuzzy import REPEAT
+from core.picker import FuzzyPicker
+from core.settings import load_settings, default_settings
+from core.workspace import IgnoreRules
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+def walk_project(root, excludes, relative_path=""):
+    """
+    Yields the '/'-separated relative path of every file under root that
+    neither excludes (the exclude_patterns setting) nor a .gitignore hides.
+    Symlinked directories are not followed. With relative_path only the
+    files under that directory are walked (it must not be ignored itself).
+    """
+    rules = IgnoreRules.for_root(root)
+    parts = relative_path.split("/") if relative_path else []
+    for depth in range(len(parts)):
+        rules = rules.child(os.path.join(root, *parts[:depth + 1]), "/".join(parts[:depth + 1]))
+    stack = [(os.path.join(root, *parts), relative_path, rules)]
+    while stack:
+        directory, relative_path, rules = stack.pop()
+        prefix = relative_path + "/" if relative_path else ""
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        entry_path = prefix + entry.name
+                        if excludes.is_ignored(entry_path, is_dir) or rules.is_ignored(entry_path, is_dir):
+                            continue
+                        if is_dir:
+                            subdirs.append((entry.path, entry_path))
+                        elif entry.is_file():
+                            yield entry_path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        for path, entry_path in reversed(subdirs):
+            stack.append((path, entry_path, rules.child(path, entry_path)))
+
+def _is_ignored(root, relative_path, excludes, is_dir=False):
+    """True if a file (or directory) at relative_path would be left out by walk_project."""
+    rules = IgnoreRules.for_root(root)
+    parts = relative_path.split("/")
+    for depth in range(len(parts)):
+        entry_path = "/".join(parts[:depth + 1])
+        inner = depth < len(parts) - 1
+        if excludes.is_ignored(entry_path, inner or is_dir) or rules.is_ignored(entry_path, inner or is_dir):
+            return True
+        if inner:
+            rules = rules.child(os.path.join(root, *parts[:depth + 1]), entry_path)
+    return False
+
+# ------------------------------------------------------------------
+# 📇 PATH TABLE (searchable list of paths)
+# ------------------------------------------------------------------
+
+class PathTable:
+    """
+    Sorted relative file paths, read-only once built. hay holds them all in
+    lower case, each behind a "\\n": path i starts at starts[i] (its "\\n")
+    and its file name at names[i]; starts[-1] is the end of hay. File name
+    prefixes are looked up by binary search in sorted_names.
+    """
+
+    def __init__(self, paths):
+        self.paths = paths
+        lower = [path.lower() for path in paths]
+        self.hay = "".join("\n" + path for path in lower)
+        self.starts = array('i')
+        self.names = array('i')
+        offset = 0
+        for path in lower:
+            self.starts.append(offset)
+            self.names.append(offset + 1 + path.rfind("/") + 1)
+            offset += len(path) + 1
+        self.starts.append(offset)
+        self.lengths = array('i', map(len, lower))
+        file_names = [path[path.rfind("/") + 1:] for path in lower]
+        self.name_order = array('i', sorted(range(len(paths)), key=file_names.__getitem__))
+        self.sorted_names = [file_names[index] for index in self.name_order]
+
+    def __len__(self):
+        return len(self.paths)
+
+    def find(self, relative_path):
+        """Index of a relative path, or -1."""
+        index = bisect_left(self.paths, relative_path)
+        return index if index < len(self.paths) and self.paths[index] == relative_path else -1
+
+class PathSearch:
+    """
+    One query over a PathTable, run a slice at a time by step(). A path
+    matches if the query's characters appear in it in order (case and
+    spaces ignored). A query that extends the previous, fully searched one
+    only re-checks that one's matches.
+    """
+    MAX_MATCHES = 20000 # Broad queries stop scanning here, like FuzzyMatcher.MAX_RANKED
+    CHUNK = 1024        # Paths scanned between deadline checks
+    NOT_RECENT = 1 << 30
+
+    def __init__(self, table, query, recent, limit=100, previous=None):
+        self.table = table
+        self.query = query.lower().replace(" ", "")
+        self.recent = recent # Path index -> rank in the recently opened list (0 = latest)
+        self.limit = limit
+        self.done = False
+        self.complete = True # False once MAX_MATCHES cut the scan short
+        self.matched = []    # Path indices, in path order
+        self._keys = []      # Rank keys of the matches found so far
+        self._ranked = set()
+        self._position = 0
+        self._candidates = None
+        if not self.query or "\n" in self.query:
+            self.done = True
+            return
+
+        body = "".join(f"[^{re.escape(char)}\n]{REPEAT}{re.escape(char)}" for char in self.query)
+        # "\n[^a\n]*+a[^b\n]*+b": one attempt per path, started at its "\n"
+        # (a literal, so the engine skips straight to the next path)
+        self._path_pattern = re.compile("\n" + body)
+        self._name_pattern = re.compile(body)
+        if previous is not None and previous.table is table and previous.done and previous.complete \
+                and previous.query and self.query.startswith(previous.query):
+            self._candidates = previous.matched
+
+        # Ranked up front, so a scan cut short by MAX_MATCHES cannot miss
+        # them: the shortest file name prefix matches (found by binary
+        # search) and the recently opened files that match
+        start = bisect_left(table.sorted_names, self.query)
+        end = bisect_left(table.sorted_names, self.query + "\uffff", start)
+        prefixed = heapq.nsmallest(limit, table.name_order[start:end], key=table.lengths.__getitem__)
+        recent = [index for index in recent
+                  if self._path_pattern.match(table.hay, table.starts[index], table.starts[index + 1])]
+        self._ranked = set(prefixed).union(recent) # Already in _keys
+        self._keys = [self._rank_key(index) for index in self._ranked]
+
+    def step(self, budget):
+        """Searches for about budget seconds. Returns True once the search is done."""
+        deadline = time.perf_counter() + budget
+        table = self.table
+        hay = table.hay
+        starts = table.starts
+        matched = self.matched
+        ranked = self._ranked
+        while not self.done:
+            if self._candidates is not None:
+                chunk = self._candidates[self._position:self._position + self.CHUNK]
+                match = self._path_pattern.match
+                for index in chunk:
+                    if match(hay, starts[index], starts[index + 1]):
+                        matched.append(index)
+                        if index not in ranked:
+                            self._keys.append(self._rank_key(index))
+                self._position += len(chunk)
+                self.done = self._position >= len(self._candidates)
+            else:
+                first = self._position
+                last = min(first + self.CHUNK, len(table))
+                for match in self._path_pattern.finditer(hay, starts[first], starts[last]):
+                    index = bisect_left(starts, match.start(), first, last)
+                    matched.append(index)
+                    if index not in ranked:
+                        self._keys.append(self._rank_key(index))
+                self._position = last
+                self.done = last >= len(table)
+            if len(matched) >= self.MAX_MATCHES and not self.done:
+                self.done = True
+                self.complete = False
+            if time.perf_counter() >= deadline:
+                break
+        return self.done
+
+    def _rank_key(self, index):
+        table = self.table
+        hay = table.hay
+        query = self.query
+        name = table.names[index]
+        end = table.starts[index + 1]
+        if hay.startswith(query, name, end):
+            tier = 0 # File name prefix
+        elif hay.find(query, name, end) >= 0:
+            tier = 1 # Inside the file name
+        elif self._name_pattern.match(hay, name, end):
+            tier = 2 # Scattered over the file name
+        elif hay.find(query, table.starts[index], end) >= 0:
+            tier = 3 # Inside the path
+        else:
+            tier = 4 # Scattered over the path
+        return tier, self.recent.get(index, self.NOT_RECENT), end - table.starts[index], index
+
+    def results(self):
+        """Indices of the best paths found so far, best first."""
+        if not self.query:
+            # Recently opened files, then the rest in path order
+            recent = sorted(self.recent, key=self.recent.get)
+            rest = (index for index in range(len(self.table)) if index not in self.recent)
+            return list(islice(chain(recent, rest), self.limit))
+        return [key[-1] for key in heapq.nsmallest(self.limit, self._keys)]
+
+    def count(self):
+        return len(self._keys) if self.query else len(self.table)
+
+# ------------------------------------------------------------------
+# 🧵 PATH INDEX WORKER (Runs in a separate thread)
+# ------------------------------------------------------------------
+
+class PathIndexWorkerSignals(QObject):
+    """Signals available from the path index worker."""
+    finished = Signal(int, object, float) # Generation, PathTable (None on failure), seconds
+
+class PathIndexWorker(QRunnable):
+    """
+    Builds a PathTable: from a walk of the root, or (with paths) from a known
+    path list with the changed files re-checked on disk and the files under
+    changed directories dropped, then walked again if the directory exists.
+    """
+
+    def __init__(self, generation, root, excludes, paths=None, changed=(), changed_directories=()):
+        super().__init__()
+        self.signals = PathIndexWorkerSignals()
+        self.generation = generation
+        self.root = root
+        self.excludes = excludes
+        self.paths = paths
+        self.changed = changed
+        self.changed_directories = changed_directories
+
+    @Slot()
+    def run(self):
+        started = time.perf_counter()
+        try:
+            if self.paths is None:
+                paths = sorted(walk_project(self.root, self.excludes))
+            else:
+                paths = set(self.paths)
+                directories = [os.path.relpath(path, self.root).replace(os.sep, "/") for path in self.changed_directories]
+                if directories:
+                    prefixes = tuple(relative_path + "/" for relative_path in directories)
+                    paths = {path for path in paths if not path.startswith(prefixes)}
+                for path, relative_path in zip(self.changed_directories, directories):
+                    if os.path.isdir(path) and not os.path.islink(path) and not _is_ignored(self.root, relative_path, self.excludes, True):
+                        paths.update(walk_project(self.root, self.excludes, relative_path))
+                for path in self.changed:
+                    relative_path = os.path.relpath(path, self.root).replace(os.sep, "/")
+                    if os.path.isfile(path) and not _is_ignored(self.root, relative_path, self.excludes):
+                        paths.add(relative_path)
+                    else:
+                        paths.discard(relative_path)
+                paths = sorted(paths)
+            table = PathTable(paths)
+        except Exception as e:
+            Debug(f"DEBUG: Listing the files of {self.root} failed: {e}")
+            table = None
+        self.signals.finished.emit(self.generation, table, time.perf_counter() - started)
+
+# ------------------------------------------------------------------
+# 📇 PATH INDEX
+# ------------------------------------------------------------------
+
+class PathIndex(QObject):
+    """
+    The file paths of the project folder and the recently opened files.
+    `table` is None until the first walk is done; files reported changed
+    (and the contents of directories reported added or deleted) are
+    applied in the background, and a picker opened RESCAN_AFTER_S
+    after the last walk starts a fresh one (changes in folders the file
+    tree never listed are not watched).
+    """
+    updated = Signal()
+    status_message = Signal(str)
+
+    UPDATE_DELAY_MS = 300 # Changed files are applied together after this pause
+    RESCAN_AFTER_S = 60
+    MAX_RECENT = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.table = None
+        self.recent = [] # Absolute paths, most recently opened first
+        self._generation = 0
+        self._worker = None
+        self._pending = set()
+        self._pending_directories = set()
+        self._walked_at = 0.0
+        self._walk_wanted = False
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._start_update)
+
+    def open_root(self, root):
+        """Switches to a project folder and starts walking it."""
+        self._generation += 1
+        self._worker = None
+        self._update_timer.stop()
+        self._pending.clear()
+        self._pending_directories.clear()
+        self.root = os.path.abspath(root)
+        self.table = None
+        self._walk()
+
+    def rescan_if_stale(self):
+        if self.root is not None and time.monotonic() - self._walked_at > self.RESCAN_AFTER_S:
+            if self._worker is None:
+                self._walk()
+            else:
+                self._walk_wanted = True
+
+    def notify_changed(self, path):
+        """A file under the root was saved, created, renamed or deleted."""
+        self._note_change(path, self._pending)
+
+    def notify_directory_changed(self, path):
+        """A directory under the root was created, renamed or deleted, with everything in it."""
+        self._note_change(path, self._pending_directories)
+
+    def _note_change(self, path, pending):
+        if not path or self.root is None:
+            return
+        path = os.path.abspath(path)
+        if not os.path.normcase(path).startswith(os.path.normcase(os.path.join(self.root, ""))):
+            return
+        pending.add(path)
+        self._update_timer.start(self.UPDATE_DELAY_MS)
+
+    def note_opened(self, path):
+        """Moves a file to the front of the recently opened list."""
+        if not path:
+            return
+        path = os.path.abspath(path)
+        if path in self.recent:
+            self.recent.remove(path)
+        self.recent.insert(0, path)
+        del self.recent[self.MAX_RECENT:]
+
+    def recent_ranks(self, table):
+        """{path index in table: recency rank} of the recently opened files under the root."""
+        ranks = {}
+        if self.root is None:
+            return ranks
+        prefix = os.path.join(self.root, "")
+        for rank, path in enumerate(self.recent):
+            if path.startswith(prefix):
+                index = table.find(path[len(prefix):].replace(os.sep, "/"))
+                if index >= 0:
+                    ranks[index] = rank
+        return ranks
+
+    def absolute_path(self, index):
+        return os.path.join(self.root, *self.table.paths[index].split("/"))
+
+    def _excludes(self):
+        return IgnoreRules(load_settings().get("exclude_patterns", default_settings["exclude_patterns"]))
+
+    def _walk(self):
+        self._walk_wanted = False
+        self._walked_at = time.monotonic()
+        self._pending.clear() # The walk sees them
+        self._pending_directories.clear()
+        self._start_worker(PathIndexWorker(self._generation, self.root, self._excludes()))
+
+    def _start_update(self):
+        if self._worker is not None or self.table is None or not (self._pending or self._pending_directories):
+            return # Picked up again when the running worker finishes
+        changed = sorted(self._pending)
+        changed_directories = sorted(self._pending_directories)
+        self._pending.clear()
+        self._pending_directories.clear()
+        self._start_worker(PathIndexWorker(self._generation, self.root, self._excludes(), self.table.paths, changed, changed_directories))
+
+    def _start_worker(self, worker):
+        self._worker = worker
+        worker.signals.finished.connect(self._on_worker_finished)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_worker_finished(self, generation, table, seconds):
+        if generation != self._generation:
+            return # For a root that is no longer open
+        self._worker = None
+        if table is not None:
+            first = self.table is None
+            self.table = table
+            if first:
+                self.status_message.emit(f"Go to File: {len(table)} files listed in {seconds:.2f}s.")
+            self.updated.emit()
+        if self._walk_wanted:
+            self._walk()
+        elif self._pending or self._pending_directories:
+            self._update_timer.start(self.UPDATE_DELAY_MS)
+
+# ------------------------------------------------------------------
+# 🔎 GO TO FILE PICKER
+# ------------------------------------------------------------------
+
+class QuickOpenPicker(FuzzyPicker):
+    """
+    FuzzyPicker over a PathIndex. Each keystroke searches for one
+    TIME_BUDGET slice and shows what it found; the rest of the scan
+    continues on later event loop ticks. Emits the chosen absolute path.
+    """
+    TIME_BUDGET = 0.008 # seconds of matching per event loop tick
+
+    def __init__(self, index, parent=None):
+        super().__init__("Go to File", None, "Type a file name or path (fuzzy)", parent=parent)
+        self.index = index
+        self._search = None
+        self._continue_timer = QTimer(self)
+        self._continue_timer.setSingleShot(True)
+        self._continue_timer.timeout.connect(self._continue_search)
+        index.updated.connect(self._on_index_updated)
+
+    def refresh(self, *_):
+        table = self.index.table
+        if table is None:
+            self.show_results([], "Listing project files...")
+            return
+        self._continue_timer.stop()
+        started = time.perf_counter()
+        self._search = PathSearch(table, self.query_edit.text(), self.index.recent_ranks(table), self.limit, self._search)
+        # Setting the search up counts against the keystroke's slice
+        self._continue_search(self.TIME_BUDGET - (time.perf_counter() - started))
+
+    def _on_index_updated(self):
+        self._search = None # A new table: nothing to narrow from
+        self.refresh()
+
+    def _continue_search(self, first_slice_budget=None):
+        search = self._search
+        if not search.step(self.TIME_BUDGET if first_slice_budget is None else max(0.001, first_slice_budget)):
+            self._continue_timer.start(0)
+            if first_slice_budget is None:
+                return # Only the first slice shows partial results
+            status = "Searching..."
+        else:
+            count = search.count()
+            status = f"{count} file(s)" if search.complete else f"{count}+ files (showing the best {self.limit})"
+        table = search.table
+        rows = []
+        for index in search.results():
+            directory, _, name = table.paths[index].rpartition("/")
+            rows.append((name, directory, self.index.absolute_path(index)))
+        self.show_results(rows, status)
@@ -30,8 +30,19 @@ Debug(f"THEMES_DIR= {THEMES_DIR}")
 
 default_settings = {
     "autosave": True,
+    "autosave_delay_ms": 2000,  # idle time after the last edit before a tab is autosaved
     "font_size": 12,
-    "theme": "dark"  # default theme name (must have dark.qss in themes/)
+    "theme": "dark",  # default theme name (must have dark.qss in themes/)
+    "large_file_threshold_mb": 50,  # files above this open in the read-only large file viewer
+    "hibernate_idle_minutes": 10,  # clean background tabs idle this long drop their document (0 = never)
+    "memory_budget_mb": 512,  # hibernate least recently used clean tabs above this (0 = no budget)
+    "language_servers": {".py": ["pylsp"], ".pyi": ["pylsp"]},  # file extension -> language server command line (stdio)
+    "rainbow_brackets": True,  # colour bracket pairs by nesting depth
+    "git_integration": True,  # git status colours in the file tree, changed-line bar in the gutter
+    "git_inline_blame": True,  # author, date and summary of the cursor line's last commit
+    # gitignore-style patterns the file tree never lists (on top of the project's .gitignore files)
+    "exclude_patterns": [".git", ".hg", ".svn", "__pycache__", "*.pyc", "node_modules", ".venv", "venv",
+                         ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".eggs", ".DS_Store"]
 }
 
 def ensure_user_data_dirs():
@@ -1,8 +1,8 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QComboBox, QCheckBox
+    QLabel, QComboBox, QCheckBox, QSpinBox, QLineEdit
 )
-from core.settings import load_settings, save_settings, list_themes, load_theme
+from core.settings import load_settings, save_settings, list_themes, load_theme, default_settings
 
 class SettingsUI(QWidget):
     def __init__(self, parent=None):
@@ -41,9 +41,51 @@ class SettingsUI(QWidget):
         self.autosave_checkbox.setChecked(self.settings.get("autosave", False))
         layout.addWidget(self.autosave_checkbox)
 
+        # Large file threshold
+        large_file_layout = QHBoxLayout()
+        large_file_label = QLabel("Open files larger than (MB) in the read-only large file viewer:")
+        self.large_file_spin = QSpinBox()
+        self.large_file_spin.setRange(1, 100000)
+        self.large_file_spin.setValue(self.settings.get("large_file_threshold_mb", default_settings["large_file_threshold_mb"]))
+        large_file_layout.addWidget(large_file_label)
+        large_file_layout.addWidget(self.large_file_spin)
+        layout.addLayout(large_file_layout)
+
+        # Tab hibernation
+        hibernate_layout = QHBoxLayout()
+        hibernate_label = QLabel("Hibernate clean background tabs idle for (minutes, 0 = never):")
+        self.hibernate_spin = QSpinBox()
+        self.hibernate_spin.setRange(0, 24 * 60)
+        self.hibernate_spin.setValue(self.settings.get("hibernate_idle_minutes", default_settings["hibernate_idle_minutes"]))
+        hibernate_layout.addWidget(hibernate_label)
+        hibernate_layout.addWidget(self.hibernate_spin)
+        layout.addLayout(hibernate_layout)
+
+        budget_layout = QHBoxLayout()
+        budget_label = QLabel("Memory budget for open documents (MB, 0 = unlimited):")
+        self.budget_spin = QSpinBox()
+        self.budget_spin.setRange(0, 1024 * 1024)
+        self.budget_spin.setValue(self.settings.get("memory_budget_mb", default_settings["memory_budget_mb"]))
+        budget_layout.addWidget(budget_label)
+        budget_layout.addWidget(self.budget_spin)
+        layout.addLayout(budget_layout)
+
+        # File tree exclusions
+        exclude_layout = QHBoxLayout()
+        exclude_label = QLabel("Hide from the file tree (gitignore patterns, comma separated):")
+        self.exclude_edit = QLineEdit()
+        self.exclude_edit.setText(", ".join(self.settings.get("exclude_patterns", default_settings["exclude_patterns"])))
+        exclude_layout.addWidget(exclude_label)
+        exclude_layout.addWidget(self.exclude_edit)
+        layout.addLayout(exclude_layout)
+
         # Signals
         self.theme_combo.currentTextChanged.connect(self.on_theme_changed)
         self.autosave_checkbox.stateChanged.connect(self.on_autosave_toggled)
+        self.large_file_spin.valueChanged.connect(self.on_large_file_threshold_changed)
+        self.hibernate_spin.valueChanged.connect(self.on_hibernate_idle_changed)
+        self.budget_spin.valueChanged.connect(self.on_memory_budget_changed)
+        self.exclude_edit.editingFinished.connect(self.on_exclude_patterns_changed)
 
     def on_theme_changed(self, theme_name):
         stylesheet = load_theme(theme_name)
@@ -60,3 +102,26 @@ class SettingsUI(QWidget):
         enabled = bool(state)
         self.settings["autosave"] = enabled
         save_settings(self.settings)
+        if hasattr(self.parent_window, "autosave_service"):
+            self.parent_window.autosave_service.set_enabled(enabled)
+
+    def on_large_file_threshold_changed(self, value):
+        self.settings["large_file_threshold_mb"] = value
+        save_settings(self.settings)
+
+    def on_hibernate_idle_changed(self, value):
+        self.settings["hibernate_idle_minutes"] = value
+        save_settings(self.settings)
+
+    def on_memory_budget_changed(self, value):
+        self.settings["memory_budget_mb"] = value
+        save_settings(self.settings)
+
+    def on_exclude_patterns_changed(self):
+        patterns = [pattern.strip() for pattern in self.exclude_edit.text().split(",") if pattern.strip()]
+        if patterns == self.settings.get("exclude_patterns"):
+            return
+        self.settings["exclude_patterns"] = patterns
+        save_settings(self.settings)
+        if hasattr(self.parent_window, "file_manager"):
+            self.parent_window.file_manager.set_exclude_patterns(patterns)
@@ -0,0 +1,246 @@
+# --- File: core/symbol_index.py ---
+# Python symbol index of a project: classes, functions, methods and
+# module-level assignments with their locations, parsed with ast. Qt-free:
+# the parsing runs in the process pool (see core/process_pool.py).
+
+import ast
+import os
+import pickle
+import re
+
+from core.fuzzy import FuzzyMatcher
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+SYMBOL_INDEX_VERSION = 1
+
+# Symbol kinds
+CLASS = "class"
+FUNCTION = "function"
+METHOD = "method"
+VARIABLE = "variable"
+
+# Statements whose bodies still define names at the level they appear in
+# (if TYPE_CHECKING:, try/except ImportError:, with ...:)
+_NESTED_BODIES = ("body", "orelse", "handlers", "finalbody")
+
+# ------------------------------------------------------------------
+# 🌳 PARSING (runs inside pool worker processes)
+# ------------------------------------------------------------------
+
+def parse_symbols(source):
+    """
+    Symbols of Python source (str or bytes) as a list of
+    (name, kind, container, line, column); container is the dotted name of
+    the enclosing class, or "" at module level. Lines are 1-indexed.
+    Raises SyntaxError / ValueError for source ast cannot parse.
+    """
+    symbols = []
+    _collect(ast.parse(source).body, "", False, symbols)
+    return symbols
+
+def _collect(body, container, in_class, symbols):
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            symbols.append((node.name, CLASS, container, node.lineno, node.col_offset))
+            _collect(node.body, f"{container}.{node.name}" if container else node.name, True, symbols)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Functions nested in functions are local names, not symbols
+            symbols.append((node.name, METHOD if in_class else FUNCTION, container, node.lineno, node.col_offset))
+        elif not in_class and isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in _target_names(target):
+                    symbols.append((name.id, VARIABLE, container, name.lineno, name.col_offset))
+        elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith)) or type(node).__name__ == "TryStar":
+            for field in _NESTED_BODIES:
+                for child in getattr(node, field, ()):
+                    if isinstance(child, ast.ExceptHandler):
+                        _collect(child.body, container, in_class, symbols)
+                    else:
+                        _collect([child], container, in_class, symbols)
+
+def _target_names(target):
+    if isinstance(target, ast.Name):
+        yield target
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for element in target.elts:
+            yield from _target_names(element)
+    elif isinstance(target, ast.Starred):
+        yield from _target_names(target.value)
+
+def parse_symbol_batch(paths):
+    """
+    Parses a batch of files. Returns [(path, symbols or None), ...]; None
+    means the file could not be read. Files with syntax errors get [].
+    """
+    results = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+        except OSError:
+            results.append((path, None))
+            continue
+        try:
+            symbols = parse_symbols(source)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            symbols = []
+        results.append((path, symbols))
+    return results
+
+def parse_document_symbols(source):
+    """parse_symbols() for the unsaved text of an open tab: [] if it does not parse."""
+    try:
+        return parse_symbols(source)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return []
+
+# ------------------------------------------------------------------
+# 🗂️ OUTLINE (runs inside pool worker processes)
+# ------------------------------------------------------------------
+
+# Header lines the regex fallback understands
+OUTLINE_HEADER_RE = re.compile(r"^([ \t]*)(?:async[ \t]+)?(def|class)[ \t]+(\w+)", re.MULTILINE)
+
+def parse_outline(source):
+    """
+    Outline of Python source as (nodes, error). Every node is a list
+    [name, kind, line, end_line, column, children, body_line] with
+    1-indexed lines; body_line is where the first statement of the body starts.
+    If the source does not parse, error is (line, message) and the nodes
+    come from scan_outline instead.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError, RecursionError, MemoryError) as e:
+        line = getattr(e, "lineno", None) or 0
+        return scan_outline(source), (line, getattr(e, "msg", None) or str(e))
+    return _outline_nodes(tree.body, False), None
+
+def _outline_nodes(body, in_class):
+    nodes = []
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            nodes.append([node.name, CLASS, node.lineno, node.end_lineno, node.col_offset,
+                          _outline_nodes(node.body, True), node.body[0].lineno])
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            nodes.append([node.name, METHOD if in_class else FUNCTION, node.lineno, node.end_lineno,
+                          node.col_offset, _outline_nodes(node.body, False), node.body[0].lineno])
+        elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith)) or type(node).__name__ == "TryStar":
+            for field in _NESTED_BODIES:
+                for child in getattr(node, field, ()):
+                    nodes.extend(_outline_nodes(child.body if isinstance(child, ast.ExceptHandler) else [child], in_class))
+    return nodes
+
+def scan_outline(source):
+    """Approximate outline from def / class lines and their indentation (for broken source)."""
+    if isinstance(source, bytes):
+        source = source.decode("utf-8", "replace")
+    roots = []
+    stack = [] # Open nodes, innermost last
+    line = 1
+    scanned = 0
+    for match in OUTLINE_HEADER_RE.finditer(source):
+        line += source.count("\n", scanned, match.start())
+        scanned = match.start()
+        column = len(match.group(1).expandtabs())
+        while stack and stack[-1][4] >= column:
+            stack.pop()[3] = line - 1
+        parent = stack[-1] if stack else None
+        kind = CLASS if match.group(2) == "class" else (METHOD if parent and parent[1] == CLASS else FUNCTION)
+        node = [match.group(3), kind, line, line, column, [], line + 1]
+        (parent[5] if parent else roots).append(node)
+        stack.append(node)
+    last_line = line + source.count("\n", scanned)
+    for node in stack:
+        node[3] = last_line
+    return roots
+
+# ------------------------------------------------------------------
+# 📚 SYMBOL TABLE
+# ------------------------------------------------------------------
+
+class SymbolTable:
+    """
+    An immutable snapshot of a project's symbols. Updates build a new table
+    from a copy of files, so the UI thread can keep querying the old one.
+    """
+
+    def __init__(self, root, files=None):
+        self.root = root
+        # Relative path -> (mtime_ns, size, symbols)
+        self.files = files if files is not None else {}
+
+        # Flat rows: (name, kind, container, relative path, line, column)
+        self.rows = [
+            (name, kind, container, relative_path, line, column)
+            for relative_path, (_, _, symbols) in self.files.items()
+            for name, kind, container, line, column in symbols
+        ]
+        self._by_name = {}
+        for row_index, row in enumerate(self.rows):
+            self._by_name.setdefault(row[0], []).append(row_index)
+        self._matcher = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def absolute(self, relative_path):
+        return os.path.join(self.root, relative_path)
+
+    def lookup(self, name):
+        """Rows defining exactly name: classes and functions before variables."""
+        rows = [self.rows[row_index] for row_index in self._by_name.get(name, ())]
+        rows.sort(key=lambda row: (row[1] == VARIABLE, row[3], row[4]))
+        return rows
+
+    def search(self, query, limit=100):
+        """Rows whose name fuzzily matches query, best first."""
+        return [self.rows[row_index] for row_index in self.matcher().match(query, limit)]
+
+    def matcher(self):
+        """Built on first use (workers call it so the UI thread never has to)."""
+        if self._matcher is None:
+            self._matcher = FuzzyMatcher([row[0] for row in self.rows])
+        return self._matcher
+
+    # -------------------------------------------------------------
+    # --- Persistence
+    # -------------------------------------------------------------
+
+    def save(self, path):
+        """Writes the table (temp file + rename). Returns its size in bytes."""
+        state = {"version": SYMBOL_INDEX_VERSION, "root": self.root, "files": self.files}
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return os.path.getsize(path)
+
+    @staticmethod
+    def load_files(path, root):
+        """The files of a saved table of root, or None if there is no usable one."""
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            Debug(f"DEBUG: Discarding unreadable symbol index {path}: {e}")
+            return None
+        if not isinstance(state, dict) or state.get("version") != SYMBOL_INDEX_VERSION or state.get("root") != root:
+            return None
+        return state["files"]
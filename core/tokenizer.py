@@ -0,0 +1,125 @@
+# --- File: core/tokenizer.py ---
+# Single-pass Python tokenizer used by PythonHighlighter.
+# Kept free of Qt imports so it can be benchmarked / reused anywhere.
+
+import re
+
+# ------------------------------------------------------------------
+# 🎨 TOKEN KINDS (index into the highlighter's format table)
+# ------------------------------------------------------------------
+KEYWORD = 0
+OPERATOR = 1
+STRING = 2
+COMMENT = 3
+NUMBERS = 4
+FUNCTION = 5
+CLASS = 6
+
+# Names match the keys of FORMATS in core/editor.py
+TOKEN_KINDS = ('keyword', 'operator', 'string', 'comment', 'numbers', 'function', 'class')
+
+# Block states (same meaning as QSyntaxHighlighter block states)
+STATE_NORMAL = 0
+STATE_TRIPLE_DOUBLE = 1   # inside """ ... """
+STATE_TRIPLE_SINGLE = 2   # inside ''' ... '''
+
+KEYWORDS = [
+    'and', 'as', 'assert', 'break', 'class', 'continue', 'def',
+    'del', 'elif', 'else', 'except', 'finally', 'for', 'from',
+    'global', 'if', 'import', 'in', 'is', 'lambda', 'nonlocal',
+    'not', 'or', 'pass', 'raise', 'return', 'try', 'while', 'with',
+    'yield', 'True', 'False', 'None'
+]
+
+# One alternation, tried left to right at every position.
+# Order matters: strings and comments win over everything inside them,
+# 'def'/'class' headers win over the plain keyword rule, and plain
+# identifiers are consumed whole so keywords never match inside them.
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<triple>\"\"\"|''')
+    | (?P<string>"(?:[^"\\]|\\.)*(?:"|\\?$)|'(?:[^'\\]|\\.)*(?:'|\\?$))
+    | (?P<comment>\#.*)
+    | (?P<defn>\b(?:def|class)\b)(?P<gap>\s+)(?P<name>\w+)
+    | (?P<keyword>\b(?:%s)\b)
+    | (?P<numbers>\b[0-9]+(?:\.[0-9]+)?\b)
+    | (?P<ident>\w+)
+    | (?P<bracket>[()\[\]{}])
+    | (?P<operator>\*\*=?|//=?|[=!<>]=|[-+*/%%]=?|[=<>])
+    """ % '|'.join(KEYWORDS),
+    re.VERBOSE,
+)
+
+_CLOSERS = {
+    STATE_TRIPLE_DOUBLE: '"""',
+    STATE_TRIPLE_SINGLE: "'''",
+}
+_OPENERS = {'"""': STATE_TRIPLE_DOUBLE, "'''": STATE_TRIPLE_SINGLE}
+
+
+def tokenize_block(text, state=STATE_NORMAL, brackets=None):
+    """
+    Tokenizes one line in a single left-to-right pass.
+
+    Returns (spans, end_state) where spans is a flat list of
+    (start, length, kind) triples and end_state is the block state
+    to hand to the next line. If a list is passed as brackets, the columns
+    of the brackets outside strings and comments are appended to it.
+    """
+    spans = []
+    pos = 0
+    end = len(text)
+
+    # Continue a triple-quoted string opened on a previous line
+    closer = _CLOSERS.get(state)
+    if closer is not None:
+        close_at = text.find(closer)
+        if close_at == -1:
+            if end:
+                spans.extend((0, end, STRING))
+            return spans, state
+        pos = close_at + 3
+        spans.extend((0, pos, STRING))
+
+    search = _TOKEN_RE.search
+    while pos < end:
+        match = search(text, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        start = match.start()
+        pos = match.end()
+
+        if kind == 'ident':
+            continue
+        elif kind == 'bracket':
+            if brackets is not None:
+                brackets.append(start)
+        elif kind == 'operator':
+            spans.extend((start, pos - start, OPERATOR))
+        elif kind == 'keyword':
+            spans.extend((start, pos - start, KEYWORD))
+        elif kind == 'numbers':
+            spans.extend((start, pos - start, NUMBERS))
+        elif kind == 'string':
+            spans.extend((start, pos - start, STRING))
+        elif kind == 'comment':
+            spans.extend((start, pos - start, COMMENT))
+            break
+        elif kind == 'name':
+            # 'def foo' / 'class Foo': keyword plus the defined name
+            keyword_end = match.end('defn')
+            spans.extend((start, keyword_end - start, KEYWORD))
+            name_start = match.start('name')
+            spans.extend((name_start, pos - name_start,
+                          CLASS if text[start] == 'c' else FUNCTION))
+        elif kind == 'triple':
+            closer = match.group()
+            close_at = text.find(closer, pos)
+            if close_at == -1:
+                spans.extend((start, end - start, STRING))
+                return spans, _OPENERS[closer]
+            pos = close_at + 3
+            spans.extend((start, pos - start, STRING))
+
+    return spans, STATE_NORMAL
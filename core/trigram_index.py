@@ -0,0 +1,282 @@
+# --- File: core/trigram_index.py ---
+# Trigram index of a project's text files. Every file is reduced to the set
+# of 3-byte sequences it contains, so a search only has to read the files
+# holding all the trigrams of its literal parts. Qt-free: the per-batch
+# indexing runs in the process pool (see core/process_pool.py).
+
+import os
+import pickle
+import threading
+from array import array
+
+try:
+    import re._parser as sre_parse # Python 3.11+
+except ImportError:
+    import sre_parse
+
+from core.workspace import is_binary
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+INDEX_VERSION = 1
+
+# Fraction of dead file slots after which an index is rebuilt from scratch
+COMPACT_RATIO = 0.25
+
+# With IGNORECASE these also match "ı", "İ", "ſ" and the Kelvin sign, whose
+# UTF-8 bytes are different trigrams, so they cannot narrow a search
+CASE_AMBIGUOUS = frozenset("iksIKS")
+
+# Repeats whose body is mandatory when their minimum is at least one
+REPEAT_OPS = tuple(
+    getattr(sre_parse, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+
+def file_trigrams(data):
+    """The distinct trigrams of a file's bytes. ASCII is folded to lower case."""
+    data = data.lower()
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+# ------------------------------------------------------------------
+# 🏗️ INDEXING (runs inside pool worker processes)
+# ------------------------------------------------------------------
+
+def index_file_batch(paths, first_id):
+    """
+    Indexes a batch of files whose ids start at first_id. Returns
+    (text_flags, postings): for every path whether it is an indexed text
+    file, and trigram -> array of file ids for the batch.
+    """
+    text_flags = []
+    postings = {}
+    for file_id, path in enumerate(paths, first_id):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            text_flags.append(None) # Gone or unreadable
+            continue
+        if is_binary(data):
+            text_flags.append(False)
+            continue
+        text_flags.append(True)
+        for trigram in file_trigrams(data):
+            ids = postings.get(trigram)
+            if ids is None:
+                postings[trigram] = array("I", (file_id,))
+            else:
+                ids.append(file_id)
+    return text_flags, postings
+
+# ------------------------------------------------------------------
+# 🔍 QUERY TRIGRAMS
+# ------------------------------------------------------------------
+
+def required_trigrams(pattern):
+    """
+    Trigrams every match of a compiled pattern must contain, taken from the
+    literal runs the regex cannot match without. Empty if there are none
+    (e.g. '.*' or queries shorter than three characters).
+    """
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return set()
+    runs = []
+    _literal_runs(parsed, bool(pattern.flags & sre_parse.SRE_FLAG_IGNORECASE), runs)
+
+    trigrams = set()
+    for run in runs:
+        data = run.encode("utf-8").lower()
+        trigrams.update(data[i:i + 3] for i in range(len(data) - 2))
+    return trigrams
+
+def _literal_runs(parsed, ignorecase, runs):
+    """Collects the mandatory runs of literal characters of a parsed regex."""
+    run = []
+
+    def flush():
+        if len(run) >= 3:
+            runs.append("".join(run))
+        run.clear()
+
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            char = chr(arg)
+            # Replacement characters stand for undecodable bytes on disk
+            if char == "\ufffd" or (ignorecase and (not char.isascii() or char in CASE_AMBIGUOUS)):
+                flush()
+            else:
+                run.append(char)
+            continue
+
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = arg
+            sub_ignorecase = (ignorecase or bool(add_flags & sre_parse.SRE_FLAG_IGNORECASE)) \
+                and not del_flags & sre_parse.SRE_FLAG_IGNORECASE
+            _literal_runs(sub, sub_ignorecase, runs)
+        elif op in REPEAT_OPS and arg[0] >= 1:
+            _literal_runs(arg[2], ignorecase, runs)
+        # Branches, classes and anything else may match without a fixed literal
+    flush()
+
+# ------------------------------------------------------------------
+# 🗃️ TRIGRAM INDEX
+# ------------------------------------------------------------------
+
+class TrigramIndex:
+    """
+    Trigram -> file id postings for the files under one root.
+
+    A changed file gets a fresh id and its old slot is left dead, so updates
+    only ever append; once too many slots are dead the index is rebuilt.
+    The lock guards every access, as updates run in a background thread.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.files = []    # File id -> (relative path, mtime_ns, size, is_text) or None when dead
+        self.ids = {}      # Relative path -> file id
+        self.postings = {} # Trigram -> array("I") of file ids
+        self.dead = 0
+        self.lock = threading.Lock()
+
+    def relative(self, path):
+        return os.path.relpath(path, self.root)
+
+    def absolute(self, relative_path):
+        return os.path.join(self.root, relative_path)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def needs_rebuild(self):
+        return self.dead > max(1000, len(self.files) * COMPACT_RATIO)
+
+    # -------------------------------------------------------------
+    # --- Updating
+    # -------------------------------------------------------------
+
+    def stale(self, relative_path, stat):
+        """True if the file is not indexed with this mtime and size."""
+        file_id = self.ids.get(relative_path)
+        if file_id is None:
+            return True
+        _, mtime_ns, size, _ = self.files[file_id]
+        return mtime_ns != stat.st_mtime_ns or size != stat.st_size
+
+    def reserve(self, count):
+        """Reserves ids for a batch about to be indexed; returns the first one."""
+        with self.lock:
+            first_id = len(self.files)
+            self.files.extend([None] * count)
+            self.dead += count
+            return first_id
+
+    def apply_batch(self, first_id, entries, text_flags, postings):
+        """
+        Stores the result of index_file_batch for entries, a list of
+        (relative path, stat) in the order the batch was indexed.
+        """
+        with self.lock:
+            for file_id, (relative_path, stat), is_text in zip(range(first_id, first_id + len(entries)), entries, text_flags):
+                self._remove(relative_path)
+                if is_text is None:
+                    continue
+                self.files[file_id] = (relative_path, stat.st_mtime_ns, stat.st_size, is_text)
+                self.ids[relative_path] = file_id
+                self.dead -= 1
+            for trigram, ids in postings.items():
+                existing = self.postings.get(trigram)
+                if existing is None:
+                    self.postings[trigram] = ids
+                else:
+                    existing.extend(ids)
+
+    def remove(self, relative_paths):
+        with self.lock:
+            for relative_path in relative_paths:
+                self._remove(relative_path)
+
+    def _remove(self, relative_path):
+        file_id = self.ids.pop(relative_path, None)
+        if file_id is not None:
+            self.files[file_id] = None
+            self.dead += 1
+
+    # -------------------------------------------------------------
+    # --- Querying
+    # -------------------------------------------------------------
+
+    def candidates(self, trigrams):
+        """(path, size) of the text files containing every trigram, in id order."""
+        with self.lock:
+            lists = []
+            for trigram in trigrams:
+                ids = self.postings.get(trigram)
+                if ids is None:
+                    return []
+                lists.append(ids)
+            lists.sort(key=len)
+            matches = set(lists[0])
+            for ids in lists[1:]:
+                matches.intersection_update(ids)
+                if not matches:
+                    return []
+            files = [self.files[file_id] for file_id in sorted(matches)]
+        return [(self.absolute(entry[0]), entry[2]) for entry in files if entry is not None]
+
+    # -------------------------------------------------------------
+    # --- Persistence
+    # -------------------------------------------------------------
+
+    def save(self, index_path):
+        """Writes the index (temp file + rename). Returns its size in bytes."""
+        with self.lock:
+            state = {
+                "version": INDEX_VERSION,
+                "root": self.root,
+                "files": self.files,
+                "dead": self.dead,
+                "postings": self.postings,
+            }
+            temp_path = index_path + ".tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, index_path)
+        return os.path.getsize(index_path)
+
+    @classmethod
+    def load(cls, index_path, root):
+        """The saved index of root, or None if there is no usable one."""
+        try:
+            with open(index_path, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            Debug(f"DEBUG: Discarding unreadable index {index_path}: {e}")
+            return None
+        if not isinstance(state, dict) or state.get("version") != INDEX_VERSION or state.get("root") != root:
+            return None
+
+        index = cls(root)
+        index.files = state["files"]
+        index.dead = state["dead"]
+        index.postings = state["postings"]
+        index.ids = {entry[0]: file_id for file_id, entry in enumerate(index.files) if entry is not None}
+        return index
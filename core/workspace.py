@@ -0,0 +1,271 @@
+# --- File: core/workspace.py ---
+# Project (FileManager root) helpers shared by the project-wide features:
+# directory walking, binary detection and the per-batch file search that
+# runs in the process pool. Kept free of Qt imports so pool workers load fast.
+
+import os
+import re
+import zlib
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+# Directories never worth descending into
+IGNORED_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".idea",
+    ".vscode", "build", "dist", ".eggs",
+}
+
+# Files above this size are skipped by project searches
+MAX_SEARCH_FILE_SIZE = 16 * 1024 * 1024
+
+# Bytes sniffed for a NUL to tell binary files apart
+BINARY_SNIFF_SIZE = 8192
+
+def is_binary(data):
+    """True if a file's leading bytes look binary (same heuristic as grep / git)."""
+    return b"\0" in data[:BINARY_SNIFF_SIZE]
+
+def walk_files(root, ignored_dirs=IGNORED_DIRS, max_size=None):
+    """
+    Yields (path, stat) for every regular file under root, using os.scandir
+    and an explicit stack. Ignored and symlinked directories are skipped.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignored_dirs:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            if max_size is None or stat.st_size <= max_size:
+                                yield entry.path, stat
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        # Reversed so directories come out in listing order
+        stack.extend(reversed(subdirs))
+
+# ------------------------------------------------------------------
+# 🙈 IGNORE RULES (.gitignore syntax)
+# ------------------------------------------------------------------
+
+def _glob_to_regex(pattern):
+    """Regex source for a gitignore glob: * and ? stop at /, ** crosses directories."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+                if pattern[i + 2:i + 3] == "/":
+                    out.append("(?:.*/)?") # "**/": any number of leading directories
+                    i += 3
+                    continue
+                if i + 2 == n:
+                    out.append(".*") # Trailing "/**": everything inside
+                    i += 2
+                    continue
+            while i + 1 < n and pattern[i + 1] == "*":
+                i += 1
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = i + 1
+            if end < n and pattern[end] in "!^":
+                end += 1
+            if end < n and pattern[end] == "]":
+                end += 1
+            while end < n and pattern[end] != "]":
+                end += 1
+            if end >= n:
+                out.append("\\[")
+            else:
+                body = pattern[i + 1:end]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+def compile_ignore_pattern(line):
+    """
+    (regex, negated, directories only, matches the name only) for one
+    .gitignore line, or None for blank lines, comments and broken patterns.
+    """
+    line = line.rstrip("\r\n")
+    if not line or line.startswith("#"):
+        return None
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " " # An escaped trailing space is kept
+    line = stripped
+    negated = line.startswith("!")
+    if negated or line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    directories_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to its .gitignore's directory
+    name_only = "/" not in line
+    try:
+        regex = re.compile(_glob_to_regex(line.lstrip("/")) + r"\Z", re.DOTALL)
+    except re.error:
+        return None
+    return regex, negated, directories_only, name_only
+
+class IgnoreRules:
+    """
+    gitignore-style rules of one directory layered over those of its parent:
+    the last matching pattern wins, and deeper .gitignore files beat
+    shallower ones. Paths are relative to the project root with "/"
+    separators. Never changed after creation, so worker threads can share them.
+    """
+
+    def __init__(self, lines=(), base="", parent=None):
+        lines = list(lines)
+        self.base = base # Directory the patterns are relative to ("" = project root)
+        self.parent = parent
+        # Equal for rules made from the same patterns, also across sessions
+        self.signature = zlib.crc32("\n".join([base] + lines).encode("utf-8", "surrogatepass"), parent.signature if parent is not None else 0)
+        self.rules = [rule for rule in map(compile_ignore_pattern, lines) if rule is not None]
+        # Per entry kind (files, directories): the patterns combined into one
+        # name regex and one path regex with a group per pattern, last
+        # pattern first, so the first group that matches is the pattern that
+        # decides. An entry costs at most two matches per layer
+        self._combined = (self._combine([rule for rule in self.rules if not rule[2]]), self._combine(self.rules))
+
+    @staticmethod
+    def _combine(rules):
+        if not rules:
+            return None
+        rules = rules[::-1]
+        combined = [[rule[1] for rule in rules]] # Negated flags by priority
+        for name_only in (True, False):
+            priorities = [priority for priority, rule in enumerate(rules) if rule[3] == name_only]
+            if priorities:
+                source = "|".join(f"({rules[priority][0].pattern})" for priority in priorities)
+                combined.append((re.compile(source, re.DOTALL), priorities))
+            else:
+                combined.append(None)
+        return combined
+
+    @classmethod
+    def for_root(cls, root):
+        """Rules of a project root: .git/info/exclude, then the root's .gitignore."""
+        rules = cls(_read_lines(os.path.join(root, ".git", "info", "exclude")))
+        return rules.child(root, "")
+
+    def child(self, directory, relative_path):
+        """Rules for the entries of directory (relative_path from the root): self plus its .gitignore."""
+        lines = _read_lines(os.path.join(directory, ".gitignore"))
+        if not lines:
+            return self
+        child = IgnoreRules(lines, relative_path, self)
+        return child if child.rules else self
+
+    def is_ignored(self, relative_path, is_dir):
+        name = relative_path.rpartition("/")[2]
+        layer = self
+        while layer is not None:
+            combined = layer._combined[is_dir]
+            if combined is not None:
+                negated, by_name, by_path = combined
+                decided = None
+                if by_name is not None:
+                    match = by_name[0].match(name)
+                    if match is not None:
+                        decided = by_name[1][match.lastindex - 1]
+                if by_path is not None:
+                    match = by_path[0].match(relative_path[len(layer.base) + 1:] if layer.base else relative_path)
+                    if match is not None and (decided is None or by_path[1][match.lastindex - 1] < decided):
+                        decided = by_path[1][match.lastindex - 1]
+                if decided is not None:
+                    return not negated[decided]
+            layer = layer.parent
+        return False
+
+def _read_lines(path):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+# ------------------------------------------------------------------
+# 🔎 FILE SEARCH (runs inside pool worker processes)
+# ------------------------------------------------------------------
+
+def search_file_batch(paths, pattern, flags, max_matches_per_file=1000):
+    """
+    Searches a batch of files. Returns (files_searched, results) where
+    results is a list of (path, [(line_number, column, line_text), ...])
+    for the files that matched. Line numbers are 1-indexed.
+    """
+    regex = re.compile(pattern, flags)
+    results = []
+    searched = 0
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        if is_binary(data):
+            continue
+        searched += 1
+        text = data.decode("utf-8", "replace")
+
+        # One C-level scan rejects the (usual) files without a match
+        match = regex.search(text)
+        if match is None:
+            continue
+
+        matches = []
+        line_number = 1
+        line_start = 0
+        scanned = 0
+        while match is not None and len(matches) < max_matches_per_file:
+            start = match.start()
+            if match.end() > start:
+                line_number += text.count("\n", scanned, start)
+                line_start = text.rfind("\n", 0, start) + 1
+                scanned = start
+                line_end = text.find("\n", start)
+                if line_end == -1:
+                    line_end = len(text)
+                matches.append((line_number, start - line_start, text[line_start:line_end].rstrip("\r")[:500]))
+                # Next search starts on the following line: one result per line
+                match = regex.search(text, line_end + 1) if line_end < len(text) else None
+            else:
+                match = regex.search(text, start + 1)
+        if matches:
+            results.append((path, matches))
+    return searched, results
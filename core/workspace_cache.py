@@ -0,0 +1,133 @@
+# --- File: core/workspace_cache.py ---
+# Per project root state kept between sessions, next to the root's search
+# indexes: the file tree's listed directories (names and file stamps),
+# which of them were expanded and the tabs open on files under the root.
+# Reopening a root shows all of it at once. The tree is then reconciled
+# with the disk in the background (a directory whose mtime and ignore
+# rules did not change keeps its cached names, see DirectoryListWorker)
+# and the tabs come back hibernated, so a file is only read when its tab
+# is shown.
+
+import json
+import os
+
+from PySide6.QtCore import QObject, Signal
+
+from core.settings import load_settings, default_settings
+from core.project_index import INDEX_DIR, index_path_for
+
+logger = "0"
+try:
+    from addons.debug import *
+    print("Debug module loaded!")
+    logger = "1"
+except ModuleNotFoundError:
+    print("Debug module NOT found. Defaulting to normal printing")
+
+def Debug(val):
+    if logger == "1":
+        log(val)
+    else:
+        print(val)
+
+CACHE_VERSION = 2
+MAX_CACHED_ENTRIES = 200000 # Trees with more listed entries keep their tabs but not their listings
+
+def cache_path_for(root):
+    return index_path_for(root, ".workspace")
+
+def read_cache(root):
+    """The saved state of a root, or None if there is none (or it is unreadable / from another version)."""
+    try:
+        with open(cache_path_for(root), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != CACHE_VERSION:
+        return None
+    if os.path.normcase(state.get("root", "")) != os.path.normcase(os.path.abspath(root)):
+        return None # Hash collision
+    return state
+
+def write_cache(root, state):
+    """Writes the state of a root atomically (a crash leaves the previous cache)."""
+    path = cache_path_for(root)
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporary, path)
+
+def _check_directories(directories):
+    """Raises ValueError unless directories has the shape of ProjectTreeModel.snapshot()."""
+    if not isinstance(directories, dict):
+        raise ValueError("directories is not a mapping")
+    for relative_path, listing in directories.items():
+        stamp, entries = listing
+        if stamp is not None and (len(stamp) != 3 or not all(isinstance(value, int) for value in stamp)):
+            raise ValueError(f"bad stamp for {relative_path!r}")
+        for name, is_dir, stamp in entries:
+            if not isinstance(name, str) or not isinstance(is_dir, bool) or not (stamp is None or len(stamp) == 2):
+                raise ValueError(f"bad entry in {relative_path!r}")
+
+# ------------------------------------------------------------------
+# 🗃️ WORKSPACE CACHE
+# ------------------------------------------------------------------
+
+class WorkspaceCache(QObject):
+    """Saves the workspace of the FileManager root and restores a root from its cache."""
+    status_message = Signal(str)
+
+    def __init__(self, editor, file_manager, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.file_manager = file_manager
+
+    def save(self):
+        """Writes the state of the current root (called when it is left and on exit)."""
+        root = self.file_manager.model.rootPath()
+        if not root or not os.path.isdir(root):
+            return
+        directories = self.file_manager.model.snapshot()
+        if sum(len(entries) for _, entries in directories.values()) > MAX_CACHED_ENTRIES:
+            directories = {}
+        prefix = os.path.join(root, "")
+        current = self.editor.get_current_file_path()
+        state = {
+            "version": CACHE_VERSION,
+            "root": os.path.abspath(root),
+            "exclude_patterns": load_settings().get("exclude_patterns", default_settings["exclude_patterns"]),
+            "directories": directories,
+            "expanded": self.file_manager.expanded_paths(),
+            "tabs": [[path, cursor_position, list(scroll_position)]
+                     for path, cursor_position, scroll_position in self.editor.tab_states() if path.startswith(prefix)],
+            "current": current if current and current.startswith(prefix) else None,
+        }
+        try:
+            write_cache(root, state)
+        except (OSError, TypeError, ValueError) as e:
+            Debug(f"DEBUG: Cannot save the workspace of {root}: {e}")
+
+    def restore(self, root):
+        """
+        Switches the file tree to root from its cache and reopens its tabs.
+        Returns False (and changes nothing) if root has no usable cache.
+        """
+        state = read_cache(root)
+        if state is None or not os.path.isdir(root):
+            return False
+        excludes = load_settings().get("exclude_patterns", default_settings["exclude_patterns"])
+        try:
+            directories = state["directories"] if state.get("exclude_patterns") == excludes else {}
+            _check_directories(directories)
+            tabs = [(path, int(cursor_position), tuple(scroll_position)) for path, cursor_position, scroll_position in state.get("tabs", [])]
+            if directories:
+                self.file_manager.restore(root, directories, state.get("expanded", []))
+            else:
+                self.file_manager.set_root_path(root)
+        except (KeyError, TypeError, ValueError) as e:
+            Debug(f"DEBUG: Ignoring the damaged workspace cache of {root}: {e}")
+            return False
+        added = self.editor.open_hibernated(tabs, state.get("current"))
+        self.status_message.emit(f"Workspace restored ({added} tab(s)); checking the file tree for changes in the background.")
+        return True